@@ -1,161 +1,468 @@
-import streamlit as st
-import matplotlib.pyplot as plt
+import math
+import os
 import random
-import numpy as np
-
-# Mock-up maintenance insights generation
-EXPLANATIONS = {
-    "Pump": "The pump's health indicator reflects gradual wear initially, followed by accelerated degradation. Regular inspection is critical to ensure optimal performance and prevent failures. The data highlights that pumps often experience a sharp decline in health due to cavitation or seal failures. Additionally, the trends suggest monitoring pressure and flow rate for early detection of issues.",
-    "Bearing": "The bearing shows a steady decay in health with increasing vibration toward the end, signaling the need for lubrication or replacement. Data analysis suggests that overheating or misalignment could contribute to this behavior. Proper alignment and regular inspections can prevent catastrophic failures.",
-    "Belts": "The belts experience minimal wear at the start but degrade rapidly after extended use, likely due to tension or misalignment. Observations indicate that improper tensioning exacerbates this rapid deterioration. Ensuring correct tension and periodic checks can extend their lifespan.",
-    "Motor": "The motor's health trend indicates stable operation initially, with a rapid decline due to overheating or electrical faults. Data trends suggest that monitoring temperature and current can help preempt motor failures. Timely maintenance can mitigate risks and prevent unplanned downtime.",
-    "Compressor": "The compressor demonstrates a slow decline early on, followed by a sharp drop, highlighting potential issues with pressure or seals. The data suggests that regular maintenance of seals and valves can prolong the compressor's lifespan. Additionally, monitoring for abnormal noise and vibrations is recommended.",
-    "Valve": "The valve maintains health initially but deteriorates quickly later, often due to corrosion or mechanical fatigue. The figures show that monitoring fluid pressure and flow rate can provide early failure detection. Regular cleaning and inspection can help avoid operational disruptions."
+
+# Select the non-interactive backend up front so nothing that imports pyplot probes for a GUI toolkit
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import streamlit as st
+
+# Heavy modules (NumPy models, matplotlib, SQLite job queue) are imported inside the functions and
+# tab bodies that use them, so opening the app only pays for what the visible tab needs.
+
+LOCAL_MACHINE = "Machine 1"
+TAB_NAMES = ["Overall Maintenance", "Maintenance Insights", "RUL Models", "Train New Models"]
+# Widgets in hidden tabs are not rendered; these keys are re-assigned each run so selections survive tab switches
+PERSISTENT_WIDGET_KEYS = ["selected_part", "dropdown_part", "dropdown_sensor", "model_selection", "live_sensor",
+                          "search_method"]
+# Tab4 search strategies -> (job target, keyword arguments)
+SEARCH_METHODS = {
+    "Hyperband (random search + successive halving)": ("maintenance.training:search_from_file", {}),
+    "Random search": ("maintenance.training:search_from_file", {"method": "random"}),
+    "Cross-validated grid": ("maintenance.training:train_from_file", {}),
 }
 
-def generate_maintenance_insights(part):
-    # Generate decaying maintenance graph data with multiple lines and noise
-    time = np.linspace(0, 350, 100)  # Mock time scale
-    fig, ax = plt.subplots()
-    decay_rate = random.uniform(2, 5)  # Random decay rate for each line
-
-    for i in range(5):  # Generate 5 curves with different end points
-        initial_health = 1
-        rul = random.randint(250, 350)  # Random RUL between 250 to 350
-        noise = np.random.normal(0, 0.02, size=time.shape)  # Add minor noise
-
-        # Create a curve that stays flat initially, then drops to 0 at the RUL point
-        health = np.piecewise(
-            time,
-            [time <= rul, time > rul],
-            [lambda t: initial_health * (1 - (t / rul) ** decay_rate), 0]
-        ) + noise
-        health = np.clip(health, 0, 1)  # Ensure health stays within [0, 1]
-        time_clip = np.clip(time, 0, rul)
-        ax.plot(time_clip, health, label=f'Curve {i+1} (RUL={rul})')
-
-    # Add a fitted line (black, dotted, not identical to any drawn lines)
-    sampled_time = np.linspace(0, 350, 10)
-    sampled_rul = random.randint(280, 320)
-    sampled_time_clip = np.clip(sampled_time, 0, sampled_rul)
-    sampled_health = np.clip(1 - (sampled_time / sampled_rul) ** decay_rate, 0, 1)
-    ax.plot(sampled_time_clip, sampled_health, '--', color='black', label='Fitted Line')
-
-    # Highlight 3 random points on the fitted line within the first 1/3 of the sampled RUL
-    max_index = len(sampled_time_clip) // 3
-    random_indices = random.sample(range(max_index), 3)
-    for idx in random_indices:
-        ax.plot(sampled_time_clip[idx], sampled_health[idx], '*', color='black')
-
-    ax.set_title(f'Training Data for {part}')
-    ax.set_xlabel('Time')
-    ax.set_ylabel('Health Indicator')
-    ax.legend()
-
-    # Save graph as an image
-    fig_path = f"{part}_maintenance_trend.png"
-    fig.savefig(fig_path)
-    plt.close(fig)
-
-    # Randomized explanation for the selected part
-    explanation = EXPLANATIONS.get(part, "No explanation available for this part.")
-
-    return fig_path, explanation
 
-# Main Tabs
-st.title("Machine Maintenance Application")
+@st.cache_resource
+def load_machine_drawing():
+    # Read the SVG markup once per process instead of on every rerun of tab1 and tab2
+    with open("machine-drawing.svg", encoding="utf-8") as f:
+        return f.read()
 
-# Create tabs
-tab1, tab2, tab3, tab4 = st.tabs(["Overall Maintenance", "Maintenance Insights", "RUL Models", "Train New Models"])
 
-with tab1:
-    st.header("Overall Machine Maintenance Requirements")
+@st.cache_resource
+def get_catalog():
+    # Part/sensor types, uploads and model versions live in SQLite; the pool is shared by every session
+    from maintenance.catalog import Catalog
 
-    # Show machine image on top
-    st.image("machine-drawing.svg", caption="Machine Diagram", use_container_width=True)
+    return Catalog().seed(machines=[LOCAL_MACHINE])
 
-    # Highlight part with the shortest RUL and provide insights
-    shortest_rul_part = random.choice(["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"])
-    st.subheader(f"Critical Maintenance Required: {shortest_rul_part}")
-    st.write(f"The {shortest_rul_part} has the shortest Remaining Useful Life (RUL) and requires immediate attention. Suggested actions:")
-    st.markdown("- **Inspect and Diagnose**: Perform a detailed inspection to identify the root cause of wear.")
-    st.markdown(f"- **Repair/Replace**: Plan for repair or replacement of the {shortest_rul_part}. This may include components such as seals, bearings, gaskets, or lubricants.")
-    st.markdown(f"- **Spare Parts**: Ensure availability of relevant spare parts like {shortest_rul_part}-specific kits including pressure sensors, vibration dampers, or tension belts.")
-    st.markdown(f"- **Reference Manual**: [Comprehensive Machine Maintenance Guide (2025 Edition)](https://www.datarobot.com) - Refer to Section 4.2, Page 123 for detailed steps on maintaining and repairing the {shortest_rul_part}.")
 
-with tab2:
-    st.header("Machine Maintenance Insights")
+@st.cache_resource
+def get_render_cache():
+    # Shared by every session in this server process
+    from maintenance.render_cache import RenderCache
 
-    # Create two columns
-    col1, col2 = st.columns(2)
+    return RenderCache()
 
-    # Column 1: Show machine image
-    with col1:
-        st.image("machine-drawing.svg", caption="Machine Diagram", use_container_width=True)
 
-    # Column 2: Radial list for selecting machine parts
-    with col2:
-        parts = ["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"]
-        selected_part = st.radio("Select a Machine Part", parts, key="selected_part")
-        uploaded_file = st.file_uploader(f"Upload Sensor Data for {selected_part}", type=["csv", "txt"], key=f"file_{selected_part}")
-        if uploaded_file:
-            st.write(f"Uploaded File for {selected_part}: {uploaded_file.name}")
+@st.cache_resource
+def get_sensor_store():
+    from maintenance.store import SensorStore
 
-    if selected_part:
-        st.subheader(f"Insights for {selected_part}")
+    return SensorStore()
 
-        # Generate and display maintenance insights
-        fig_path, explanation = generate_maintenance_insights(selected_part)
-        st.image(fig_path, caption=f"Generated Maintenance Trend for {selected_part}", use_container_width=True)
-        st.write(explanation)
 
-with tab3:
-    st.header("RUL Models for Machine Parts")
+@st.cache_resource
+def get_job_queue():
+    # One dispatcher per server process; jobs themselves live in SQLite and survive reloads
+    from maintenance.jobs import JobQueue
 
-    st.write("Select a machine part and corresponding sensor type to estimate Remaining Useful Life (RUL):")
+    return JobQueue().start()
 
-    # Dropdown hierarchy for machine part and sensor type
-    selected_part = st.selectbox("Select Machine Part", parts, key="dropdown_part")
-    sensors = ["Temperature", "Acceleration", "Vibration", "Fluid Speed", "Pressure", "Current"]
-    selected_sensor = st.selectbox("Select Sensor Type", sensors, key="dropdown_sensor")
 
-    st.write(f"You selected {selected_part} with {selected_sensor} sensor.")
+@st.cache_resource
+def get_model_registry():
+    # Fitted RUL models on disk, plus the process-wide LRU of warm ones every session shares
+    from maintenance.registry import ModelRegistry
 
-    selected_model = st.radio(
-        "Select a machine learning model:",
-        ["Linear Regression", "Random Forest", "Neural Network", "Support Vector Machine"],
-        key="model_selection"
-    )
+    return ModelRegistry()
 
-    # Mock-up performance chart
-    if selected_model:
-        st.write(f"Performance of {selected_model} for {selected_part} with {selected_sensor} sensor:")
 
-        # Generate a performance chart
-        metrics = ["Accuracy", "Precision", "Recall", "F1-Score"]
-        values = [random.uniform(0.7, 1.0) for _ in metrics]
-        fig, ax = plt.subplots()
-        ax.bar(metrics, values, color='skyblue')
-        ax.set_ylim(0, 1)
-        ax.set_ylabel("Score")
-        ax.set_title("Model Performance Metrics")
+def fit_rul_model(part, sensor, model_name, history_rows):
+    # history_rows identifies the training data, so new uploads trigger a refit; otherwise the stored
+    # artifact is served from the warm cache, or memory-mapped from disk after a server restart
+    from maintenance.evaluation import RULEvaluation
+    from maintenance.models import DATASET_VERSION
 
-        st.pyplot(fig)
+    def fit():
+        from maintenance.evaluation import evaluate_holdout
+        from maintenance.models import rul_training_data
+        from maintenance.scoring import fit_latest_rul
 
-        st.write("### Explanation of Model Performance")
-        st.write(f"The {selected_model} model shows reliable performance for predicting RUL based on {selected_sensor} data. High precision indicates accurate predictions with minimal false positives, while strong recall ensures most failure cases are identified. The F1-Score balances these metrics, offering a comprehensive view of the model's effectiveness.")
+        X, y, source = rul_training_data(get_sensor_store(), part, sensor)
+        model, latest_rul, holdout_rmse = fit_latest_rul(X, y, model_name)
+        # Hold-out metrics are computed once per fit and stored with the artifact, so switching models is instant.
+        # They need whole held-out runs; one self-labelled uploaded series has none, so it stays unvalidated
+        try:
+            evaluation = vars(evaluate_holdout(model, X, y))
+        except ValueError:
+            evaluation = None
+        metadata = {"latest_rul": latest_rul, "holdout_rmse": holdout_rmse, "source": source,
+                    "evaluation": evaluation}
+        # Models fitted on uploaded history are versioned in the catalog; simulated fallbacks are not
+        if source == "uploaded":
+            metadata["catalog_version"] = get_catalog().record_model_version(
+                LOCAL_MACHINE, part, sensor, model_name, metrics=metadata["evaluation"],
+                training_rows=history_rows, source=source)
+        return model, metadata
+
+    model, metadata = get_model_registry().get_or_fit(part, sensor, model_name, fit, history_rows=history_rows,
+                                                      dataset_version=DATASET_VERSION)
+    return (model, metadata["latest_rul"], metadata["holdout_rmse"], metadata["source"],
+            metadata.get("catalog_version"),
+            RULEvaluation(**metadata["evaluation"]) if metadata["evaluation"] else None)
+
+
+@st.cache_resource(max_entries=32)
+def measured_health_indicator(part, history_rows):
+    # Health indicator from the part's first vibration/acceleration channel; history_rows keys refreshes
+    from maintenance.scoring import stored_health_indicator
+
+    return stored_health_indicator(get_sensor_store(), part)
+
+
+@st.cache_resource
+def get_fleet_ranking():
+    # Starts from a simulated snapshot of this machine; uploaded-data predictions from tab3 replace it
+    from maintenance.ranking import RULRanking
+    from maintenance.simulation import simulate_degradation
+
+    ranking = RULRanking()
+    ruls, _, _ = simulate_degradation(len(PARTS), [0.0], seed=0)
+    ranking.update_many((LOCAL_MACHINE, part, rul) for part, rul in zip(PARTS, ruls))
+    return ranking
 
-with tab4:
-    st.header("Train New Models with DataRobot")
 
-    st.write("Upload your dataset to train new predictive models using DataRobot's AutoML capabilities:")
+@st.cache_resource
+def get_stream_hub():
+    # Live readings for every part x sensor; each part's streaming RUL estimate moves it in the tab1 ranking
+    from maintenance.streaming import StreamHub
 
-    # File uploader for training data
-    training_file = st.file_uploader("Upload Training Data", type=["csv", "xlsx", "txt"], key="train_file")
+    hub = StreamHub(PARTS, SENSORS)
+    ranking = get_fleet_ranking()
+    hub.subscribe(ranking.stream_listener(LOCAL_MACHINE))
+    return hub
 
-    if training_file:
-        st.write(f"Uploaded Training File: {training_file.name}")
-        st.write("Once uploaded, the dataset will be processed using DataRobot to train new models.")
 
-    # Placeholder for future integration with DataRobot API
-    st.button("Train Models", key="train_models", help="This feature will integrate with DataRobot in a future release.")
+@st.cache_resource
+def get_simulated_feed():
+    # Local test source for the live feed; started and stopped from tab2
+    from maintenance.streaming import SimulatedFeed
+
+    return SimulatedFeed(get_stream_hub())
+
+
+def count_run(region):
+    # Per-session tally of full script runs and fragment reruns, shown by the ?debug=1 panel
+    counts = st.session_state.setdefault("run_counts", {})
+    counts[region] = counts.get(region, 0) + 1
+
+
+# Main Tabs
+st.title("Machine Maintenance Application")
+count_run("full script")
+
+catalog = get_catalog()
+PARTS = catalog.part_types()
+SENSORS = catalog.sensor_types()
+
+for key in PERSISTENT_WIDGET_KEYS:
+    if key in st.session_state:
+        st.session_state[key] = st.session_state[key]
+
+# Create tabs; only the open tab's body is executed on each run
+tab1, tab2, tab3, tab4 = st.tabs(TAB_NAMES, key="active_tab", on_change="rerun")
+
+with tab1:
+    if tab1.open:
+        st.header("Overall Machine Maintenance Requirements")
+
+        # Show machine image on top
+        st.image(load_machine_drawing(), caption="Machine Diagram", use_container_width=True)
+
+        # Highlight part with the shortest RUL and provide insights
+        ranking = get_fleet_ranking()
+        shortest_rul_machine, shortest_rul_part, shortest_rul = ranking.most_critical()
+        st.subheader(f"Critical Maintenance Required: {shortest_rul_part}")
+        st.write(f"The {shortest_rul_part} has the shortest Remaining Useful Life (RUL) and requires immediate attention. Suggested actions:")
+        st.markdown("- **Inspect and Diagnose**: Perform a detailed inspection to identify the root cause of wear.")
+        st.markdown(f"- **Repair/Replace**: Plan for repair or replacement of the {shortest_rul_part}. This may include components such as seals, bearings, gaskets, or lubricants.")
+        st.markdown(f"- **Spare Parts**: Ensure availability of relevant spare parts like {shortest_rul_part}-specific kits including pressure sensors, vibration dampers, or tension belts.")
+        st.markdown(f"- **Reference Manual**: [Comprehensive Machine Maintenance Guide (2025 Edition)](https://www.datarobot.com) - Refer to Section 4.2, Page 123 for detailed steps on maintaining and repairing the {shortest_rul_part}.")
+
+        st.write(f"Most critical parts across {len(ranking):,} monitored part instances:")
+        # Plain markdown table: st.table would pull in pandas just for five rows
+        rows = [f"| {machine} | {part} | {rul:.0f} |" for machine, part, rul in ranking.top_k(5)]
+        st.markdown("\n".join(["| Machine | Part | Predicted RUL |", "| --- | --- | --- |", *rows]))
+
+with tab2:
+    if tab2.open:
+        st.header("Machine Maintenance Insights")
+
+        # Part selection, uploads and the chart rerun on their own; the rest of the page is untouched
+        @st.fragment
+        def insights_panel():
+            count_run("tab2 insights fragment")
+
+            # Create two columns
+            col1, col2 = st.columns(2)
+
+            # Column 1: Show machine image
+            with col1:
+                st.image(load_machine_drawing(), caption="Machine Diagram", use_container_width=True)
+
+            # Column 2: Radial list for selecting machine parts
+            with col2:
+                selected_part = st.radio("Select a Machine Part", PARTS, key="selected_part")
+                uploaded_file = st.file_uploader(f"Upload Sensor Data for {selected_part}", type=["csv", "txt"], key=f"file_{selected_part}")
+                if uploaded_file:
+                    st.write(f"Uploaded File for {selected_part}: {uploaded_file.name}")
+
+                    # New sensor data is parsed once and invalidates any chart rendered for this part
+                    if st.session_state.get(f"upload_id_{selected_part}") != uploaded_file.file_id:
+                        from maintenance.ingest import IngestStats, iter_sensor_chunks
+
+                        progress_bar = st.progress(0.0, text="Parsing sensor data...")
+                        uploaded_file.seek(0)
+                        stats = IngestStats()
+                        store = get_sensor_store()
+                        rows_before = {channel: store.info(selected_part, channel)["rows"]
+                                       for channel in store.channels(selected_part)}
+                        try:
+                            for chunk in iter_sensor_chunks(
+                                uploaded_file, stats=stats, total_bytes=uploaded_file.size,
+                                progress=lambda done, total, rows: progress_bar.progress(
+                                    min(done / total, 1.0) if total else 1.0, text=f"Parsed {rows:,} rows"),
+                            ):
+                                store.append_chunk(selected_part, chunk, stats.channels)
+                        except ValueError as e:
+                            st.warning(f"Sensor data was not fully stored: {e}")
+                        progress_bar.empty()
+                        added = {channel: store.info(selected_part, channel)["rows"] - rows_before.get(channel, 0)
+                                 for channel in store.channels(selected_part)}
+                        catalog.record_upload(LOCAL_MACHINE, selected_part, {c: n for c, n in added.items() if n},
+                                              file_name=uploaded_file.name, file_id=uploaded_file.file_id,
+                                              size=uploaded_file.size)
+                        st.session_state[f"upload_stats_{selected_part}"] = stats
+                        st.session_state[f"upload_id_{selected_part}"] = uploaded_file.file_id
+                        get_render_cache().invalidate(selected_part)
+
+                    stats = st.session_state[f"upload_stats_{selected_part}"]
+                    st.write(f"Parsed {stats.rows:,} rows across {len(stats.channels)} channel(s) "
+                             f"at {stats.rows_per_s:,.0f} rows/s ({stats.mb_per_s:.1f} MB/s)")
+
+            if selected_part:
+                st.subheader(f"Insights for {selected_part}")
+
+                # Generate and display maintenance insights
+                from maintenance.insights import cached_maintenance_insights
+
+                # Keep one seed per session so reruns from unrelated widgets hit the render cache
+                chart_seed = st.session_state.setdefault("chart_seed", random.randrange(2**32))
+                store = get_sensor_store()
+                history_rows = sum(store.info(selected_part, channel)["rows"] for channel in store.channels(selected_part))
+                chart_png, explanation = cached_maintenance_insights(
+                    get_render_cache(), selected_part, chart_seed,
+                    fingerprint=(st.session_state.get(f"upload_id_{selected_part}"), history_rows),
+                    measured=measured_health_indicator(selected_part, history_rows) if history_rows else None,
+                    explanation=catalog.explanation(selected_part),
+                )
+                st.image(chart_png, caption=f"Generated Maintenance Trend for {selected_part}", use_container_width=True)
+                st.write(explanation)
+
+                # Uploaded history is drawn from the store's decimation pyramid, never from every raw sample
+                channels = store.channels(selected_part)
+                if channels:
+                    from maintenance.insights import build_history_figure, render_figure
+
+                    st.subheader(f"Sensor History for {selected_part}")
+                    channel = st.selectbox("Sensor channel", channels, key=f"history_channel_{selected_part}")
+                    info = store.info(selected_part, channel)
+                    t_min, t_max = info["t_min"], info["t_max"]
+                    if t_max > t_min:
+                        window = st.slider("Time range", t_min, t_max, (t_min, t_max), key=f"history_range_{selected_part}")
+                    else:
+                        window = (t_min, t_max)
+                    timestamp, value = store.read_decimated(selected_part, channel, window[0], math.nextafter(window[1], math.inf))
+                    st.image(render_figure(build_history_figure(selected_part, channel, timestamp, value)),
+                             caption=f"{len(timestamp):,} plotted points from {info['rows']:,} stored samples",
+                             use_container_width=True)
+
+        insights_panel()
+
+        # The feed is shared by every session; toggling it reruns the page so the live panel can start polling
+        feed = get_simulated_feed()
+        live = st.toggle("Simulated live feed", value=feed.running,
+                         help="Streams simulated readings for every part and sensor into the live panel and the fleet ranking.")
+        if live and not feed.running:
+            feed.start()
+        elif not live and feed.running:
+            feed.stop()
+
+        @st.fragment(run_every=1 if feed.running else None)
+        def live_feed_panel():
+            count_run("tab2 live feed fragment")
+            hub = get_stream_hub()
+            part = st.session_state.get("selected_part", PARTS[0])
+            if not hub.has_data(part):
+                return
+
+            from maintenance.insights import build_stream_figure, render_figure
+
+            st.subheader(f"Live Readings for {part}")
+            sensor = st.selectbox("Live sensor", SENSORS, key="live_sensor")
+            stats = hub.stats(part, sensor)
+            cols = st.columns(4)
+            cols[0].metric("EWMA", f"{stats['ewma']:.3f}")
+            cols[1].metric("Rolling mean ± std", f"{stats['mean']:.3f} ± {stats['std']:.3f}")
+            cols[2].metric("Rolling min / max", f"{stats['min']:.2f} / {stats['max']:.2f}")
+            rul = hub.part_rul(part)
+            cols[3].metric("Streaming RUL", "warming up" if rul is None else f"{rul:.0f}")
+            trends = {name: hub.trend(part, name) for name in SENSORS}
+            st.image(render_figure(build_stream_figure(part, trends, highlight=sensor)), use_container_width=True)
+
+        live_feed_panel()
+
+with tab3:
+    if tab3.open:
+        st.header("RUL Models for Machine Parts")
+
+        st.write("Select a machine part and corresponding sensor type to estimate Remaining Useful Life (RUL):")
+
+        # Part, sensor and model widgets only rerun this fragment
+        @st.fragment
+        def rul_model_panel():
+            count_run("tab3 models fragment")
+
+            # Dropdown hierarchy for machine part and sensor type
+            selected_part = st.selectbox("Select Machine Part", PARTS, key="dropdown_part")
+            selected_sensor = st.selectbox("Select Sensor Type", SENSORS, key="dropdown_sensor")
+
+            st.write(f"You selected {selected_part} with {selected_sensor} sensor.")
+
+            selected_model = st.radio(
+                "Select a machine learning model:",
+                ["Linear Regression", "Random Forest", "Neural Network", "Support Vector Machine"],
+                key="model_selection"
+            )
+
+            if selected_model:
+                history = get_sensor_store().info(selected_part, selected_sensor)
+                _, latest_rul, holdout_rmse, source, version, evaluation = fit_rul_model(
+                    selected_part, selected_sensor, selected_model, history["rows"] if history else 0)
+                # Only a model validated on held-out run-to-failure data may move this part in the fleet ranking
+                if source == "uploaded" and evaluation is not None:
+                    get_fleet_ranking().update(LOCAL_MACHINE, selected_part, max(latest_rul, 0))
+                st.metric(f"Predicted RUL ({selected_model})", f"{max(latest_rul, 0):.0f}",
+                          help=f"Hold-out RMSE {holdout_rmse:.1f} on {source} {selected_sensor} data"
+                               + (f" (model version {version})" if version else ""))
+
+                if evaluation is None:
+                    st.info(f"The {selected_part} {selected_sensor} history is a single series labelled by assuming it "
+                            "ends at failure, so there are no held-out run-to-failure runs to validate this "
+                            f"{selected_model} model on. Its RUL estimate is unvalidated.")
+                    return
+
+                # Hold-out metrics, cached with the model; the chart PNG is cached per part x sensor x model
+                st.write(f"Performance of {selected_model} for {selected_part} with {selected_sensor} sensor "
+                         f"({evaluation.samples:,} held-out windows, {evaluation.runs} run(s) to failure):")
+                rmse_col, mae_col, nasa_col, horizon_col = st.columns(4)
+                rmse_col.metric("RMSE", f"{evaluation.rmse:.1f}")
+                mae_col.metric("MAE", f"{evaluation.mae:.1f}")
+                nasa_col.metric("NASA score", f"{evaluation.nasa_score:.3g}",
+                                help="Mean asymmetric PHM08 score; late predictions are penalized more than early ones")
+                horizon_col.metric("Prognostic horizon", f"{evaluation.prognostic_horizon:.0f}",
+                                   help=f"How long before failure predictions stay within ±{evaluation.alpha:.0%} of total life")
+
+                from maintenance.insights import cached_performance_figure
+
+                st.image(cached_performance_figure(get_render_cache(), selected_part, selected_sensor, selected_model,
+                                                   evaluation, fingerprint=history["rows"] if history else 0))
+
+                st.write("### Explanation of Model Performance")
+                st.write(f"On held-out {source} {selected_sensor} data the {selected_model} model misses the true "
+                         f"RUL by {evaluation.mae:.1f} on average (RMSE {evaluation.rmse:.1f}). "
+                         f"{evaluation.alpha_lambda:.0%} of runs are within ±{evaluation.alpha:.0%} of the true RUL halfway to failure "
+                         f"(α-λ accuracy). As a \"fails within {evaluation.horizon:.0f}\" alarm it reaches "
+                         f"{evaluation.precision:.0%} precision and {evaluation.recall:.0%} recall "
+                         f"(F1 {evaluation.f1:.2f}, accuracy {evaluation.accuracy:.0%}).")
+
+        rul_model_panel()
+
+with tab4:
+    if tab4.open:
+        st.header("Train New Models")
+
+        st.write("Upload your dataset to train and cross-validate predictive models locally:")
+
+        # Uploading and submitting only rerun this fragment
+        @st.fragment
+        def training_form():
+            count_run("tab4 training fragment")
+
+            # File uploader for training data
+            training_file = st.file_uploader("Upload Training Data", type=["csv", "xlsx", "txt"], key="train_file")
+
+            if training_file:
+                st.write(f"Uploaded Training File: {training_file.name}")
+                st.write("Use a `rul` target column for tabular data, or upload a run-to-failure sensor export.")
+
+            search_method = st.radio("Search strategy", list(SEARCH_METHODS), key="search_method",
+                                     help="Hyperband samples random candidates for all four model families and drops "
+                                          "the weakest after cheap fits on a subsample, training only the best on all rows.")
+
+            # Training runs as a background job; the page only submits it and polls its progress
+            if st.button("Train Models", key="train_models", help="Runs fully offline on this machine's cores."):
+                if not training_file:
+                    st.warning("Upload a training file first.")
+                else:
+                    queue = get_job_queue()
+                    path = queue.path_for(training_file.name)
+                    with open(path, "wb") as f:
+                        f.write(training_file.getbuffer())
+                    target, options = SEARCH_METHODS[search_method]
+                    queue.submit(target, path, label=training_file.name,
+                                 max_workers=max(1, (os.cpu_count() or 1) // queue.max_workers), **options)
+                    st.success(f"Queued training on {training_file.name}.")
+
+        training_form()
+
+        @st.fragment(run_every=2)
+        def training_jobs():
+            queue = get_job_queue()
+            jobs = queue.jobs(limit=10)
+            if not jobs:
+                return
+            st.subheader("Training Jobs")
+            for job in jobs:
+                label = f"{job['label']} ({job['status']})"
+                if job["status"] in ("queued", "running"):
+                    st.progress(job["progress"], text=label)
+                    if st.button("Cancel", key=f"cancel_{job['id']}"):
+                        queue.cancel(job["id"])
+                elif job["status"] == "done":
+                    with st.expander(label):
+                        report = queue.result(job["id"])
+                        st.dataframe([{**row, "params": str(row["params"])} for row in report.leaderboard])
+                        st.write(f"{len(report.tasks)} fits on {report.workers} worker(s) in {report.wall_seconds:.1f} s "
+                                 f"({report.task_seconds:.1f} s of task time, {report.parallel_efficiency:.0%} efficiency)")
+                        if hasattr(report, "best_so_far"):
+                            st.write(f"{report.candidates} candidates searched at {report.trials_per_minute:,.0f} "
+                                     "trials/min. Best fully trained RMSE so far:")
+                            curve = report.best_so_far()
+                            st.line_chart({"seconds": [t for t, _ in curve], "best RMSE": [rmse for _, rmse in curve]},
+                                          x="seconds", y="best RMSE")
+                elif job["status"] == "failed":
+                    with st.expander(label):
+                        st.code(job["error"])
+                else:
+                    st.write(label)
+
+        training_jobs()
+
+# Instrumentation: open the app with ?debug=1 to watch which regions each interaction reruns
+if st.query_params.get("debug") == "1":
+    with st.sidebar:
+        @st.fragment(run_every=1)
+        def debug_panel():
+            from maintenance.instrumentation import calls
+
+            st.caption("Runs in this session")
+            st.json(st.session_state.get("run_counts", {}))
+            st.caption("Chart function calls (all sessions)")
+            st.json(calls.snapshot())
+            st.caption("Warm model cache (all sessions)")
+            st.json(get_model_registry().cache.stats())
+
+        debug_panel()
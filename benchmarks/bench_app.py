@@ -0,0 +1,142 @@
+# Rerun cost of every tab in app.py, with locally stored baselines for regression checks
+#   python -m benchmarks.bench_app [--repeats N] [--save-baseline] [--tolerance 0.25]
+# Run from the repository root (app.py loads machine-drawing.svg relative to the working directory).
+import argparse
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+# Keep benchmark uploads, jobs and models out of the real data directories
+_scratch = tempfile.mkdtemp(prefix="bench_app_")
+atexit.register(shutil.rmtree, _scratch, ignore_errors=True)
+os.environ.setdefault("SENSOR_STORE_DIR", os.path.join(_scratch, "sensor_store"))
+os.environ.setdefault("MAINTENANCE_JOB_DIR", os.path.join(_scratch, "jobs"))
+os.environ.setdefault("MAINTENANCE_MODEL_DIR", os.path.join(_scratch, "models"))
+
+from maintenance.evaluation import evaluate  # noqa: E402
+from maintenance.insights import (build_performance_figure, cached_maintenance_insights,  # noqa: E402
+                                  generate_maintenance_insights, render_figure)
+from maintenance.render_cache import RenderCache  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baselines.json")
+PARTS = ["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"]
+TABS = ["Overall Maintenance", "Maintenance Insights", "RUL Models", "Train New Models"]
+MODELS = ["Linear Regression", "Random Forest", "Neural Network", "Support Vector Machine"]
+
+
+def app_cases():
+    from streamlit.testing.v1 import AppTest
+
+    def session(tab):
+        # Only the open tab's body runs, so each tab gets its own session
+        app = AppTest.from_file(APP_PATH, default_timeout=300)
+        app.session_state["active_tab"] = tab
+        return app.run()
+
+    def first_run(i):
+        AppTest.from_file(APP_PATH, default_timeout=300).run()
+
+    cases = {"app: first run (new session)": first_run}
+    for tab in TABS:
+        app = session(tab)
+        cases[f"app: rerun on {tab}"] = lambda i, app=app: app.run()
+
+    insights, models = session(TABS[1]), session(TABS[2])
+    cases["app: tab2 part change"] = lambda i: insights.radio(key="selected_part").set_value(PARTS[i % len(PARTS)]).run()
+    cases["app: tab3 model change"] = lambda i: models.radio(key="model_selection").set_value(MODELS[i % len(MODELS)]).run()
+    return cases
+
+
+def component_cases():
+    cache = RenderCache()
+    for part in PARTS:
+        cached_maintenance_insights(cache, part, 0)
+    # tab3 charts the RUL metrics of RULEvaluation.scores(); four noisy 100-step runs give realistic values
+    life = np.tile(np.arange(100.0, -1, -1), 4)
+    scores = evaluate(life, life + np.random.default_rng(0).normal(0, 8, len(life))).scores()
+
+    def load_image(i):
+        with open(os.path.join(ROOT, "machine-drawing.svg"), "rb") as f:
+            f.read()
+
+    return {
+        "tab1/tab2: machine image load": load_image,
+        "tab2: generate_maintenance_insights": lambda i: generate_maintenance_insights(PARTS[i % len(PARTS)], seed=i),
+        "tab2: cached insights hit": lambda i: cached_maintenance_insights(cache, PARTS[i % len(PARTS)], 0),
+        "tab3: performance chart":
+            lambda i: render_figure(build_performance_figure(list(scores), list(scores.values()))),
+    }
+
+
+def measure(fn, repeats):
+    fn(0)  # warm-up outside the measurement
+    timings = []
+    for i in range(1, repeats + 1):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Peak Python heap allocation of one extra call, traced separately so it does not skew timings
+    tracemalloc.start()
+    fn(repeats + 1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {"p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "peak_mb": peak / 2**20, "repeats": repeats}
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and result["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {result['p50_ms']:.2f} ms vs baseline {base['p50_ms']:.2f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every tab of app.py")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINE_PATH}")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown vs baseline")
+    parser.add_argument("--skip-app", action="store_true", help="only run component benchmarks")
+    args = parser.parse_args(argv)
+
+    cases = component_cases()
+    if not args.skip_app:
+        cases.update(app_cases())
+
+    results = {}
+    print(f"{'case':<42} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak MB':>8}")
+    for name, fn in cases.items():
+        results[name] = measure(fn, args.repeats if not name.startswith("app: first") else max(3, args.repeats // 4))
+        r = results[name]
+        print(f"{name:<42} {r['p50_ms']:9.3f} {r['p95_ms']:9.3f} {r['p99_ms']:9.3f} {r['peak_mb']:8.2f}")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"Saved baseline to {BASELINE_PATH}")
+        return 0
+
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# Metadata catalog: indexed lookups vs. full scans, and pooled concurrent reads
+#   python -m benchmarks.bench_catalog [machines] [uploads]
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from maintenance.catalog import PART_TYPES, SENSOR_TYPES, Catalog
+
+DAY = 86400.0
+# The same lookup with every index disabled, as a scan over the upload tables would run it
+SCAN_QUERY = """
+SELECT uploads.id FROM uploads NOT INDEXED
+JOIN upload_channels NOT INDEXED ON upload_channels.upload_id = uploads.id
+JOIN channels NOT INDEXED ON channels.id = upload_channels.channel_id
+JOIN parts NOT INDEXED ON parts.id = channels.part_id
+WHERE channels.sensor_type = ? AND parts.part_type = ? AND uploads.uploaded_at >= ?
+"""
+
+
+def populate(catalog, machines, uploads, now, rng):
+    start = time.perf_counter()
+    catalog.seed(machines=[f"Machine {i}" for i in range(machines)])
+    for i in range(uploads):
+        sensors = rng.sample(SENSOR_TYPES, rng.randint(1, 3))
+        catalog.record_upload(f"Machine {rng.randrange(machines)}", rng.choice(PART_TYPES),
+                              {sensor: rng.randint(1_000, 100_000) for sensor in sensors},
+                              file_name=f"upload_{i}.csv", uploaded_at=now - rng.uniform(0, 90 * DAY))
+    with catalog.pool.connection() as conn:
+        conn.execute("ANALYZE")
+    elapsed = time.perf_counter() - start
+    print(f"populate {machines:,} machines, {uploads:,} uploads in {elapsed:.1f} s "
+          f"({uploads / elapsed:,.0f} uploads/s), {os.path.getsize(catalog.db_path) / 1e6:.1f} MB")
+
+
+def median_ms(fn, repeats=20):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def concurrent_reads(catalog, threads, seconds, since):
+    done = [0] * threads
+    stop = threading.Event()
+
+    def reader(slot):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            catalog.uploads(rng.choice(PART_TYPES), rng.choice(SENSOR_TYPES), since=since)
+            done[slot] += 1
+
+    workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(done) / seconds
+
+
+def main(machines=2000, uploads=100_000):
+    rng = random.Random(0)
+    now = time.time()
+    since = now - DAY
+    with tempfile.TemporaryDirectory() as root:
+        catalog = Catalog(os.path.join(root, "catalog.db"))
+        populate(catalog, machines, uploads, now, rng)
+
+        found = catalog.uploads("Bearing", "Vibration", since=since, limit=uploads)
+        indexed = median_ms(lambda: catalog.uploads("Bearing", "Vibration", since=since, limit=uploads))
+        with catalog.pool.connection() as conn:
+            scanned = len(conn.execute(SCAN_QUERY, ("Vibration", "Bearing", since)).fetchall())
+            scan = median_ms(lambda: conn.execute(SCAN_QUERY, ("Vibration", "Bearing", since)).fetchall(), 3)
+            plan = conn.execute("EXPLAIN QUERY PLAN SELECT upload_id FROM upload_channels WHERE sensor_type = ? "
+                                "AND part_type = ? AND uploaded_at >= ?", ("Vibration", "Bearing", since)).fetchall()
+        assert len(found) == scanned
+        print(f"Bearings with Vibration uploads in the last 24 h: {len(found)} uploads")
+        print(f"  indexed {indexed:8.2f} ms   full scan {scan:8.2f} ms   ({scan / indexed:.0f}x)")
+        print("  plan: " + "; ".join(row["detail"] for row in plan))
+        print(f"  part/sensor lists {median_ms(lambda: (catalog.part_types(), catalog.sensor_types())):.3f} ms")
+
+        for threads in (1, 4, 16):
+            rate = concurrent_reads(catalog, threads, 2.0, since)
+            print(f"{threads:>3} threads x pool of {catalog.pool.size}: {rate:,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    args = [int(float(a)) for a in sys.argv[1:3]]
+    main(*args)
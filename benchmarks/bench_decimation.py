@@ -0,0 +1,57 @@
+# Plot-ready reads: decimating raw scans vs. the store's min/max pyramid, at several zoom levels
+#   python -m benchmarks.bench_decimation [rows]
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from maintenance.decimation import DEFAULT_POINTS, decimate
+from maintenance.insights import build_history_figure, render_figure
+from maintenance.store import SensorStore
+
+APPEND_BATCH = 10_000_000
+ZOOMS = (1.0, 0.1, 0.01, 0.001)
+
+
+def build_series(store, rows, rng):
+    start = time.perf_counter()
+    for lo in range(0, rows, APPEND_BATCH):
+        n = min(APPEND_BATCH, rows - lo)
+        store.append("Pump", "Pressure", np.arange(lo, lo + n, dtype=np.float64), np.cumsum(rng.standard_normal(n)))
+    elapsed = time.perf_counter() - start
+    print(f"append with pyramid  {rows:,} rows in {elapsed:.2f} s ({rows / elapsed / 1e6:.1f} M rows/s), "
+          f"levels {store.info('Pump', 'Pressure')['pyramid']}")
+
+
+def median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(rows=50_000_000, repeats=5):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as root:
+        store = SensorStore(root)
+        build_series(store, rows, rng)
+        print(f"{'zoom':>8} {'raw rows':>12} {'raw+minmax ms':>14} {'pyramid ms':>11} {'pyramid lttb ms':>16}")
+        for zoom in ZOOMS:
+            span = rows * zoom
+            lo = (rows - span) / 2
+            raw = median_ms(lambda: decimate(*store.read("Pump", "Pressure", lo, lo + span)), repeats)
+            pyramid = median_ms(lambda: store.read_decimated("Pump", "Pressure", lo, lo + span), repeats)
+            lttb = median_ms(lambda: store.read_decimated("Pump", "Pressure", lo, lo + span, method="lttb"), repeats)
+            print(f"{zoom:>8.1%} {int(span):>12,} {raw:>14.2f} {pyramid:>11.2f} {lttb:>16.2f}")
+
+        timestamp, value = store.read_decimated("Pump", "Pressure")
+        render_ms = median_ms(lambda: render_figure(build_history_figure("Pump", "Pressure", timestamp, value)), repeats)
+        print(f"render {len(timestamp):,} decimated points: {render_ms:.1f} ms (target {DEFAULT_POINTS} points)")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 50_000_000)
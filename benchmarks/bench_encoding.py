@@ -0,0 +1,61 @@
+# Archived series: compressed size vs. CSV text and raw float64 columns, and encode/decode throughput
+#   python -m benchmarks.bench_encoding [rows]
+import io
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from maintenance.encoding import decode_series, encode_series
+
+CSV_SAMPLE = 100_000  # rows formatted to estimate the CSV size
+
+
+def datasets(rows, rng):
+    # (label, timestamp, value, CSV format, precision) shaped like the series the app ingests
+    regular = 1.7e9 + np.arange(rows) / 100.0
+    jittered = 1.7e9 + np.cumsum(rng.uniform(0.005, 0.015, rows))
+    walk = np.cumsum(rng.standard_normal(rows))
+    yield "CSV readings, 3 dp, 100 Hz", regular, np.round(50 + 0.01 * walk, 3), "%.2f,%.3f", None
+    yield "full-precision floats", jittered, walk, "%.17g,%.17g", None
+    yield "full-precision, 0.01 step", jittered, walk, "%.17g,%.17g", 0.01
+
+
+def csv_bytes(timestamp, value, fmt):
+    sample = min(CSV_SAMPLE, len(value))
+    buffer = io.StringIO()
+    np.savetxt(buffer, np.column_stack([timestamp[:sample], value[:sample]]), fmt=fmt)
+    return len(buffer.getvalue()) / sample * len(value)
+
+
+def median_s(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(rows=10_000_000, repeats=3):
+    rng = np.random.default_rng(0)
+    raw = rows * 16  # float64 timestamp + value
+    print(f"{rows:,} rows, raw float64 {raw / 1e6:.0f} MB")
+    print(f"{'series':<28} {'encoded MB':>10} {'vs raw':>7} {'vs CSV':>7} {'max error':>10} "
+          f"{'encode MB/s':>12} {'decode MB/s':>12} {'raw copy MB/s':>14}")
+    for label, timestamp, value, fmt, precision in datasets(rows, rng):
+        data = encode_series(timestamp, value, precision)
+        decoded_t, decoded_v = decode_series(data)
+        assert np.array_equal(decoded_t, timestamp)
+        error = float(np.abs(decoded_v - value).max())
+        encode = median_s(lambda: encode_series(timestamp, value, precision), repeats)
+        decode = median_s(lambda: decode_series(data), repeats)
+        copy = median_s(lambda: (timestamp.copy(), value.copy()), repeats)
+        print(f"{label:<28} {len(data) / 1e6:>10.1f} {raw / len(data):>6.1f}x "
+              f"{csv_bytes(timestamp, value, fmt) / len(data):>6.1f}x {error:>10.2g} "
+              f"{raw / encode / 1e6:>12.0f} {raw / decode / 1e6:>12.0f} {raw / copy / 1e6:>14.0f}")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000_000)
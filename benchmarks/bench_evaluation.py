@@ -0,0 +1,51 @@
+# RUL evaluation metrics: one vectorized pass vs. a per-run Python loop, and the metrics of every model family
+#   python -m benchmarks.bench_evaluation [units]
+import sys
+import time
+
+import numpy as np
+
+from maintenance.evaluation import DEFAULT_ALPHA, evaluate, evaluate_holdout, run_starts
+from maintenance.models import MODEL_NAMES, fit_with_holdout, simulated_rul_dataset
+
+
+def loop_horizons(y_true, y_pred, alpha=DEFAULT_ALPHA):
+    # Reference: prognostic horizon walked run by run and sample by sample
+    starts = list(run_starts(y_true)) + [len(y_true)]
+    horizons = []
+    for lo, hi in zip(starts[:-1], starts[1:]):
+        life = max(y_true[lo:hi])
+        horizon = 0.0
+        for i in range(hi - 1, lo - 1, -1):
+            if abs(y_pred[i] - y_true[i]) > alpha * life:
+                break
+            horizon = y_true[i]
+        horizons.append(horizon)
+    return float(np.mean(horizons))
+
+
+def main(units=2_000):
+    X, y = simulated_rul_dataset(n_units=units, seed=0)
+    prediction = y + np.random.default_rng(0).normal(0, 20, len(y))
+    evaluate(y, prediction)  # warm up
+    start = time.perf_counter()
+    result = evaluate(y, prediction)
+    vectorized = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = loop_horizons(y.tolist(), prediction.tolist())
+    looped = time.perf_counter() - start
+    assert np.isclose(result.prognostic_horizon, reference)
+    print(f"{len(y):,} samples, {result.runs:,} runs: all metrics {vectorized * 1000:.1f} ms vectorized, "
+          f"prognostic horizon alone {looped * 1000:.1f} ms looped ({looped / vectorized:.0f}x)")
+
+    X, y = simulated_rul_dataset(seed=0)
+    print(f"{'model':<24}{'RMSE':>7}{'MAE':>7}{'NASA':>9}{'PH':>7}{'α-λ':>6}{'prec':>6}{'recall':>7}{'F1':>6}")
+    for name in MODEL_NAMES:
+        model, _ = fit_with_holdout(name, X, y)
+        e = evaluate_holdout(model, X, y)
+        print(f"{name:<24}{e.rmse:>7.1f}{e.mae:>7.1f}{e.nasa_score:>9.3g}{e.prognostic_horizon:>7.0f}"
+              f"{e.alpha_lambda:>6.2f}{e.precision:>6.2f}{e.recall:>7.2f}{e.f1:>6.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
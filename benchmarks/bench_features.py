@@ -0,0 +1,60 @@
+# Throughput of the vibration feature engine on a simulated bearing signal
+#   python -m benchmarks.bench_features [samples]
+import sys
+import time
+
+import numpy as np
+
+from maintenance.features import (FRAME_BATCH, bearing_fault_frequencies, envelope_spectrum, extract_features, frame_signal,
+                                  power_spectrum, time_domain_features)
+
+SAMPLE_RATE = 25_600.0
+
+
+def bearing_signal(samples, seed=0):
+    # Shaft harmonics plus an outer-race fault: impacts at BPFO ringing a 3 kHz resonance, growing over time
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples) / SAMPLE_RATE
+    faults = bearing_fault_frequencies(shaft_hz=25.0, n_rollers=9, roller_diameter=7.9, pitch_diameter=34.5)
+    growth = np.linspace(0.1, 1.0, samples)
+    impacts = (1 + np.cos(2 * np.pi * faults["BPFO"] * t)) ** 4 / 16
+    signal = np.sin(2 * np.pi * 25.0 * t) + 0.3 * np.sin(2 * np.pi * 50.0 * t)
+    signal += growth * impacts * np.sin(2 * np.pi * 3000.0 * t)
+    signal += 0.2 * rng.standard_normal(samples)
+    return signal, faults
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(samples=10_000_000):
+    signal, faults = bearing_signal(samples)
+    frames = frame_signal(signal)
+    print(f"{samples:,} samples at {SAMPLE_RATE:,.0f} Hz -> {len(frames):,} frames of {frames.shape[1]}")
+
+    # Components run on one FRAME_BATCH of frames, exactly as extract_features feeds them
+    batch = frames[:FRAME_BATCH]
+    batch_samples = len(batch) * (frames.shape[1] // 2)  # each frame advances the signal by one hop
+    cases = {
+        "time-domain (rms/peak/crest/kurtosis)": (lambda: time_domain_features(batch), batch_samples),
+        "power spectrum (batched rFFT)": (lambda: power_spectrum(batch, SAMPLE_RATE), batch_samples),
+        "envelope spectrum": (lambda: envelope_spectrum(batch, SAMPLE_RATE), batch_samples),
+        "extract_features": (lambda: extract_features(signal, SAMPLE_RATE), samples),
+        "extract_features + fault amplitudes": (
+            lambda: extract_features(signal, SAMPLE_RATE, fault_frequencies=faults), samples),
+    }
+    for name, (fn, n) in cases.items():
+        seconds = timed(fn)
+        print(f"{name:<40} {seconds * 1000:9.1f} ms  {n / seconds / 1e6:8.1f} M samples/s")
+
+    features = extract_features(signal, SAMPLE_RATE, fault_frequencies=faults)
+    early, late = slice(0, len(features) // 10), slice(-len(features) // 10, None)
+    for name, values in [("rms", features.rms), ("kurtosis", features.kurtosis), *features.fault_amplitude.items()]:
+        print(f"  {name:<9} first 10% {values[early].mean():8.3f}   last 10% {values[late].mean():8.3f}")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 10_000_000)
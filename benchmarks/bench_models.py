@@ -0,0 +1,35 @@
+# Fit time and batched predict throughput for every RUL model family
+#   python -m benchmarks.bench_models [rows]
+import sys
+import time
+
+import numpy as np
+
+from maintenance.models import MODEL_NAMES, make_model, simulated_rul_dataset
+
+
+def build_rows(rows, seed=0):
+    # Simulated fleets are ~150 usable rows per unit; grow the fleet until there are enough
+    X, y = simulated_rul_dataset(n_units=max(1, rows // 150 + 1), seed=seed)
+    return X[:rows], y[:rows]
+
+
+def main(rows=1_000_000):
+    X, y = build_rows(rows)
+    print(f"{len(X):,} rows x {X.shape[1]} features")
+    for name in MODEL_NAMES:
+        model = make_model(name)
+        start = time.perf_counter()
+        model.fit(X, y)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predictions = model.predict(X)
+        predict_seconds = time.perf_counter() - start
+        rmse = np.sqrt(np.mean((predictions - y) ** 2))
+        print(f"{name:<24} fit {fit_seconds:7.2f} s   predict {len(X) / predict_seconds:12,.0f} rows/s   "
+              f"train RMSE {rmse:6.2f}")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000)
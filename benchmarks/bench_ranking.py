@@ -0,0 +1,48 @@
+# Incremental update and top-k query cost of the fleet RUL ranking
+#   python -m benchmarks.bench_ranking [machines]
+import sys
+import time
+
+import numpy as np
+
+from maintenance.ranking import RULRanking
+
+PARTS = ["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"]
+
+
+def main(machines=100_000):
+    rng = np.random.default_rng(0)
+    ranking = RULRanking()
+    n = machines * len(PARTS)
+    ruls = rng.uniform(0, 350, size=n)
+
+    start = time.perf_counter()
+    ranking.update_many((m, part, ruls[m * len(PARTS) + j]) for m in range(machines) for j, part in enumerate(PARTS))
+    elapsed = time.perf_counter() - start
+    print(f"load      {n:,} part instances in {elapsed:.2f} s ({n / elapsed:,.0f} updates/s)")
+
+    updates = 200_000
+    machine_ids = rng.integers(0, machines, size=updates)
+    part_ids = rng.integers(0, len(PARTS), size=updates)
+    new_ruls = rng.uniform(0, 350, size=updates)
+    start = time.perf_counter()
+    for m, j, rul in zip(machine_ids.tolist(), part_ids.tolist(), new_ruls.tolist()):
+        ranking.update(m, PARTS[j], rul)
+    elapsed = time.perf_counter() - start
+    print(f"update    {updates:,} predictions in {elapsed:.2f} s ({elapsed / updates * 1e6:.2f} us each)")
+
+    for k in (1, 10, 100):
+        repeats = 1000
+        start = time.perf_counter()
+        for _ in range(repeats):
+            ranking.top_k(k)
+        elapsed = time.perf_counter() - start
+        print(f"top_k({k:>3}) {elapsed / repeats * 1e6:8.2f} us per query")
+
+    # Cross-check against a full sort
+    expected = sorted(ranking._heap)[:10]
+    assert [rul for _, _, rul in ranking.top_k(10)] == [rul for rul, _ in expected]
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000)
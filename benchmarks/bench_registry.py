@@ -0,0 +1,91 @@
+# Model registry: refit vs. memory-mapped load vs. warm-cache hit, and LRU hit rate under skewed access
+#   python -m benchmarks.bench_registry [lookups]
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from maintenance.catalog import PART_TYPES, SENSOR_TYPES
+from maintenance.models import MODEL_NAMES, fit_with_holdout, simulated_rul_dataset
+from maintenance.registry import ModelRegistry
+
+
+def median_ms(fn, repeats=10):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def load_times(registry, X, y):
+    print(f"{'model':<24}{'refit ms':>10}{'cold load ms':>14}{'warm hit us':>13}{'weights kB':>12}")
+    for name in MODEL_NAMES:
+        fit_ms = median_ms(lambda: fit_with_holdout(name, X, y), repeats=3)
+        model, _ = fit_with_holdout(name, X, y)
+        version = registry.save("Pump", "Vibration", name, model)
+
+        def cold():
+            registry.cache.invalidate()
+            registry.load("Pump", "Vibration", name, version)
+
+        cold_ms = median_ms(cold)
+        registry.load("Pump", "Vibration", name, version)
+        warm_ms = median_ms(lambda: registry.load("Pump", "Vibration", name, version), repeats=1000)
+        loaded, _ = registry.load("Pump", "Vibration", name, version)
+        assert np.array_equal(loaded.predict(X), model.predict(X))
+        size = sum(array.nbytes for array in _arrays(loaded))
+        print(f"{name:<24}{fit_ms:>10.1f}{cold_ms:>14.2f}{warm_ms * 1000:>13.1f}{size / 1e3:>12.1f}")
+
+
+def _arrays(value):
+    # Every ndarray reachable from a model's attributes
+    if isinstance(value, np.ndarray):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _arrays(item)
+    elif hasattr(value, "__dict__"):
+        for item in vars(value).values():
+            yield from _arrays(item)
+
+
+def hit_rate(registry, X, y, lookups, cache_entries):
+    # Every part x sensor x model stored once; sessions then ask for them with Zipf-like popularity
+    keys = [(part, sensor, name) for part in PART_TYPES for sensor in SENSOR_TYPES for name in MODEL_NAMES]
+    model, _ = fit_with_holdout("Linear Regression", X, y)
+    for part, sensor, name in keys:
+        registry.save(part, sensor, name, model)
+    rng = random.Random(0)
+    weights = [1 / (rank + 1) for rank in range(len(keys))]
+    rng.shuffle(keys)
+    registry.cache.invalidate()
+    start = time.perf_counter()
+    for key in rng.choices(keys, weights, k=lookups):
+        registry.load(*key, version=1)
+    elapsed = time.perf_counter() - start
+    stats = registry.cache.stats()
+    print(f"{lookups:,} lookups over {len(keys)} models, {cache_entries} warm: hit rate {stats['hit_rate']:.1%}, "
+          f"{stats['evictions']:,} evictions, mean load {stats['mean_load_ms']:.2f} ms, "
+          f"{elapsed / lookups * 1e6:.1f} us per lookup")
+
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    X, y = simulated_rul_dataset(seed=0)
+    root = tempfile.mkdtemp(prefix="bench_registry_")
+    try:
+        load_times(ModelRegistry(root), X, y)
+        for cache_entries in (16, 64):
+            hit_rate(ModelRegistry(f"{root}/{cache_entries}", cache_entries), X, y, lookups, cache_entries)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Compare per-render latency of the old disk round-trip against the in-memory pipeline
+#   python -m benchmarks.bench_render [repeats]
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from maintenance.insights import build_insights_figure, cached_maintenance_insights, render_figure
+from maintenance.render_cache import RenderCache
+
+
+def render_via_disk(part, seed, directory):
+    # Previous behaviour: figure saved to "{part}_maintenance_trend.png", then re-read by st.image
+    fig = build_insights_figure(part, seed=seed)
+    fig_path = os.path.join(directory, f"{part}_maintenance_trend.png")
+    fig.savefig(fig_path)
+    with open(fig_path, "rb") as f:
+        return f.read()
+
+
+def render_in_memory(part, seed, fmt):
+    return render_figure(build_insights_figure(part, seed=seed), fmt=fmt)
+
+
+def time_calls(fn, repeats):
+    timings = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(0.95 * len(timings)))]
+    print(f"{name:<14} mean {statistics.mean(timings):8.3f} ms   median {statistics.median(timings):8.3f} ms   p95 {p95:8.3f} ms")
+
+
+def main(repeats=30):
+    with tempfile.TemporaryDirectory() as directory:
+        report("disk png", time_calls(lambda i: render_via_disk("Pump", i, directory), repeats))
+    report("memory png", time_calls(lambda i: render_in_memory("Pump", i, "png"), repeats))
+    report("memory rgba", time_calls(lambda i: render_in_memory("Pump", i, "rgba"), repeats))
+
+    # Warm a cache with the six tab2 parts, then measure hits only
+    cache = RenderCache()
+    parts = ["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"]
+    for part in parts:
+        cached_maintenance_insights(cache, part, 0)
+    report("cache hit", time_calls(lambda i: cached_maintenance_insights(cache, parts[i % len(parts)], 0), repeats * 100))
+    print(cache.stats())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
@@ -0,0 +1,71 @@
+# History queries: aggregating raw scans vs. the store's rollup tiers, at typical dashboard ranges
+#   python -m benchmarks.bench_rollups [rows]
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from maintenance.rollups import aggregate
+from maintenance.store import SensorStore
+
+APPEND_BATCH = 10_000_000
+SAMPLE_RATE = 100.0  # Hz
+QUERIES = (  # (label, span in seconds or None for the full history, resolution in seconds)
+    ("last hour @ 1 s", 3600.0, 1.0),
+    ("last day @ 1 min", 86400.0, 60.0),
+    ("last day @ 10 min", 86400.0, 600.0),
+    ("full history @ 1 h", None, 3600.0),
+    ("full history @ 1 day", None, 86400.0),
+)
+
+
+def build_series(store, rows, rng):
+    start = time.perf_counter()
+    for lo in range(0, rows, APPEND_BATCH):
+        n = min(APPEND_BATCH, rows - lo)
+        timestamp = np.arange(lo, lo + n, dtype=np.float64) / SAMPLE_RATE
+        store.append("Pump", "Pressure", timestamp, np.cumsum(rng.standard_normal(n)))
+    elapsed = time.perf_counter() - start
+    tiers = {name: tier["rows"] for name, tier in store.info("Pump", "Pressure")["rollups"].items()}
+    print(f"append with rollups  {rows:,} rows in {elapsed:.2f} s ({rows / elapsed / 1e6:.1f} M rows/s), tiers {tiers}")
+
+
+def raw_query(store, start, end, resolution):
+    timestamp, value = store.read("Pump", "Pressure", start, end)
+    return aggregate(timestamp, np.ones(1), value, value, value, resolution)[0], len(timestamp)
+
+
+def median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - begin) * 1000)
+    return statistics.median(timings)
+
+
+def main(rows=50_000_000, repeats=5):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as root:
+        store = SensorStore(root)
+        build_series(store, rows, rng)
+        end = rows / SAMPLE_RATE
+        print(f"{'query':<22} {'tier':>5} {'raw rows':>12} {'tier rows':>10} {'reduction':>10} "
+              f"{'raw ms':>9} {'planned ms':>11}")
+        for label, span, resolution in QUERIES:
+            start = 0.0 if span is None else max(end - span, 0.0)
+            # Align to the resolution so the raw and planned answers cover the same buckets
+            start = np.floor(start / resolution) * resolution
+            reference, scanned = raw_query(store, start, end, resolution)
+            result = store.query("Pump", "Pressure", start, end, resolution)
+            assert len(result) == len(reference) and np.allclose(result.mean, reference[:, 2] / reference[:, 1])
+            raw = median_ms(lambda: raw_query(store, start, end, resolution), repeats)
+            planned = median_ms(lambda: store.query("Pump", "Pressure", start, end, resolution), repeats)
+            print(f"{label:<22} {result.tier:>5} {scanned:>12,} {result.scanned_rows:>10,} "
+                  f"{scanned / max(result.scanned_rows, 1):>9,.0f}x {raw:>9.2f} {planned:>11.3f}")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 50_000_000)
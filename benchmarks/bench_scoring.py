@@ -0,0 +1,69 @@
+# Headless batch scoring: a synthetic nightly directory scored by the CLI on 1 and all cores
+#   python -m benchmarks.bench_scoring [machines] [samples_per_channel]
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARTS = ["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"]
+CHANNELS = ["Vibration", "Temperature", "Pressure"]
+SAMPLE_RATE = 1000.0
+
+
+def write_directory(root, machines, samples, rng):
+    start = time.perf_counter()
+    size = 0
+    t = np.arange(samples) / SAMPLE_RATE
+    wear = np.linspace(0, 1, samples) ** 3
+    for m in range(machines):
+        os.makedirs(os.path.join(root, f"machine_{m:03d}"), exist_ok=True)
+        for part in PARTS:
+            lines = ["timestamp,value,channel"]
+            for channel in CHANNELS:
+                if channel == "Vibration":
+                    value = rng.standard_normal(samples) * (1 + 2 * wear)
+                else:
+                    value = 50 + 10 * wear + rng.standard_normal(samples)
+                lines += [f"{a:.3f},{b:.4f},{channel}" for a, b in zip(t, value)]
+            path = os.path.join(root, f"machine_{m:03d}", f"{part}.csv")
+            with open(path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            size += os.path.getsize(path)
+    print(f"wrote {machines * len(PARTS)} files, {machines * len(PARTS) * len(CHANNELS) * samples:,} samples, "
+          f"{size / 1e6:.0f} MB in {time.perf_counter() - start:.1f} s")
+
+
+def main(machines=8, samples=20_000):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as root:
+        data = os.path.join(root, "nightly")
+        write_directory(data, machines, samples, rng)
+
+        # The scoring module must not drag in the UI stack
+        probe = ("import sys, maintenance.scoring; "
+                 "print(sorted({m.split('.')[0] for m in sys.modules} & {'streamlit', 'matplotlib', 'pandas'}))")
+        loaded = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+        print(f"UI modules imported by maintenance.scoring: {loaded.stdout.strip()}")
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            output = os.path.join(root, f"scores_{workers}.npz")
+            start = time.perf_counter()
+            run = subprocess.run([sys.executable, "-m", "maintenance.scoring", data, "--output", output,
+                                  "--workers", str(workers)], cwd=ROOT, capture_output=True, text=True, check=True)
+            elapsed = time.perf_counter() - start
+            print(f"--- {workers} worker(s), {elapsed:.2f} s including interpreter start-up")
+            print(run.stdout.rstrip())
+        scores = np.load(output)
+        vibration = scores["channel"] == "Vibration"
+        print(f"output columns: {', '.join(scores.files)}")
+        print(f"mean predicted RUL {np.nanmean(scores['predicted_rul']):.2f} (simulated-fleet time units), mean vibration health "
+              f"{np.nanmean(scores['health'][vibration]):.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(float(a)) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,35 @@
+# Hyperparameter search: cross-validated grid, random search and Hyperband (random + successive halving)
+#   python -m benchmarks.bench_search [workers]
+import sys
+
+from maintenance.models import fit_with_holdout, simulated_rul_dataset
+from maintenance.training import DEFAULT_SEARCH_SPACE, expand_search_space, run_search, run_training
+
+
+def holdout_rmse(row, X, y):
+    # Both searches' winners refit on the same split, so their scores compare
+    params = {key: value for key, value in row["params"].items() if key != "seed"}
+    return fit_with_holdout(row["model"], X, y, **params)[1]
+
+
+def main(workers=None):
+    X, y = simulated_rul_dataset(seed=0)
+    grid = run_training(X, y, max_workers=workers)
+    random_search = run_search(X, y, max_workers=workers, method="random")
+    search = run_search(X, y, max_workers=workers)
+    print(f"{len(X):,} rows on {search.workers} worker(s)")
+    print(f"{'':<10}{'configs':>8}{'trials':>8}{'wall s':>8}{'trials/min':>12}{'efficiency':>12}{'hold-out RMSE':>15}  best")
+    for label, report, configs in (("grid", grid, len(expand_search_space(DEFAULT_SEARCH_SPACE))),
+                                   ("random", random_search, random_search.candidates),
+                                   ("hyperband", search, search.candidates)):
+        best = report.leaderboard[0]
+        trials_per_minute = 60 * len(report.tasks) / report.wall_seconds
+        print(f"{label:<10}{configs:>8}{len(report.tasks):>8}{report.wall_seconds:>8.1f}{trials_per_minute:>12.0f}"
+              f"{report.parallel_efficiency:>12.0%}{holdout_rmse(best, X, y):>15.2f}  {best['model']}")
+    print(f"hyperband took {search.wall_seconds / random_search.wall_seconds:.0%} of the wall time of fully "
+          f"training the same {search.candidates} candidates")
+    print("best-so-far (s, RMSE): " + ", ".join(f"({t:.1f}, {rmse:.2f})" for t, rmse in search.best_so_far()))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
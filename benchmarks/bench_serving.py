@@ -0,0 +1,56 @@
+# Scoring service: throughput and tail latency of the HTTP server at several micro-batch windows
+#   python -m benchmarks.bench_serving [concurrency] [seconds]
+import asyncio
+import os
+import re
+import subprocess
+import sys
+
+from maintenance.serving import make_load_requests, run_load
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# (label, batch window in ms, max batch); max batch 1 predicts every request on its own
+CONFIGS = (
+    ("unbatched", 0, 1),
+    ("window 0 ms", 0, 256),
+    ("window 1 ms", 1, 256),
+    ("window 2 ms", 2, 256),
+    ("window 5 ms", 5, 256),
+    ("window 10 ms", 10, 256),
+)
+PRELOAD = ("Pump/Vibration", "Bearing/Vibration")
+
+
+def start_server(window_ms, max_batch):
+    command = [sys.executable, "-m", "maintenance.serving", "serve", "--port", "0",
+               "--batch-window-ms", str(window_ms), "--max-batch", str(max_batch)]
+    for key in PRELOAD:
+        command += ["--preload", key]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    match = re.search(r":(\d+) ", line)
+    if not match:
+        process.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return process, int(match.group(1))
+
+
+def main(concurrency=64, seconds=3.0):
+    bodies = make_load_requests()
+    print(f"{concurrency} keep-alive clients, {seconds:g} s per configuration")
+    print(f"{'config':<14} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'mean batch':>11}")
+    for label, window_ms, max_batch in CONFIGS:
+        process, port = start_server(window_ms, max_batch)
+        try:
+            asyncio.run(run_load(port=port, concurrency=concurrency, duration=0.5, bodies=bodies))  # warm-up
+            report = asyncio.run(run_load(port=port, concurrency=concurrency, duration=seconds, bodies=bodies))
+        finally:
+            process.terminate()
+            process.wait()
+        print(f"{label:<14} {report.throughput:>9,.0f} {report.percentile(50) * 1000:>8.2f} "
+              f"{report.percentile(95) * 1000:>8.2f} {report.percentile(99) * 1000:>8.2f} "
+              f"{report.latencies.max() * 1000:>8.2f} {report.server_stats['mean_batch']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64, float(sys.argv[2]) if len(sys.argv) > 2 else 3.0)
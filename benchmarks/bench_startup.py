@@ -0,0 +1,97 @@
+# Cold-start and warm-rerun budget per tab, with an import-time profile of each cold start
+#   python -m benchmarks.bench_startup [--top N]
+# Every tab is opened in a fresh interpreter under `python -X importtime`, so module imports
+# triggered by the first run are attributed to that tab.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+MARKER = "--- app start ---"
+
+# Budgets in milliseconds for the app script itself (the AppTest harness import is excluded)
+BUDGETS = {
+    "Overall Maintenance": {"cold_ms": 600, "warm_ms": 100},
+    "Maintenance Insights": {"cold_ms": 2500, "warm_ms": 150},
+    "RUL Models": {"cold_ms": 3000, "warm_ms": 400},
+    "Train New Models": {"cold_ms": 600, "warm_ms": 100},
+}
+
+
+def child(tab):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    harness_ms = (time.perf_counter() - start) * 1000
+    print(MARKER, file=sys.stderr, flush=True)
+
+    app = AppTest.from_file(APP_PATH, default_timeout=300)
+    app.session_state["active_tab"] = tab
+    start = time.perf_counter()
+    app.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    warm = []
+    for _ in range(5):
+        start = time.perf_counter()
+        app.run()
+        warm.append((time.perf_counter() - start) * 1000)
+    print(json.dumps({"harness_ms": harness_ms, "cold_ms": cold_ms, "warm_ms": sorted(warm)[len(warm) // 2],
+                      "errors": [str(e.value) for e in app.exception]}))
+
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package", recorded after the marker only
+    lines = stderr.split(MARKER, 1)[-1].splitlines()
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.rstrip()[1:], int(self_us), int(cumulative_us)))
+    return modules
+
+
+def run_tab(tab, scratch):
+    env = dict(os.environ, SENSOR_STORE_DIR=os.path.join(scratch, "sensor_store"),
+               MAINTENANCE_JOB_DIR=os.path.join(scratch, "jobs"),
+               MAINTENANCE_MODEL_DIR=os.path.join(scratch, "models"))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "benchmarks.bench_startup", "--child", tab],
+                          cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start and warm-rerun budget per tab")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to list per tab")
+    args = parser.parse_args(argv)
+    if args.child:
+        child(args.child)
+        return 0
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as scratch:
+        for tab, budget in BUDGETS.items():
+            timings, modules = run_tab(tab, scratch)
+            import_ms = sum(self_us for _, self_us, _ in modules) / 1000
+            ok = timings["cold_ms"] <= budget["cold_ms"] and timings["warm_ms"] <= budget["warm_ms"]
+            failures += not ok
+            print(f"{tab}: cold {timings['cold_ms']:.0f} ms (budget {budget['cold_ms']}, {import_ms:.0f} ms importing "
+                  f"{len(modules)} modules), warm {timings['warm_ms']:.1f} ms (budget {budget['warm_ms']}) "
+                  f"{'OK' if ok else 'OVER BUDGET'}")
+            for error in timings["errors"]:
+                print(f"    app error: {error}")
+            top_level = sorted((m for m in modules if not m[0].startswith(" ")), key=lambda m: -m[2])
+            for name, _, cumulative_us in top_level[:args.top]:
+                print(f"    {cumulative_us / 1000:8.1f} ms  {name.strip()}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# Range-scan throughput of the memory-mapped sensor store
+#   python -m benchmarks.bench_store [rows] [store_dir]
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from maintenance.store import SensorStore
+
+APPEND_BATCH = 10_000_000
+
+
+def build_series(store, rows, rng):
+    start = time.perf_counter()
+    written = 0
+    while written < rows:
+        n = min(APPEND_BATCH, rows - written)
+        timestamp = np.arange(written, written + n, dtype=np.float64)
+        store.append("Pump", "Pressure", timestamp, rng.standard_normal(n))
+        written += n
+    elapsed = time.perf_counter() - start
+    print(f"append   {rows:,} rows in {elapsed:.2f} s ({rows / elapsed / 1e6:.1f} M rows/s)")
+
+
+def scan(store, rows, fraction, repeats, rng):
+    span = int(rows * fraction)
+    timings, scanned = [], 0
+    for _ in range(repeats):
+        lo = int(rng.integers(0, rows - span + 1))
+        start = time.perf_counter()
+        timestamp, value = store.read("Pump", "Pressure", lo, lo + span)
+        # Touch the data so the measurement includes paging it in
+        total = float(value.sum())
+        timings.append(time.perf_counter() - start)
+        scanned += len(value)
+    seconds = sum(timings)
+    print(f"scan {fraction:>6.1%}  median {statistics.median(timings) * 1000:9.2f} ms   "
+          f"{scanned / seconds / 1e6:8.1f} M rows/s   {scanned * 8 / seconds / 1e9:6.2f} GB/s  ({total:.1f})")
+
+
+def main(rows=100_000_000, root=None):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory(dir=root) as directory:
+        store = SensorStore(directory)
+        build_series(store, rows, rng)
+        for fraction in (0.0001, 0.01, 0.1, 1.0):
+            scan(store, rows, fraction, 5, rng)
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000_000, sys.argv[2] if len(sys.argv) > 2 else None)
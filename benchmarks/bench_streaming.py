@@ -0,0 +1,37 @@
+# Per-sample cost of the streaming feature path: RollingStats alone and StreamHub feeding a RULRanking
+#   python -m benchmarks.bench_streaming [samples]
+import sys
+import time
+
+import numpy as np
+
+from maintenance.ranking import RULRanking
+from maintenance.streaming import RollingStats, SimulatedFeed, StreamHub
+
+PARTS = ["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"]
+SENSORS = ["Temperature", "Acceleration", "Vibration", "Fluid Speed", "Pressure", "Current"]
+
+
+def main(samples=1_000_000):
+    values = np.random.default_rng(0).standard_normal(samples).tolist()
+    stats = RollingStats()
+    start = time.perf_counter()
+    for i, value in enumerate(values):
+        stats.push(i, value)
+    seconds = time.perf_counter() - start
+    print(f"RollingStats.push            {samples / seconds:12,.0f} samples/s  ({seconds / samples * 1e6:.2f} us each)")
+
+    ranking = RULRanking()
+    hub = StreamHub(PARTS, SENSORS)
+    hub.subscribe(ranking.stream_listener("Machine 1"))
+    feed = SimulatedFeed(hub, seed=0)
+    ticks = max(1, samples // (len(PARTS) * len(SENSORS)))
+    start = time.perf_counter()
+    pushed = sum(feed.tick() for _ in range(ticks))
+    seconds = time.perf_counter() - start
+    print(f"StreamHub + ranking updates  {pushed / seconds:12,.0f} samples/s  ({ticks:,} ticks of {pushed // ticks})")
+    print(f"most critical: {ranking.most_critical()}")
+
+
+if __name__ == "__main__":
+    main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,31 @@
+# Monte Carlo RUL bands for all six parts in one batch, against the tab2 interactivity budget
+#   python -m benchmarks.bench_uncertainty [samples]
+import sys
+import time
+
+import numpy as np
+
+from maintenance.uncertainty import simulated_fleet_distribution
+
+PARTS = ["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"]
+BUDGET_MS = 100
+
+
+def main(samples=2000, repeats=20):
+    simulated_fleet_distribution(PARTS, seed=0, n_samples=samples)  # warm-up
+    timings = []
+    for seed in range(repeats):
+        start = time.perf_counter()
+        dist = simulated_fleet_distribution(PARTS, seed=seed, n_samples=samples)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    p50, p95 = np.percentile(timings, [50, 95])
+    print(f"{len(PARTS)} parts x {samples:,} samples x {len(dist.time)} time steps: "
+          f"p50 {p50:.1f} ms, p95 {p95:.1f} ms (budget {BUDGET_MS} ms) {'OK' if p95 <= BUDGET_MS else 'OVER BUDGET'}")
+    for part, rul in zip(PARTS, dist.rul_percentiles):
+        print(f"  {part:<11} RUL " + "  ".join(f"p{p}={value:6.1f}" for p, value in zip(dist.percentiles, rul)))
+    return 0 if p95 <= BUDGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(float(sys.argv[1])) if len(sys.argv) > 1 else 2000))
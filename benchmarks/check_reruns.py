@@ -0,0 +1,58 @@
+# Show which chart functions each interaction executes, using the instrumentation counters
+#   python -m benchmarks.check_reruns
+# AppTest always replays the whole script, so this checks what a full run of the open tab
+# touches; in the browser, widget changes inside a fragment rerun only that fragment
+# (open the app with ?debug=1 to watch the per-session run counts).
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+
+_scratch = tempfile.mkdtemp(prefix="check_reruns_")
+atexit.register(shutil.rmtree, _scratch, ignore_errors=True)
+os.environ.setdefault("SENSOR_STORE_DIR", os.path.join(_scratch, "sensor_store"))
+os.environ.setdefault("MAINTENANCE_JOB_DIR", os.path.join(_scratch, "jobs"))
+os.environ.setdefault("MAINTENANCE_MODEL_DIR", os.path.join(_scratch, "models"))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from maintenance.instrumentation import calls  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+INSIGHTS_CALLS = ("build_insights_figure", "generate_maintenance_insights", "cached_maintenance_insights")
+
+
+def delta(before, after):
+    return {name: after.get(name, 0) - before.get(name, 0) for name in after if after.get(name, 0) != before.get(name, 0)}
+
+
+def main():
+    app = AppTest.from_file(APP_PATH, default_timeout=300)
+    app.session_state["active_tab"] = "Maintenance Insights"
+    app.run()
+    app.session_state["active_tab"] = "RUL Models"
+    app.run()
+
+    failures = 0
+    interactions = [
+        ("tab3 model -> Random Forest", lambda: app.radio(key="model_selection").set_value("Random Forest").run()),
+        ("tab3 model -> Neural Network", lambda: app.radio(key="model_selection").set_value("Neural Network").run()),
+        ("tab3 sensor -> Vibration", lambda: app.selectbox(key="dropdown_sensor").set_value("Vibration").run()),
+    ]
+    for name, interact in interactions:
+        before = calls.snapshot()
+        # AppTest resends the tab widget's last rendered value, so keep the RUL tab selected explicitly
+        app.session_state["active_tab"] = "RUL Models"
+        interact()
+        changed = delta(before, calls.snapshot())
+        touched_insights = any(key in changed for key in INSIGHTS_CALLS)
+        failures += touched_insights
+        print(f"{name:<32} {'FAIL' if touched_insights else 'ok  '} calls: {changed or '{}'}")
+    print(f"run counts: {app.session_state['run_counts']}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Reusable maintenance logic shared by the Streamlit app and offline tooling
@@ -0,0 +1,334 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_CATALOG_PATH = os.environ.get(
+    "MAINTENANCE_CATALOG", os.path.join(os.environ.get("SENSOR_STORE_DIR", "sensor_store"), "catalog.db"))
+DEFAULT_POOL_SIZE = int(os.environ.get("MAINTENANCE_CATALOG_POOL", "4"))
+
+# Seed data for a new catalog; afterwards the tables are the source of truth
+PART_TYPES = ["Pump", "Bearing", "Belts", "Motor", "Compressor", "Valve"]
+SENSOR_TYPES = ["Temperature", "Acceleration", "Vibration", "Fluid Speed", "Pressure", "Current"]
+EXPLANATIONS = {
+    "Pump": "The pump's health indicator reflects gradual wear initially, followed by accelerated degradation. Regular inspection is critical to ensure optimal performance and prevent failures. The data highlights that pumps often experience a sharp decline in health due to cavitation or seal failures. Additionally, the trends suggest monitoring pressure and flow rate for early detection of issues.",
+    "Bearing": "The bearing shows a steady decay in health with increasing vibration toward the end, signaling the need for lubrication or replacement. Data analysis suggests that overheating or misalignment could contribute to this behavior. Proper alignment and regular inspections can prevent catastrophic failures.",
+    "Belts": "The belts experience minimal wear at the start but degrade rapidly after extended use, likely due to tension or misalignment. Observations indicate that improper tensioning exacerbates this rapid deterioration. Ensuring correct tension and periodic checks can extend their lifespan.",
+    "Motor": "The motor's health trend indicates stable operation initially, with a rapid decline due to overheating or electrical faults. Data trends suggest that monitoring temperature and current can help preempt motor failures. Timely maintenance can mitigate risks and prevent unplanned downtime.",
+    "Compressor": "The compressor demonstrates a slow decline early on, followed by a sharp drop, highlighting potential issues with pressure or seals. The data suggests that regular maintenance of seals and valves can prolong the compressor's lifespan. Additionally, monitoring for abnormal noise and vibrations is recommended.",
+    "Valve": "The valve maintains health initially but deteriorates quickly later, often due to corrosion or mechanical fatigue. The figures show that monitoring fluid pressure and flow rate can provide early failure detection. Regular cleaning and inspection can help avoid operational disruptions."
+}
+NO_EXPLANATION = "No explanation available for this part."
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS part_types (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    explanation TEXT
+);
+CREATE TABLE IF NOT EXISTS sensor_types (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS machines (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parts (
+    id INTEGER PRIMARY KEY,
+    machine_id INTEGER NOT NULL REFERENCES machines (id),
+    part_type TEXT NOT NULL REFERENCES part_types (name),
+    installed_at REAL NOT NULL,
+    removed_at REAL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS parts_installed ON parts (machine_id, part_type) WHERE removed_at IS NULL;
+CREATE INDEX IF NOT EXISTS parts_type ON parts (part_type, machine_id);
+CREATE TABLE IF NOT EXISTS channels (
+    id INTEGER PRIMARY KEY,
+    part_id INTEGER NOT NULL REFERENCES parts (id),
+    sensor_type TEXT NOT NULL,
+    UNIQUE (part_id, sensor_type)
+);
+CREATE INDEX IF NOT EXISTS channels_sensor ON channels (sensor_type, part_id);
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY,
+    part_id INTEGER NOT NULL REFERENCES parts (id),
+    file_name TEXT,
+    file_id TEXT,
+    rows INTEGER NOT NULL,
+    bytes INTEGER,
+    uploaded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS uploads_part_time ON uploads (part_id, uploaded_at);
+CREATE INDEX IF NOT EXISTS uploads_time ON uploads (uploaded_at);
+-- Part and sensor type are copied from the (immutable) channel so type/time lookups need one index
+CREATE TABLE IF NOT EXISTS upload_channels (
+    channel_id INTEGER NOT NULL REFERENCES channels (id),
+    upload_id INTEGER NOT NULL REFERENCES uploads (id),
+    part_type TEXT NOT NULL,
+    sensor_type TEXT NOT NULL,
+    uploaded_at REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    PRIMARY KEY (channel_id, uploaded_at, upload_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS upload_channels_type_time ON upload_channels (sensor_type, part_type, uploaded_at);
+CREATE TABLE IF NOT EXISTS model_versions (
+    id INTEGER PRIMARY KEY,
+    part_id INTEGER NOT NULL REFERENCES parts (id),
+    sensor_type TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    params TEXT,
+    metrics TEXT,
+    training_rows INTEGER,
+    source TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (part_id, sensor_type, model_name, version)
+);
+"""
+
+# Active part instance of a type on a machine, as (machine name, part type) -> parts.id
+_ACTIVE_PART = """
+SELECT parts.id FROM parts JOIN machines ON machines.id = parts.machine_id
+WHERE machines.name = ? AND parts.part_type = ? AND parts.removed_at IS NULL
+"""
+
+
+def _connect(db_path):
+    # Pooled connections move between Streamlit's script threads, one thread at a time
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections shared by every session of the server process.
+
+    Connections are opened lazily up to `size`; further callers wait for one to be returned.
+    WAL mode lets pooled readers proceed while a writer commits.
+    """
+
+    def __init__(self, db_path, size=DEFAULT_POOL_SIZE, timeout=30):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return _connect(self.db_path)
+        return self._idle.get(timeout=self.timeout)
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent writers queue instead of deadlocking
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            while not self._idle.empty():
+                self._idle.get_nowait().close()
+                self._opened -= 1
+
+
+class Catalog:
+    """SQLite catalog of machines, part instances, sensor channels, uploads and model versions.
+
+    Part and sensor types are rows rather than code constants, and each installed part is an
+    instance with its own channels, so a replaced part starts a fresh history. Lookups such
+    as "Bearings with Vibration uploads in the last 24 h" are answered from indexes.
+    """
+
+    def __init__(self, db_path=DEFAULT_CATALOG_PATH, pool_size=DEFAULT_POOL_SIZE):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def seed(self, part_types=PART_TYPES, sensor_types=SENSOR_TYPES, explanations=EXPLANATIONS, machines=()):
+        """Insert default types (and machines with one instance of every part type) if missing."""
+        with self.pool.transaction() as conn:
+            conn.executemany("INSERT OR IGNORE INTO part_types (name, position, explanation) VALUES (?, ?, ?)",
+                             [(name, i, explanations.get(name)) for i, name in enumerate(part_types)])
+            conn.executemany("INSERT OR IGNORE INTO sensor_types (name, position) VALUES (?, ?)",
+                             [(name, i) for i, name in enumerate(sensor_types)])
+            for machine in machines:
+                self._add_machine(conn, machine)
+        return self
+
+    def part_types(self):
+        with self.pool.connection() as conn:
+            return [row["name"] for row in conn.execute("SELECT name FROM part_types ORDER BY position")]
+
+    def sensor_types(self):
+        with self.pool.connection() as conn:
+            return [row["name"] for row in conn.execute("SELECT name FROM sensor_types ORDER BY position")]
+
+    def explanation(self, part_type):
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT explanation FROM part_types WHERE name = ?", (part_type,)).fetchone()
+        return row["explanation"] if row and row["explanation"] else NO_EXPLANATION
+
+    def _add_machine(self, conn, name):
+        now = time.time()
+        conn.execute("INSERT OR IGNORE INTO machines (name, created_at) VALUES (?, ?)", (name, now))
+        machine_id = conn.execute("SELECT id FROM machines WHERE name = ?", (name,)).fetchone()["id"]
+        # Every part type starts with one installed instance
+        conn.execute("INSERT OR IGNORE INTO parts (machine_id, part_type, installed_at) "
+                     "SELECT ?, name, ? FROM part_types ORDER BY position", (machine_id, now))
+        return machine_id
+
+    def add_machine(self, name):
+        with self.pool.transaction() as conn:
+            return self._add_machine(conn, name)
+
+    def machines(self):
+        with self.pool.connection() as conn:
+            return [row["name"] for row in conn.execute("SELECT name FROM machines ORDER BY id")]
+
+    def _part_id(self, conn, machine, part_type):
+        row = conn.execute(_ACTIVE_PART, (machine, part_type)).fetchone()
+        if row is None:
+            raise KeyError(f"No installed {part_type} on {machine}")
+        return row["id"]
+
+    def parts(self, machine=None, part_type=None, include_removed=False):
+        """Part instances as dicts, optionally filtered by machine name and part type."""
+        query = ("SELECT parts.id, machines.name AS machine, parts.part_type, parts.installed_at, parts.removed_at "
+                 "FROM parts JOIN machines ON machines.id = parts.machine_id WHERE 1")
+        params = []
+        if machine is not None:
+            query += " AND machines.name = ?"
+            params.append(machine)
+        if part_type is not None:
+            query += " AND parts.part_type = ?"
+            params.append(part_type)
+        if not include_removed:
+            query += " AND parts.removed_at IS NULL"
+        with self.pool.connection() as conn:
+            return [dict(row) for row in conn.execute(query + " ORDER BY parts.id", params)]
+
+    def replace_part(self, machine, part_type):
+        # Retire the installed instance and install a new one; returns the new part id
+        with self.pool.transaction() as conn:
+            now = time.time()
+            old = self._part_id(conn, machine, part_type)
+            conn.execute("UPDATE parts SET removed_at = ? WHERE id = ?", (now, old))
+            return conn.execute("INSERT INTO parts (machine_id, part_type, installed_at) "
+                                "SELECT machine_id, part_type, ? FROM parts WHERE id = ?", (now, old)).lastrowid
+
+    def _channel_id(self, conn, part_id, sensor_type):
+        conn.execute("INSERT OR IGNORE INTO channels (part_id, sensor_type) VALUES (?, ?)", (part_id, sensor_type))
+        return conn.execute("SELECT id FROM channels WHERE part_id = ? AND sensor_type = ?",
+                            (part_id, sensor_type)).fetchone()["id"]
+
+    def record_upload(self, machine, part_type, channel_rows, file_name=None, file_id=None, size=None, uploaded_at=None):
+        """Record an upload of {sensor type: rows} for the installed part; returns the upload id."""
+        uploaded_at = time.time() if uploaded_at is None else uploaded_at
+        with self.pool.transaction() as conn:
+            part_id = self._part_id(conn, machine, part_type)
+            upload_id = conn.execute(
+                "INSERT INTO uploads (part_id, file_name, file_id, rows, bytes, uploaded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (part_id, file_name, file_id, sum(channel_rows.values()), size, uploaded_at)).lastrowid
+            conn.executemany(
+                "INSERT INTO upload_channels (channel_id, upload_id, part_type, sensor_type, uploaded_at, rows) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(self._channel_id(conn, part_id, sensor), upload_id, part_type, sensor, uploaded_at, rows)
+                 for sensor, rows in channel_rows.items()])
+        return upload_id
+
+    def uploads(self, part_type=None, sensor_type=None, since=None, machine=None, limit=100):
+        """Most recent uploads, optionally filtered by part type, sensor type, start time and machine.
+
+        Sensor lookups walk the (sensor type, part type, time) index of upload_channels, so the
+        cost follows the number of matching uploads rather than the size of the catalog.
+        """
+        query = ["SELECT uploads.id, machines.name AS machine, parts.part_type, uploads.file_name, "
+                 "uploads.rows, uploads.bytes, uploads.uploaded_at FROM"]
+        conditions, params = [], []
+        if sensor_type is not None:
+            query.append("upload_channels JOIN uploads ON uploads.id = upload_channels.upload_id")
+            table = "upload_channels"
+            conditions.append("upload_channels.sensor_type = ?")
+            params.append(sensor_type)
+        else:
+            query.append("uploads")
+            table = "uploads"
+        query.append("JOIN parts ON parts.id = uploads.part_id JOIN machines ON machines.id = parts.machine_id")
+        for clause, value in ((f"{table}.uploaded_at >= ?", since), ("parts.part_type = ?", part_type),
+                              ("machines.name = ?", machine)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+        if sensor_type is not None and part_type is not None:
+            conditions.append("upload_channels.part_type = ?")
+            params.append(part_type)
+        if conditions:
+            query.append("WHERE " + " AND ".join(conditions))
+        query.append("ORDER BY uploads.uploaded_at DESC LIMIT ?")
+        with self.pool.connection() as conn:
+            return [dict(row) for row in conn.execute(" ".join(query), (*params, limit))]
+
+    def record_model_version(self, machine, part_type, sensor_type, model_name, params=None, metrics=None,
+                             training_rows=None, source=None):
+        """Register a fitted model for the installed part; returns its version number (1, 2, ...)."""
+        with self.pool.transaction() as conn:
+            part_id = self._part_id(conn, machine, part_type)
+            version = conn.execute(
+                "SELECT COALESCE(MAX(version), 0) + 1 FROM model_versions "
+                "WHERE part_id = ? AND sensor_type = ? AND model_name = ?",
+                (part_id, sensor_type, model_name)).fetchone()[0]
+            conn.execute(
+                "INSERT INTO model_versions (part_id, sensor_type, model_name, version, params, metrics, "
+                "training_rows, source, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (part_id, sensor_type, model_name, version, json.dumps(params or {}), json.dumps(metrics or {}),
+                 training_rows, source, time.time()))
+        return version
+
+    def model_versions(self, machine, part_type, sensor_type=None, model_name=None, since=None, limit=20):
+        """Model versions of the installed part (fitted at or after `since`), newest first, with params
+        and metrics decoded."""
+        query = ("SELECT model_versions.* FROM model_versions WHERE part_id = (" + _ACTIVE_PART.strip() + ")")
+        params = [machine, part_type]
+        for clause, value in (("sensor_type = ?", sensor_type), ("model_name = ?", model_name),
+                              ("created_at >= ?", since)):
+            if value is not None:
+                query += f" AND {clause}"
+                params.append(value)
+        query += " ORDER BY created_at DESC, version DESC LIMIT ?"
+        with self.pool.connection() as conn:
+            rows = [dict(row) for row in conn.execute(query, (*params, limit))]
+        for row in rows:
+            row["params"], row["metrics"] = json.loads(row["params"]), json.loads(row["metrics"])
+        return rows
@@ -0,0 +1,130 @@
+import numpy as np
+
+DEFAULT_POINTS = 2000  # roughly two points per pixel column of a full-width chart
+PYRAMID_BASE = 64  # raw samples per level-0 bucket
+PYRAMID_FACTOR = 4  # buckets merged into one at each coarser level
+BUCKET_COLUMNS = 4  # t_min, v_min, t_max, v_max
+
+
+def _segment_argext(values, starts, ufunc):
+    # Index of the first minimum/maximum (ufunc = np.minimum/np.maximum) in each contiguous segment
+    extreme = ufunc.reduceat(values, starts)
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(values))))
+    hits = np.flatnonzero(values == extreme[segment])
+    owner = segment[hits]
+    first = np.ones(len(hits), dtype=bool)
+    first[1:] = owner[1:] != owner[:-1]
+    return hits[first]
+
+
+def bucket_points(buckets):
+    """Interleave (n, 4) min/max buckets into 2n (time, value) points in time order."""
+    buckets = np.asarray(buckets, dtype=np.float64).reshape(-1, BUCKET_COLUMNS)
+    min_first = buckets[:, 0] <= buckets[:, 2]
+    times = np.where(min_first[:, None], buckets[:, [0, 2]], buckets[:, [2, 0]]).ravel()
+    values = np.where(min_first[:, None], buckets[:, [1, 3]], buckets[:, [3, 1]]).ravel()
+    return times, values
+
+
+def minmax_buckets(timestamp, value, n_buckets):
+    # (n_buckets, 4) min/max summary of near-equal-count contiguous buckets
+    starts = np.unique(np.linspace(0, len(value), n_buckets, endpoint=False).astype(np.int64))
+    lo = _segment_argext(value, starts, np.minimum)
+    hi = _segment_argext(value, starts, np.maximum)
+    return np.column_stack([timestamp[lo], value[lo], timestamp[hi], value[hi]])
+
+
+def minmax_decimate(timestamp, value, n_out=DEFAULT_POINTS):
+    """Keep the minimum and maximum of each of n_out / 2 buckets, so every peak survives."""
+    timestamp = np.asarray(timestamp, dtype=np.float64)
+    value = np.asarray(value, dtype=np.float64)
+    if len(value) <= n_out:
+        return timestamp, value
+    return bucket_points(minmax_buckets(timestamp, value, max(n_out // 2, 1)))
+
+
+def lttb(timestamp, value, n_out=DEFAULT_POINTS):
+    """Largest-triangle-three-buckets downsampling, vectorized over all buckets.
+
+    Classic LTTB anchors each bucket's triangle on the point picked in the previous bucket,
+    which forces a sequential loop. Here the previous anchor is that bucket's mean (as the
+    next anchor already is), so every bucket is scored in one pass; the first and last
+    points are always kept.
+    """
+    timestamp = np.asarray(timestamp, dtype=np.float64)
+    value = np.asarray(value, dtype=np.float64)
+    n = len(value)
+    if n_out >= n or n_out < 3:
+        return timestamp, value
+
+    t = timestamp - timestamp[0]  # relative time keeps the area products well conditioned
+    edges = np.unique(np.linspace(1, n - 1, n_out - 1).astype(np.int64))
+    n_buckets = len(edges) - 1
+    starts = edges[:-1]
+    sizes = np.diff(edges)
+    t_sum = np.concatenate([[0.0], np.cumsum(t)])
+    v_sum = np.concatenate([[0.0], np.cumsum(value)])
+    mean_t = (t_sum[edges[1:]] - t_sum[starts]) / sizes
+    mean_v = (v_sum[edges[1:]] - v_sum[starts]) / sizes
+
+    # Anchors either side of every bucket: neighbouring bucket means, or the fixed end points
+    prev_t, prev_v = np.r_[t[0], mean_t[:-1]], np.r_[value[0], mean_v[:-1]]
+    next_t, next_v = np.r_[mean_t[1:], t[-1]], np.r_[mean_v[1:], value[-1]]
+    owner = np.repeat(np.arange(n_buckets), sizes)
+    inner_t, inner_v = t[1:n - 1], value[1:n - 1]
+    area = np.abs((prev_t[owner] - next_t[owner]) * (inner_v - prev_v[owner])
+                  - (prev_t[owner] - inner_t) * (next_v[owner] - prev_v[owner]))
+    picked = _segment_argext(area, starts - 1, np.maximum) + 1
+
+    keep = np.r_[0, picked, n - 1]
+    return timestamp[keep], value[keep]
+
+
+def decimate(timestamp, value, n_out=DEFAULT_POINTS, method="minmax"):
+    """Reduce a series to about n_out points for plotting.
+
+    "minmax" keeps every bucket's extremes; "lttb" keeps the visually dominant point per
+    bucket, after a min/max preselection down to 4 * n_out points on very long inputs.
+    """
+    if method == "minmax":
+        return minmax_decimate(timestamp, value, n_out)
+    if method == "lttb":
+        if len(value) > 4 * n_out:
+            timestamp, value = minmax_decimate(timestamp, value, 4 * n_out)
+        return lttb(timestamp, value, n_out)
+    raise ValueError(f"Unknown decimation method {method!r}; expected 'minmax' or 'lttb'")
+
+
+def base_buckets(timestamp, value):
+    # Level-0 pyramid buckets for every complete run of PYRAMID_BASE samples
+    complete = len(value) // PYRAMID_BASE * PYRAMID_BASE
+    t = np.asarray(timestamp[:complete], dtype=np.float64).reshape(-1, PYRAMID_BASE)
+    v = np.asarray(value[:complete], dtype=np.float64).reshape(-1, PYRAMID_BASE)
+    return merge_bucket_rows(t, v, t, v)
+
+
+def merge_buckets(buckets):
+    # Next pyramid level: every PYRAMID_FACTOR complete buckets collapse into one
+    complete = len(buckets) // PYRAMID_FACTOR * PYRAMID_FACTOR
+    grouped = np.asarray(buckets[:complete]).reshape(-1, PYRAMID_FACTOR, BUCKET_COLUMNS)
+    return merge_bucket_rows(grouped[..., 0], grouped[..., 1], grouped[..., 2], grouped[..., 3])
+
+
+def merge_bucket_rows(t_min, v_min, t_max, v_max):
+    rows = np.arange(len(v_min))
+    lo = np.argmin(v_min, axis=1)
+    hi = np.argmax(v_max, axis=1)
+    return np.column_stack([t_min[rows, lo], v_min[rows, lo], t_max[rows, hi], v_max[rows, hi]])
+
+
+def pyramid_bucket_size(level):
+    return PYRAMID_BASE * PYRAMID_FACTOR ** level
+
+
+def choose_level(rows, n_out, levels):
+    """Coarsest pyramid level that still leaves at least n_out / 2 buckets over `rows` samples."""
+    target = max(n_out // 2, 1)
+    level = -1
+    while level + 1 < levels and rows // pyramid_bucket_size(level + 1) >= target:
+        level += 1
+    return level  # -1 means the raw samples are already small enough
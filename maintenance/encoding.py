@@ -0,0 +1,244 @@
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+BLOCK_SIZE = 1024  # values sharing one bit width
+MAX_DECIMALS = 6  # decimal places tried when looking for an exact integer representation
+MAGIC = b"PMTS"
+VERSION = 1
+
+# Column codecs
+XOR = 0  # bit patterns XORed with the previous value (Gorilla style), always lossless
+INTEGER = 1  # value * scale as integers, differenced `order` times
+
+_HEADER = struct.Struct("<4sBQI")  # magic, version, rows, block size
+_COLUMN = struct.Struct("<BBdQ")  # codec, order, scale, payload words
+_MASKS = np.array([0] + [(1 << w) - 1 for w in range(1, 65)], dtype=np.uint64)
+_ONE = np.uint64(1)
+
+
+@dataclass
+class EncodedColumn:
+    codec: int
+    order: int  # leading values held in `anchors` instead of the bit stream
+    scale: float  # INTEGER: value = integer / scale
+    anchors: np.ndarray  # (order,) uint64
+    widths: np.ndarray  # (blocks,) uint8 bits per value
+    shifts: np.ndarray  # (blocks,) uint8 trailing zero bits dropped from every value
+    payload: np.ndarray  # uint64 words of packed values
+
+    @property
+    def nbytes(self):
+        return _COLUMN.size + self.anchors.nbytes + self.widths.nbytes + self.shifts.nbytes + self.payload.nbytes
+
+
+def _bit_length(x):
+    # Vectorized int.bit_length() for uint64 arrays, by binary search over the shift amount
+    x = np.asarray(x, dtype=np.uint64)
+    length = np.zeros(x.shape, dtype=np.int64)
+    for step in (32, 16, 8, 4, 2, 1):
+        high = x >> np.uint64(step)
+        big = high > 0
+        length += big * step
+        x = np.where(big, high, x)
+    return length + (x > 0)
+
+
+def _trailing_zeros(x):
+    x = np.asarray(x, dtype=np.uint64)
+    lowest = x & (~x + _ONE)
+    return np.maximum(_bit_length(lowest) - 1, 0)
+
+
+def _word_starts(widths, block_size):
+    # First payload word of every block: a block of width w packs block_size values into block_size * w / 64 words
+    return np.concatenate([[0], np.cumsum(widths.astype(np.int64) * (block_size // 64))])
+
+
+def _lanes(width):
+    # For the 64 values packed into `width` words: (value slot, word, bit offset, spills into the next word)
+    for slot in range(64):
+        word, bit = divmod(slot * width, 64)
+        yield slot, word, bit, bit + width > 64
+
+
+def pack_bits(words, block_size=BLOCK_SIZE):
+    """Bit-pack uint64 words in blocks, each at the narrowest width that holds its values.
+
+    Trailing zero bits common to a whole block are dropped as well, which is what makes XORed
+    floats compress: successive readings usually differ only in a few mantissa bits. Every
+    64 values of width w fill exactly w words, so blocks of equal width are packed together
+    with one strided operation per value slot. Returns (widths, shifts, payload).
+    """
+    if block_size % 64:
+        raise ValueError("block_size must be a multiple of 64")
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    n = len(words)
+    blocks = -(-n // block_size)
+    padded = np.zeros((blocks, block_size), dtype=np.uint64)
+    padded.ravel()[:n] = words
+    merged = np.bitwise_or.reduce(padded, axis=1)
+    shifts = _trailing_zeros(merged)
+    padded >>= shifts.astype(np.uint64)[:, None]
+    widths = _bit_length(merged >> shifts.astype(np.uint64))
+
+    starts = _word_starts(widths, block_size)
+    payload = np.zeros(starts[-1], dtype=np.uint64)
+    for width in np.unique(widths[widths > 0]).tolist():
+        members = np.flatnonzero(widths == width)
+        values = padded[members].reshape(-1, 64).T.copy()
+        packed = np.zeros((width, values.shape[1]), dtype=np.uint64)
+        for slot, word, bit, spills in _lanes(width):
+            packed[word] |= values[slot] << np.uint64(bit)
+            if spills:
+                packed[word + 1] |= values[slot] >> np.uint64(64 - bit)
+        span = np.arange(block_size // 64 * width)
+        payload[starts[members, None] + span] = packed.T.reshape(len(members), -1)
+    return widths.astype(np.uint8), shifts.astype(np.uint8), payload
+
+
+def unpack_bits(widths, shifts, payload, n, block_size=BLOCK_SIZE):
+    """Inverse of pack_bits, again one strided operation per value slot and width."""
+    blocks = len(widths)
+    out = np.zeros((blocks, block_size), dtype=np.uint64)
+    starts = _word_starts(widths, block_size)
+    for width in np.unique(widths[widths > 0]).tolist():
+        members = np.flatnonzero(widths == width)
+        span = np.arange(block_size // 64 * width)
+        # Word-major / slot-major copies keep every per-slot operation on contiguous memory
+        packed = payload[starts[members, None] + span].reshape(-1, width).T.copy()
+        values = np.empty((64, packed.shape[1]), dtype=np.uint64)
+        mask = _MASKS[width]
+        for slot, word, bit, spills in _lanes(width):
+            lane = packed[word] >> np.uint64(bit)
+            if spills:
+                lane |= packed[word + 1] << np.uint64(64 - bit)
+            np.bitwise_and(lane, mask, out=values[slot])
+        out[members] = values.T.reshape(len(members), block_size)
+    out <<= shifts.astype(np.uint64)[:, None]
+    return out.ravel()[:n]
+
+
+def _zigzag(x):
+    x = x.astype(np.int64)
+    return ((x << 1) ^ (x >> 63)).view(np.uint64)
+
+
+def _unzigzag(u):
+    sign = u & _ONE
+    np.negative(sign, out=sign)
+    u >>= _ONE
+    u ^= sign
+    return u.view(np.int64)
+
+
+def integer_scale(values, max_decimals=MAX_DECIMALS):
+    """Smallest 10 ** d (d <= max_decimals) with values == round(values * 10 ** d) / 10 ** d exactly.
+
+    Readings parsed from CSV text usually have a fixed number of decimals; storing them as
+    integers is lossless and differences of neighbouring readings need only a few bits.
+    Returns None when no such scale exists (e.g. full-precision floats).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values) or not np.isfinite(values).all():
+        return None
+    for decimals in range(max_decimals + 1):
+        scale = 10.0 ** decimals
+        scaled = np.round(values * scale)
+        if np.abs(scaled).max() >= 2 ** 53:
+            return None
+        if np.array_equal(scaled / scale, values):
+            return scale
+    return None
+
+
+def encode_column(values, order=1, scale=None, block_size=BLOCK_SIZE):
+    """Encode one float64 column.
+
+    With a `scale`, values are rounded to integers of value * scale (lossy unless the scale is
+    exact, see integer_scale), differenced `order` times (2 = delta-of-delta, for timestamps)
+    and zigzag coded; otherwise the float bit patterns are XORed with their predecessor.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if scale is None:
+        codec, order = XOR, min(order, 1)
+        bits = values.view(np.uint64)
+        residual = bits.copy()
+        residual[1:] ^= bits[:-1]
+    else:
+        codec = INTEGER
+        residual = np.round(values * scale).astype(np.int64)
+        for _ in range(order):
+            residual = np.diff(residual, prepend=np.int64(0))
+        residual = _zigzag(residual)
+    order = min(order, len(values))
+    anchors = residual[:order].copy()
+    residual[:order] = 0
+    widths, shifts, payload = pack_bits(residual, block_size)
+    return EncodedColumn(codec, order, float(scale or 0.0), anchors, widths, shifts, payload)
+
+
+def decode_column(column, n, block_size=BLOCK_SIZE):
+    residual = unpack_bits(column.widths, column.shifts, column.payload, n, block_size)
+    residual[:column.order] = column.anchors
+    if column.codec == XOR:
+        return np.bitwise_xor.accumulate(residual).view(np.float64)
+    integers = _unzigzag(residual)
+    for _ in range(column.order):
+        integers = np.cumsum(integers)
+    return integers / column.scale
+
+
+def encode_series(timestamp, value, precision=None, block_size=BLOCK_SIZE):
+    """Serialize a (timestamp, value) series to compact bytes.
+
+    Timestamps are delta-of-delta coded when they have at most MAX_DECIMALS decimals, values
+    are delta coded when they do; anything else falls back to the lossless XOR codec. A
+    `precision` quantizes values to multiples of it instead (error at most precision / 2).
+    """
+    timestamp = np.ascontiguousarray(timestamp, dtype=np.float64)
+    value = np.ascontiguousarray(value, dtype=np.float64)
+    if timestamp.shape != value.shape or timestamp.ndim != 1:
+        raise ValueError("timestamp and value must be 1-D arrays of equal length")
+    value_scale = 1.0 / precision if precision else integer_scale(value)
+    columns = (encode_column(timestamp, 2, integer_scale(timestamp), block_size),
+               encode_column(value, 1, value_scale, block_size))
+    parts = [_HEADER.pack(MAGIC, VERSION, len(timestamp), block_size)]
+    for column in columns:
+        parts.append(_COLUMN.pack(column.codec, column.order, column.scale, len(column.payload)))
+        parts += [column.anchors.tobytes(), column.widths.tobytes(), column.shifts.tobytes(), column.payload.tobytes()]
+    return b"".join(parts)
+
+
+def decode_series(buffer):
+    """Inverse of encode_series: returns (timestamp, value) float64 arrays."""
+    buffer = memoryview(buffer)
+    magic, version, rows, block_size = _HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not an encoded sensor series (bad magic or version)")
+    blocks = -(-rows // block_size)
+    position = _HEADER.size
+    decoded = []
+    for _ in range(2):
+        codec, order, scale, words = _COLUMN.unpack_from(buffer, position)
+        position += _COLUMN.size
+        arrays = []
+        for dtype, count in ((np.uint64, order), (np.uint8, blocks), (np.uint8, blocks), (np.uint64, words)):
+            arrays.append(np.frombuffer(buffer, dtype=dtype, count=count, offset=position))
+            position += count * np.dtype(dtype).itemsize
+        decoded.append(decode_column(EncodedColumn(codec, order, scale, *arrays), rows, block_size))
+    return decoded[0], decoded[1]
+
+
+def write_series(path, timestamp, value, precision=None, block_size=BLOCK_SIZE):
+    # Returns the number of bytes written
+    data = encode_series(timestamp, value, precision, block_size)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def read_series(path):
+    with open(path, "rb") as f:
+        return decode_series(f.read())
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+DEFAULT_ALPHA = 0.2  # accuracy cone, as a fraction of true RUL (alpha-lambda) or of total life (horizon)
+DEFAULT_LAMBDA = 0.5  # alpha-lambda checks the prediction halfway from the first prediction to failure
+DEFAULT_HORIZON_FRACTION = 0.2  # "fails within N" with N as this fraction of the median run life
+# Asymmetric NASA/PHM08 penalties: late predictions (RUL overestimated) cost more than early ones
+NASA_EARLY, NASA_LATE = 13.0, 10.0
+
+
+@dataclass
+class RULEvaluation:
+    samples: int
+    runs: int  # run-to-failure trajectories in the evaluated data
+    rmse: float
+    mae: float
+    nasa_score: float  # mean per sample, so datasets of different sizes compare
+    prognostic_horizon: float  # mean over runs, in time units before failure
+    horizon_fraction: float  # prognostic_horizon as a fraction of the RUL at each run's first prediction
+    alpha_lambda: float  # fraction of runs inside the alpha cone at lambda
+    alpha: float
+    horizon: float  # N of the "fails within N" classification
+    accuracy: float
+    precision: float
+    recall: float
+    f1: float
+
+    def scores(self):
+        # The 0..1 metrics, labelled for the tab3 bar chart
+        return {"α-λ accuracy": self.alpha_lambda, "Prognostic horizon": self.horizon_fraction,
+                "Accuracy": self.accuracy, "Precision": self.precision, "Recall": self.recall, "F1": self.f1}
+
+
+def run_starts(y_true, end_of_life=None):
+    """Index of the first sample of every run-to-failure trajectory.
+
+    Samples are in time order within a run; a new run begins where the true RUL jumps up or,
+    when given, where the end-of-life time changes.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    new_run = np.diff(y_true) > 0
+    if end_of_life is not None:
+        end_of_life = np.asarray(end_of_life, dtype=np.float64)
+        new_run |= ~np.isclose(end_of_life[1:], end_of_life[:-1])
+    return np.flatnonzero(np.r_[True, new_run])
+
+
+def nasa_score(error):
+    # Per-sample PHM08 score of prediction - truth
+    error = np.asarray(error, dtype=np.float64)
+    return np.expm1(error * np.where(error < 0, -1 / NASA_EARLY, 1 / NASA_LATE))
+
+
+def _safe_ratio(num, den):
+    return float(num / den) if den else 0.0
+
+
+def evaluate(y_true, y_pred, end_of_life=None, alpha=DEFAULT_ALPHA, lam=DEFAULT_LAMBDA, horizon=None):
+    """Score RUL predictions against the truth in one vectorized pass.
+
+    `end_of_life` is each sample's failure time measured from the start of its run (elapsed
+    time + true RUL); without it the largest true RUL in a run stands in for its total life.
+    `horizon` is the N of the "fails within N" classification (default: a fraction of the
+    median run life). Prognostic horizon follows Saxena et al.: how long before failure the
+    predictions enter, and then stay within, true RUL +- alpha * total life.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    if y_true.shape != y_pred.shape or y_true.ndim != 1 or not len(y_true):
+        raise ValueError("y_true and y_pred must be non-empty 1-D arrays of equal length")
+    error = y_pred - y_true
+    starts = run_starts(y_true, end_of_life)
+    lengths = np.diff(np.r_[starts, len(y_true)])
+    run = np.repeat(np.arange(len(starts)), lengths)
+    life = (np.maximum.reduceat(y_true, starts) if end_of_life is None
+            else np.asarray(end_of_life, dtype=np.float64)[starts])
+    life = np.maximum(life, np.finfo(np.float64).tiny)
+
+    # Prognostic horizon: true RUL at the sample after the last one outside the cone (0 when the last is outside)
+    index = np.arange(len(y_true))
+    outside = np.abs(error) > alpha * life[run]
+    last_outside = np.maximum.reduceat(np.where(outside, index, starts[run] - 1), starts)
+    ends = starts + lengths - 1
+    horizon_rul = np.where(last_outside < ends, y_true[np.minimum(last_outside + 1, ends)], 0.0)
+
+    # Alpha-lambda: the sample whose true RUL is closest to (1 - lambda) of the run's first one
+    distance = np.abs(y_true - (1 - lam) * y_true[starts][run])
+    nearest = distance == np.minimum.reduceat(distance, starts)[run]
+    at_lambda = np.minimum.reduceat(np.where(nearest, index, len(index)), starts)
+    in_cone = np.abs(error[at_lambda]) <= alpha * y_true[at_lambda]
+
+    if horizon is None:
+        horizon = DEFAULT_HORIZON_FRACTION * float(np.median(life))
+    actual, predicted = y_true <= horizon, y_pred <= horizon
+    true_pos = np.count_nonzero(actual & predicted)
+    precision = _safe_ratio(true_pos, np.count_nonzero(predicted))
+    recall = _safe_ratio(true_pos, np.count_nonzero(actual))
+    return RULEvaluation(
+        samples=len(y_true),
+        runs=len(starts),
+        rmse=float(np.sqrt(np.mean(error ** 2))),
+        mae=float(np.mean(np.abs(error))),
+        nasa_score=float(np.mean(nasa_score(error))),
+        prognostic_horizon=float(horizon_rul.mean()),
+        horizon_fraction=float(np.mean(horizon_rul / np.maximum(y_true[starts], np.finfo(np.float64).tiny))),
+        alpha_lambda=float(in_cone.mean()),
+        alpha=alpha,
+        horizon=float(horizon),
+        accuracy=float(np.mean(actual == predicted)),
+        precision=precision,
+        recall=recall,
+        f1=_safe_ratio(2 * precision * recall, precision + recall),
+    )
+
+
+def holdout_start(y_true, holdout=0.2, end_of_life=None):
+    """First row of the whole runs after fit_with_holdout's training split of the same rows.
+
+    The run cut by the split is skipped, so every evaluated run is unseen and complete.
+    Raises ValueError when no run starts after the split, e.g. a single self-labelled series.
+    """
+    split = int(len(y_true) * (1 - holdout))
+    starts = run_starts(y_true, end_of_life)
+    held_out = starts[starts >= split]
+    if not len(held_out):
+        raise ValueError("no whole run-to-failure run lies in the hold-out; a single series cannot be validated")
+    return int(held_out[0])
+
+
+def evaluate_holdout(model, X, y, holdout=0.2, end_of_life=None, **options):
+    """Evaluate a model on the whole runs that fit_with_holdout held out of its training split.
+
+    y must hold several run-to-failure runs with known failure times (see holdout_start);
+    `end_of_life` is as for evaluate.
+    """
+    start = holdout_start(y, holdout, end_of_life)
+    if end_of_life is not None:
+        end_of_life = np.asarray(end_of_life, dtype=np.float64)[start:]
+    return evaluate(y[start:], model.predict(X[start:]), end_of_life, **options)
@@ -0,0 +1,195 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+VIBRATION_SENSORS = ("Vibration", "Acceleration")
+TIME_FEATURES = ["rms", "peak", "crest", "kurtosis"]
+DEFAULT_FRAME = 1024
+DEFAULT_BANDS = 8
+FRAME_BATCH = 2048  # frames transformed per FFT call, bounding the temporary spectra to ~16 MB
+
+
+@dataclass
+class VibrationFeatures:
+    time: np.ndarray  # centre of every frame, in the units of the input timestamps
+    rms: np.ndarray
+    peak: np.ndarray
+    crest: np.ndarray
+    kurtosis: np.ndarray  # Pearson kurtosis (3.0 for Gaussian noise)
+    band_energy: np.ndarray  # (frames, bands) mean-square energy per band
+    bands: np.ndarray  # (bands, 2) band edges in Hz
+    fault_amplitude: dict = field(default_factory=dict)  # fault name -> (frames,) envelope amplitude
+
+    def __len__(self):
+        return len(self.time)
+
+    def matrix(self):
+        # Columnar feature matrix: TIME_FEATURES, one column per band, then one per fault frequency
+        return np.column_stack([self.rms, self.peak, self.crest, self.kurtosis, self.band_energy,
+                                *self.fault_amplitude.values()])
+
+
+def frame_signal(signal, frame=DEFAULT_FRAME, hop=None):
+    """Strided (frames, frame) view of a 1-D signal; no samples are copied."""
+    signal = np.asarray(signal)
+    if len(signal) < frame:
+        raise ValueError(f"Need at least {frame} samples to build a frame, got {len(signal)}")
+    return sliding_window_view(signal, frame)[::hop or frame // 2]
+
+
+def time_domain_features(frames):
+    # RMS, absolute peak, crest factor and kurtosis along the last axis
+    frames = np.asarray(frames, dtype=np.float64)
+    square = np.square(frames)
+    mean_square = square.mean(axis=-1)
+    rms = np.sqrt(mean_square)
+    peak = np.abs(frames).max(axis=-1)
+
+    # Central moments of the mean-centred frames: expanding them from raw power sums cancels
+    # catastrophically once a DC offset dwarfs the vibration. The squares reuse one buffer
+    centred = np.square(frames - frames.mean(axis=-1, keepdims=True))
+    variance = centred.mean(axis=-1)
+    fourth = np.square(centred, out=centred).mean(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crest = np.where(rms > 0, peak / rms, 0.0)
+        kurtosis = np.where(variance > 0, fourth / variance ** 2, 0.0)
+    return rms, peak, crest, kurtosis
+
+
+def default_bands(sample_rate, n_bands=DEFAULT_BANDS):
+    # Equal-width bands from DC to Nyquist
+    edges = np.linspace(0, sample_rate / 2, n_bands + 1)
+    return np.column_stack([edges[:-1], edges[1:]])
+
+
+def power_spectrum(frames, sample_rate):
+    """One-sided Hann-windowed power spectrum of every frame, scaled so bins sum to the mean square."""
+    frames = np.asarray(frames, dtype=np.float64)
+    n = frames.shape[-1]
+    taper = np.hanning(n)
+    spectrum = np.fft.rfft(frames * taper, axis=-1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    power *= 2 / (n * np.dot(taper, taper))
+    power[..., 0] /= 2
+    if n % 2 == 0:
+        power[..., -1] /= 2
+    return np.fft.rfftfreq(n, 1 / sample_rate), power
+
+
+def band_energies(freqs, power, bands):
+    # Sum of power bins per [lo, hi) band, from a cumulative sum so every band costs O(1) per frame
+    cumulative = np.concatenate([np.zeros(power.shape[:-1] + (1,)), np.cumsum(power, axis=-1)], axis=-1)
+    edges = np.searchsorted(freqs, np.asarray(bands, dtype=np.float64), side="left")
+    edges[-1, 1] = len(freqs) if bands[-1][1] >= freqs[-1] else edges[-1, 1]
+    return cumulative[..., edges[:, 1]] - cumulative[..., edges[:, 0]]
+
+
+def envelope_spectrum(frames, sample_rate):
+    """Amplitude spectrum of each frame's Hilbert envelope (demodulation for bearing faults)."""
+    frames = np.asarray(frames, dtype=np.float64)
+    n = frames.shape[-1]
+    # Analytic signal: keep positive frequencies doubled, drop negative ones, transform back
+    spectrum = np.fft.rfft(frames, axis=-1)
+    spectrum[..., 1:(n + 1) // 2] *= 2
+    envelope = np.abs(np.fft.ifft(spectrum, n=n, axis=-1))
+    envelope -= envelope.mean(axis=-1, keepdims=True)
+    amplitude = np.abs(np.fft.rfft(envelope, axis=-1)) * (2 / n)
+    return np.fft.rfftfreq(n, 1 / sample_rate), amplitude
+
+
+def bearing_fault_frequencies(shaft_hz, n_rollers, roller_diameter, pitch_diameter, contact_angle=0.0):
+    """Characteristic defect frequencies (Hz) of a rolling-element bearing.
+
+    BPFO/BPFI: ball pass frequency of the outer/inner race, BSF: ball spin, FTF: cage (train).
+    """
+    ratio = roller_diameter / pitch_diameter * np.cos(np.radians(contact_angle))
+    return {
+        "BPFO": float(n_rollers / 2 * shaft_hz * (1 - ratio)),
+        "BPFI": float(n_rollers / 2 * shaft_hz * (1 + ratio)),
+        "BSF": float(pitch_diameter / (2 * roller_diameter) * shaft_hz * (1 - ratio ** 2)),
+        "FTF": float(shaft_hz / 2 * (1 - ratio)),
+    }
+
+
+def fault_amplitudes(freqs, amplitude, fault_frequencies, harmonics=3, tolerance_bins=1):
+    # Peak envelope amplitude within +/- tolerance_bins of each fault harmonic, summed over harmonics
+    resolution = freqs[1] - freqs[0]
+    offsets = np.arange(-tolerance_bins, tolerance_bins + 1)
+    result = {}
+    for name, frequency in fault_frequencies.items():
+        centres = np.rint(frequency * np.arange(1, harmonics + 1) / resolution).astype(int)
+        centres = centres[centres + tolerance_bins < len(freqs)]
+        if not len(centres):
+            result[name] = np.zeros(amplitude.shape[:-1])
+            continue
+        bins = np.clip(centres[:, None] + offsets[None, :], 0, len(freqs) - 1)
+        result[name] = amplitude[..., bins].max(axis=-1).sum(axis=-1)
+    return result
+
+
+def extract_features(signal, sample_rate, timestamp=None, frame=DEFAULT_FRAME, hop=None, bands=None,
+                     fault_frequencies=None, batch_frames=FRAME_BATCH):
+    """Compute every health feature for a whole waveform in one vectorized pass per frame batch.
+
+    Frames are strided views of `signal`; spectra are computed FRAME_BATCH frames at a time so
+    memory stays bounded on long recordings. Returns a VibrationFeatures.
+    """
+    signal = np.ascontiguousarray(signal, dtype=np.float64)
+    hop = hop or frame // 2
+    frames = frame_signal(signal, frame, hop)
+    bands = default_bands(sample_rate) if bands is None else np.asarray(bands, dtype=np.float64)
+    n_frames = len(frames)
+
+    time_columns = [np.empty(n_frames) for _ in TIME_FEATURES]
+    band_energy = np.empty((n_frames, len(bands)))
+    faults = {name: np.empty(n_frames) for name in (fault_frequencies or {})}
+    for start in range(0, n_frames, batch_frames):
+        batch = frames[start:start + batch_frames]
+        stop = start + len(batch)
+        for column, values in zip(time_columns, time_domain_features(batch)):
+            column[start:stop] = values
+        freqs, power = power_spectrum(batch, sample_rate)
+        band_energy[start:stop] = band_energies(freqs, power, bands)
+        if faults:
+            env_freqs, env_amplitude = envelope_spectrum(batch, sample_rate)
+            for name, values in fault_amplitudes(env_freqs, env_amplitude, fault_frequencies).items():
+                faults[name][start:stop] = values
+
+    centres = np.arange(n_frames) * hop + (frame - 1) / 2
+    if timestamp is None:
+        time = centres / sample_rate
+    else:
+        timestamp = np.asarray(timestamp, dtype=np.float64)
+        time = np.interp(centres, np.arange(len(timestamp)), timestamp)
+    return VibrationFeatures(time, *time_columns, band_energy, bands, faults)
+
+
+def estimate_sample_rate(timestamp):
+    # Median spacing is robust to the occasional gap between uploads
+    timestamp = np.asarray(timestamp[:100_000], dtype=np.float64)
+    spacing = np.median(np.diff(timestamp)) if len(timestamp) > 1 else 0.0
+    if not spacing > 0:
+        raise ValueError("Cannot infer a sample rate from non-increasing timestamps")
+    return 1.0 / spacing
+
+
+def health_indicator(features, baseline=0.1, failure_ratio=3.0, monotonic=True):
+    """Map frame RMS onto a [0, 1] health indicator.
+
+    1.0 is the median RMS of the first `baseline` fraction of frames (assumed healthy) and 0.0 is
+    `failure_ratio` times that level. With `monotonic`, the indicator never recovers, matching the
+    run-to-failure curves in the insights chart.
+    """
+    rms = features.rms
+    reference = np.median(rms[:max(1, int(len(rms) * baseline))])
+    if reference <= 0:
+        return np.ones_like(rms)
+    health = np.clip(1 - (rms / reference - 1) / (failure_ratio - 1), 0, 1)
+    return np.minimum.accumulate(health) if monotonic else health
+
+
+def sensor_health_indicator(timestamp, value, frame=DEFAULT_FRAME, hop=None):
+    # Stored vibration/acceleration history -> (frame times, health indicator) for the insights chart
+    features = extract_features(value, estimate_sample_rate(timestamp), timestamp=timestamp, frame=frame, hop=hop)
+    return features.time, health_indicator(features)
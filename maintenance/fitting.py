@@ -0,0 +1,150 @@
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+FIT_BATCH = 16384  # curves per vectorized pass, bounding temporaries to a few (batch, time) arrays
+MIN_DECAY = 0.05
+MAX_RUL_FACTOR = 10.0  # fitted RUL is capped at this multiple of the latest observed time
+MAX_SE_LOG_RUL = 1.0  # fits less certain than this (95% CI wider than ~7x either way) are undetermined
+STEP_TOLERANCE = 1e-2  # a fit whose last log-RUL step was larger has not converged
+
+
+@dataclass
+class CurveFit:
+    """Per-curve estimates of health = 1 - (t / rul) ** decay, with confidence intervals."""
+
+    rul: np.ndarray
+    decay: np.ndarray
+    rul_ci: np.ndarray  # (curves, 2) lower/upper bounds
+    decay_ci: np.ndarray  # (curves, 2)
+    rmse: np.ndarray
+    n_points: np.ndarray
+    confidence: float
+    covariance: np.ndarray  # (curves, 2, 2) asymptotic covariance of (log rul, decay)
+    determined: np.ndarray  # (curves,) False where the data do not pin down the RUL; those rul values are NaN
+
+    def __len__(self):
+        return len(self.rul)
+
+    def predict(self, time):
+        # Fitted health of every curve over `time`, shape (curves, len(time)); 0 after the fitted RUL
+        ratio = np.asarray(time, dtype=np.float64)[None, :] / self.rul[:, None]
+        return np.clip(1 - np.minimum(ratio, 1) ** self.decay[:, None], 0, 1)
+
+
+def _sums(*columns):
+    # Row-wise sums of elementwise products, e.g. _sums(w, x, z) -> sum(w * x * z, axis=1), without temporaries
+    subscripts = ",".join(["ij"] * len(columns)) + "->i"
+    return np.einsum(subscripts, *columns, optimize=False)
+
+
+def _linearized_fit(time, health, mask):
+    # log(1 - h) = k log t - k log R: ordinary least squares per curve in log space
+    usable = mask & (health < 0.98) & (health > 0.02)
+    x = np.log(np.where(usable, time, 1.0))
+    z = np.log1p(-np.where(usable, health, 0.0))
+    w = usable.astype(np.float64)
+    n = w.sum(axis=1)
+    sx, sz = _sums(w, x), _sums(w, z)
+    sxx, sxz = _sums(w, x, x), _sums(w, x, z)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decay = (n * sxz - sx * sz) / (n * sxx - sx ** 2)
+        intercept = (sz - decay * sx) / n
+        log_rul = -intercept / decay
+    # Curves too flat or too short for the log fit start from the latest observed time and a linear decay
+    fallback = ~np.isfinite(log_rul) | ~(decay > MIN_DECAY) | (n < 3)
+    latest = np.where(mask, time, 0).max(axis=1)
+    log_rul = np.where(fallback, np.log(np.maximum(latest, 1e-9) * 1.5), log_rul)
+    decay = np.where(fallback, 1.0, decay)
+    return log_rul, decay
+
+
+def _gauss_newton(time, health, mask, log_rul, decay, iterations, max_log_rul):
+    # Refine (log R, k) on the original health scale with damped Gauss-Newton, all curves at once.
+    # Also returns the step that would come next, as a convergence check.
+    w = mask.astype(np.float64)
+    log_t = np.log(np.where(mask, time, 1.0))
+    for iteration in range(iterations + 1):
+        log_u = log_t - log_rul[:, None]
+        powered = np.exp(decay[:, None] * log_u)  # (t / R) ** k
+        # The model is clipped at zero health after the RUL, where it no longer depends on the parameters
+        alive = w * (log_u < 0)
+        residual = (health - np.maximum(1 - powered, 0)) * w
+        # Jacobian of the model w.r.t. log R and k
+        j_rul = decay[:, None] * powered * alive
+        j_decay = -powered * log_u * alive
+        a, b, c = _sums(j_rul, j_rul), _sums(j_rul, j_decay), _sums(j_decay, j_decay)
+        g_rul, g_decay = _sums(j_rul, residual), _sums(j_decay, residual)
+        # Levenberg damping keeps the 2x2 solve well-posed when a curve barely constrains one parameter
+        damping = 1e-6 * (a + c) + 1e-12
+        det = (a + damping) * (c + damping) - b * b
+        step_rul = ((c + damping) * g_rul - b * g_decay) / det
+        step_decay = ((a + damping) * g_decay - b * g_rul) / det
+        if iteration == iterations:
+            break
+        # Partial-life curves barely constrain R from above; without the cap it can run off to infinity
+        log_rul = np.minimum(log_rul + np.clip(step_rul, -1.0, 1.0), max_log_rul)
+        decay = np.maximum(decay + np.clip(step_decay, -0.5 * decay, 2.0 * decay), MIN_DECAY)
+    return log_rul, decay, residual, (a, b, c), step_rul
+
+
+def fit_degradation_curves(time, health, mask=None, iterations=6, confidence=0.95, batch_size=FIT_BATCH):
+    """Fit health = 1 - (t / rul) ** decay to every row of `health` in vectorized batches.
+
+    `time` is shared (T,) or per curve (N, T). Samples at t <= 0 or where `mask` is False are
+    ignored; the model is clipped at zero after the RUL, so post-failure readings still count
+    as evidence that failure has happened. A log-space linear regression seeds
+    a few Gauss-Newton steps; intervals come from the asymptotic covariance s^2 (J^T J)^-1,
+    with the RUL interval taken in log space so it stays positive. Returns a CurveFit.
+
+    The RUL is capped at MAX_RUL_FACTOR x the latest observed time. Curves that end long
+    before failure often fit almost as well with any larger RUL. Fits that hit the cap, have
+    not converged, or have a log-RUL standard error above MAX_SE_LOG_RUL are marked
+    undetermined: their rul and rul_ci are NaN rather than confident-looking estimates.
+    """
+    health = np.atleast_2d(np.asarray(health, dtype=np.float64))
+    time = np.broadcast_to(np.asarray(time, dtype=np.float64), health.shape)
+    mask = (time > 0) & np.isfinite(health) & (True if mask is None else np.broadcast_to(mask, health.shape))
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    n_curves = len(health)
+    rul, decay, rmse, n_points = (np.empty(n_curves) for _ in range(4))
+    rul_ci, decay_ci = np.empty((n_curves, 2)), np.empty((n_curves, 2))
+    covariance = np.empty((n_curves, 2, 2))
+    determined = np.empty(n_curves, dtype=bool)
+    for start in range(0, n_curves, batch_size):
+        rows = slice(start, start + batch_size)
+        t, h, m = time[rows], np.where(mask[rows], health[rows], 0.0), mask[rows]
+        latest = np.where(m, t, 0).max(axis=1)
+        max_log_rul = np.log(np.maximum(latest, 1e-9) * MAX_RUL_FACTOR)
+        log_rul, k = _linearized_fit(t, h, m)
+        log_rul = np.minimum(log_rul, max_log_rul)
+        log_rul, k, residual, (a, b, c), last_step = _gauss_newton(t, h, m, log_rul, k, iterations, max_log_rul)
+
+        n = m.sum(axis=1)
+        sse = (residual ** 2).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sigma2 = sse / np.maximum(n - 2, 1)
+            det = a * c - b * b
+            cov = sigma2[:, None, None] / det[:, None, None] * np.stack([c, -b, -b, a], axis=-1).reshape(-1, 2, 2)
+        # Curves with fewer than 3 points or a singular Jacobian get unbounded intervals
+        undetermined = (n < 3) | ~(det > 0)
+        cov[undetermined] = np.diag([np.inf, np.inf])
+        se_log_rul, se_decay = np.sqrt(cov[:, 0, 0]), np.sqrt(cov[:, 1, 1])
+        covariance[rows] = cov
+        with np.errstate(invalid="ignore"):
+            ok = (~undetermined & (se_log_rul <= MAX_SE_LOG_RUL) & (np.abs(last_step) <= STEP_TOLERANCE)
+                  & (log_rul < max_log_rul - 1e-9))
+        determined[rows] = ok
+
+        rul[rows] = np.where(ok, np.exp(log_rul), np.nan)
+        decay[rows] = k
+        with np.errstate(over="ignore"):
+            rul_ci[rows] = np.where(ok[:, None], np.exp(log_rul[:, None] + np.array([-z, z]) * se_log_rul[:, None]),
+                                    np.nan)
+        decay_ci[rows] = k[:, None] + np.array([-z, z]) * se_decay[:, None]
+        rmse[rows] = np.sqrt(sse / np.maximum(n, 1))
+        n_points[rows] = n
+    return CurveFit(rul, decay, rul_ci, decay_ci, rmse, n_points.astype(np.int64), confidence, covariance,
+                    determined)
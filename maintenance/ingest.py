@@ -0,0 +1,246 @@
+import sys
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # bytes of raw text parsed per step
+DEFAULT_CHANNEL = "default"
+
+_COLUMN_ALIASES = {
+    "timestamp": ("timestamp", "time", "datetime", "date", "ts"),
+    "value": ("value", "reading", "measurement", "val"),
+    "channel": ("channel", "sensor", "sensor_type", "signal"),
+}
+
+
+@dataclass
+class SensorChunk:
+    timestamp: np.ndarray  # float64 seconds (epoch seconds when the source used datetimes)
+    value: np.ndarray  # float64
+    channel: np.ndarray  # int32 codes into IngestStats.channels
+
+    def __len__(self):
+        return len(self.value)
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    bytes_read: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+    channels: list = field(default_factory=list)
+
+    @property
+    def rows_per_s(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_s(self):
+        return self.bytes_read / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _layout_from_header(fields):
+    # Map header names onto (timestamp, value, channel) column indexes
+    names = [f.strip().strip('"').lower() for f in fields]
+    layout = {}
+    for column, aliases in _COLUMN_ALIASES.items():
+        for i, name in enumerate(names):
+            if name in aliases:
+                layout[column] = i
+                break
+    if "value" not in layout:
+        raise ValueError(f"Sensor file header has no value column: {fields}")
+    return layout
+
+
+def _layout_from_row(fields):
+    # Headerless files are read as timestamp, value[, channel]
+    if len(fields) == 1:
+        return {"value": 0}
+    layout = {"timestamp": 0, "value": 1}
+    if len(fields) > 2:
+        layout["channel"] = 2
+    return layout
+
+
+class _ChunkParser:
+    def __init__(self, delimiter):
+        self.delimiter = delimiter
+        self.layout = None
+        self.dtype = None
+        self.channel_codes = {}
+        self._raw_codes = {}
+        self.rows_seen = 0
+
+    def _configure(self, lines):
+        # Fix the column layout from the header (or first row), then dtypes from the first data line
+        start = 0
+        if self.layout is None:
+            first = next((i for i, line in enumerate(lines) if line.strip()), None)
+            if first is None:
+                return []
+            fields = lines[first].split(self.delimiter)
+            # A non-numeric value position means the first line is a header
+            if not _is_number(fields[1] if len(fields) > 1 else fields[0]):
+                self.layout = _layout_from_header(fields)
+                start = first + 1
+            else:
+                self.layout = _layout_from_row(fields)
+        lines = lines[start:]
+        sample = next((line for line in lines if line.strip()), None)
+        if sample is None:
+            return []
+
+        columns, dtype = [], []
+        sample_fields = sample.split(self.delimiter)
+        for name in ("timestamp", "value", "channel"):
+            if name not in self.layout:
+                continue
+            columns.append(self.layout[name])
+            if name == "channel":
+                dtype.append((name, "U32"))
+            elif name == "timestamp" and not _is_number(sample_fields[self.layout[name]]):
+                dtype.append((name, "M8[ns]"))
+            else:
+                dtype.append((name, "f8"))
+        self.usecols = columns
+        self.dtype = np.dtype(dtype)
+        return lines
+
+    def parse(self, lines):
+        if self.dtype is None:
+            lines = self._configure(lines)
+            if self.dtype is None:
+                return None
+        # np.loadtxt only sees one chunk of lines at a time, so the full text is never held in memory
+        table = np.loadtxt(lines, delimiter=self.delimiter, dtype=self.dtype, usecols=self.usecols, ndmin=1)
+        n = len(table)
+
+        if "timestamp" in self.layout:
+            timestamp = table["timestamp"]
+            if timestamp.dtype.kind == "M":
+                timestamp = timestamp.astype("int64") / 1e9
+            timestamp = np.asarray(timestamp, dtype=np.float64)
+        else:
+            timestamp = np.arange(self.rows_seen, self.rows_seen + n, dtype=np.float64)
+
+        if "channel" in self.layout:
+            # Files carry only a handful of channels: match known names with vectorized compares
+            # and fall back to a sort-based np.unique only for names not seen before
+            raw = table["channel"]
+            channel = np.full(n, -1, dtype=np.int32)
+            for name, code in self._raw_codes.items():
+                channel[raw == name] = code
+            unknown = channel < 0
+            if unknown.any():
+                names, inverse = np.unique(raw[unknown], return_inverse=True)
+                for name in names:
+                    self._raw_codes[str(name)] = self.channel_codes.setdefault(str(name).strip(), len(self.channel_codes))
+                channel[unknown] = np.array([self._raw_codes[str(name)] for name in names], dtype=np.int32)[inverse]
+        else:
+            code = self.channel_codes.setdefault(DEFAULT_CHANNEL, len(self.channel_codes))
+            channel = np.full(n, code, dtype=np.int32)
+
+        self.rows_seen += n
+        return SensorChunk(timestamp, np.asarray(table["value"], dtype=np.float64), channel)
+
+
+def iter_sensor_chunks(stream, chunk_size=DEFAULT_CHUNK_SIZE, delimiter=",", encoding="utf-8",
+                       progress=None, total_bytes=None, stats=None):
+    """Parse a binary CSV/TXT stream chunk by chunk, yielding SensorChunk column arrays.
+
+    Only one chunk of raw text (plus a partial trailing line) is resident at a time.
+    `progress(bytes_read, total_bytes, rows)` is called after each chunk.
+    """
+    stats = stats if stats is not None else IngestStats()
+    parser = _ChunkParser(delimiter)
+    start = time.perf_counter()
+    leftover = b""
+
+    while True:
+        block = stream.read(chunk_size)
+        if isinstance(block, str):
+            block = block.encode(encoding)
+        if not block and not leftover:
+            break
+        stats.bytes_read += len(block)
+
+        # Only parse complete lines; the tail carries over into the next read
+        data = leftover + block
+        if block:
+            cut = data.rfind(b"\n") + 1
+            data, leftover = data[:cut], data[cut:]
+        else:
+            leftover = b""
+        if not data.strip():
+            continue  # nothing but blank lines, which np.loadtxt would warn about
+
+        chunk = parser.parse(data.decode(encoding).splitlines())
+        if chunk is not None and len(chunk):
+            stats.rows += len(chunk)
+            stats.chunks += 1
+            stats.channels = list(parser.channel_codes)
+            stats.seconds = time.perf_counter() - start
+            yield chunk
+        if progress is not None:
+            progress(stats.bytes_read, total_bytes, stats.rows)
+
+    stats.channels = list(parser.channel_codes)
+    stats.seconds = time.perf_counter() - start
+
+
+def ingest_sensor_file(stream, chunk_size=DEFAULT_CHUNK_SIZE, delimiter=",", encoding="utf-8",
+                       progress=None, total_bytes=None):
+    # Collect every chunk into contiguous typed columns; returns (SensorChunk, IngestStats)
+    stats = IngestStats()
+    chunks = list(iter_sensor_chunks(stream, chunk_size, delimiter, encoding, progress, total_bytes, stats))
+    if chunks:
+        columns = SensorChunk(
+            np.concatenate([c.timestamp for c in chunks]),
+            np.concatenate([c.value for c in chunks]),
+            np.concatenate([c.channel for c in chunks]),
+        )
+    else:
+        columns = SensorChunk(np.empty(0), np.empty(0), np.empty(0, dtype=np.int32))
+    return columns, stats
+
+
+def main(argv=None):
+    # Headless entry point: python -m maintenance.ingest FILE [FILE ...]
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Stream sensor CSV/TXT files into typed column arrays")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_SIZE / 2**20)
+    parser.add_argument("--delimiter", default=",")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        total = os.path.getsize(path)
+
+        def report(done, total_bytes, rows):
+            print(f"\r{path}: {done / total_bytes:6.1%} {rows:,} rows", end="", file=sys.stderr)
+
+        stats = IngestStats()
+        with open(path, "rb") as f:
+            for _ in iter_sensor_chunks(f, int(args.chunk_mb * 2**20), args.delimiter,
+                                        progress=report if total else None, total_bytes=total, stats=stats):
+                pass
+        print(file=sys.stderr)
+        print(f"{path}: {stats.rows:,} rows, {stats.bytes_read / 1e6:.1f} MB in {stats.seconds:.2f} s "
+              f"({stats.rows_per_s:,.0f} rows/s, {stats.mb_per_s:.1f} MB/s), channels={stats.channels}")
+
+
+if __name__ == "__main__":
+    main()
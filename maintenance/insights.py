@@ -0,0 +1,184 @@
+import io
+
+import numpy as np
+
+from maintenance.catalog import EXPLANATIONS, NO_EXPLANATION
+from maintenance.fitting import fit_degradation_curves
+from maintenance.instrumentation import calls
+from maintenance.simulation import simulate_degradation
+from maintenance.uncertainty import monte_carlo_rul
+
+
+@calls.track()
+def build_insights_figure(part, seed=None, measured=None):
+    # Generate decaying maintenance graph data with multiple lines and noise;
+    # `measured` is an optional (time, health) pair computed from uploaded vibration data
+    rng = np.random.default_rng(seed)
+    time = np.linspace(0, 350, 100)  # Mock time scale
+
+    # Figure objects are independent of pyplot's global state, so concurrent sessions never share one
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(6.4, 6.4))
+    # Fixed margins instead of tight_layout, which would cost an extra full draw per render
+    ax, hist_ax = fig.subplots(2, 1, gridspec_kw={"height_ratios": [3, 1], "hspace": 0.3, "top": 0.88,
+                                                  "bottom": 0.09, "left": 0.11, "right": 0.96})
+    decay_rate = rng.uniform(2, 5)  # Shared decay rate for every line
+
+    # Generate 5 curves with different end points in a single batch
+    ruls, _, healths = simulate_degradation(5, time, rul_range=(250, 350),
+                                            decay_range=(decay_rate, decay_rate), seed=rng)
+    for i, (rul, health) in enumerate(zip(ruls, healths)):
+        time_clip = np.clip(time, 0, rul)
+        ax.plot(time_clip, health, label=f'Curve {i+1} (RUL={rul})')
+
+    # Fit health = 1 - (t / RUL) ** k to all drawn curves pooled together (black, dotted)
+    fit = fit_degradation_curves(np.tile(time, len(healths)), healths.reshape(1, -1))
+    fitted_rul, (rul_low, rul_high) = fit.rul[0], fit.rul_ci[0]
+    sampled_time = np.linspace(0, 350, 10)
+    sampled_time_clip = np.clip(sampled_time, 0, fitted_rul)
+    sampled_health = fit.predict(sampled_time)[0]
+    ax.plot(sampled_time_clip, sampled_health, '--', color='black',
+            label=(f'Fitted Line (RUL={fitted_rul:.0f}, 95% CI {rul_low:.0f}-{rul_high:.0f}, k={fit.decay[0]:.2f})'
+                   if fit.determined[0] else 'Fitted Line (RUL undetermined)'))
+
+    # Highlight 3 random points on the fitted line within the first 1/3 of the sampled RUL
+    max_index = len(sampled_time_clip) // 3
+    random_indices = rng.choice(max_index, size=3, replace=False)
+    for idx in random_indices:
+        ax.plot(sampled_time_clip[idx], sampled_health[idx], '*', color='black')
+
+    # Monte Carlo bands from the per-curve fits, and the sampled RUL distribution underneath
+    dist = monte_carlo_rul(time, healths, seed=rng)
+    low, median, high = dist.bands[0]
+    ax.fill_between(time, low, high, color='gray', alpha=0.2,
+                    label=f'p{dist.percentiles[0]}-p{dist.percentiles[-1]} Monte Carlo band')
+    ax.plot(time, median, ':', color='gray', label=f'p{dist.percentiles[1]} Monte Carlo')
+    # Undetermined fits sample NaN RULs (all of them when no curve could be fitted), which np.histogram rejects
+    sampled = dist.rul[0][np.isfinite(dist.rul[0])]
+    if len(sampled):
+        counts, edges = np.histogram(sampled, bins=40)
+        hist_ax.stairs(counts, edges, fill=True, color='gray', alpha=0.6)
+        for percentile, value in zip(dist.percentiles, dist.rul_percentiles[0]):
+            if np.isfinite(value):
+                hist_ax.axvline(value, color='black', linestyle=':' if percentile != 50 else '-', linewidth=1)
+        hist_ax.set_xlabel(f'Sampled RUL (p{dist.percentiles[0]}/p{dist.percentiles[1]}/p{dist.percentiles[2]}: '
+                           + ' / '.join(f'{value:.0f}' for value in dist.rul_percentiles[0]) + ')')
+    else:
+        hist_ax.text(0.5, 0.5, 'No curve could be fitted, so no RUL was sampled', ha='center', va='center',
+                     transform=hist_ax.transAxes)
+        hist_ax.set_xlabel('Sampled RUL')
+    hist_ax.set_ylabel('Samples')
+
+    ax.set_title(f'Training Data for {part}')
+    ax.set_xlabel('Time')
+    ax.set_ylabel('Health Indicator')
+
+    # Measured indicator on its own time axis, since uploads are in real seconds rather than the mock scale
+    handles, labels = ax.get_legend_handles_labels()
+    if measured is not None:
+        measured_time, measured_health = measured
+        twin = ax.twiny()
+        line, = twin.plot(measured_time, measured_health, color='dimgray', linewidth=2)
+        twin.set_xlabel('Measured time')
+        handles.append(line)
+        labels.append('Measured Health Indicator')
+    ax.legend(handles, labels, fontsize='small')
+
+    return fig
+
+
+@calls.track()
+def build_performance_figure(metrics, values):
+    # Bar chart of model scores shown in the RUL Models tab
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.subplots()
+    ax.bar(metrics, values, color='skyblue')
+    ax.set_ylim(0, 1)
+    ax.set_ylabel("Score")
+    ax.set_title("Model Performance Metrics")
+    ax.tick_params(axis="x", labelrotation=20)
+    fig.tight_layout()
+    return fig
+
+
+def cached_performance_figure(cache, part, sensor, model_name, evaluation, fingerprint=None, fmt="png", dpi=None):
+    # Hold-out scores of one part x sensor x model as a chart; `fingerprint` must change whenever the model is refit
+    key = cache.make_key(part, (sensor, model_name), fingerprint, fmt=fmt, dpi=dpi)
+    scores = evaluation.scores()
+    return cache.get_or_render(
+        key, lambda: render_figure(build_performance_figure(list(scores), list(scores.values())), fmt=fmt, dpi=dpi))
+
+
+@calls.track()
+def build_history_figure(part, channel, timestamp, value):
+    # Stored sensor history, already decimated by SensorStore.read_decimated to about one point per pixel
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(6.4, 3.2))
+    ax = fig.subplots()
+    ax.plot(timestamp, value, linewidth=0.8)
+    ax.set_title(f'{channel} History for {part}')
+    ax.set_xlabel('Time')
+    ax.set_ylabel(channel)
+    fig.tight_layout()
+    return fig
+
+
+@calls.track()
+def build_stream_figure(part, trends, highlight=None):
+    # EWMA trend of each live sensor series; trends maps sensor -> (times, values)
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(6.4, 3.2))
+    ax = fig.subplots()
+    for sensor, (times, values) in trends.items():
+        if len(times):
+            ax.plot(times, values, label=sensor, linewidth=2 if sensor == highlight else 1,
+                    alpha=1.0 if highlight in (None, sensor) else 0.4)
+    ax.set_title(f'Live Health Trend for {part}')
+    ax.set_xlabel('Time')
+    ax.set_ylabel('EWMA')
+    ax.legend(fontsize='small', ncol=2)
+    fig.tight_layout()
+    return fig
+
+
+def render_figure(fig, fmt="png", dpi=None):
+    # Encode a figure entirely in memory; "rgba" returns the raw canvas buffer as an array
+    if fmt == "rgba":
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        if dpi is not None:
+            fig.set_dpi(dpi)
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi)
+    return buf.getvalue()
+
+
+@calls.track()
+def generate_maintenance_insights(part, seed=None, fmt="png"):
+    # Render the trend chart to encoded bytes (no files are written)
+    chart = render_figure(build_insights_figure(part, seed=seed), fmt=fmt)
+
+    # Default explanation for the selected part (the app reads it from the catalog)
+    explanation = EXPLANATIONS.get(part, NO_EXPLANATION)
+
+    return chart, explanation
+
+
+@calls.track()
+def cached_maintenance_insights(cache, part, seed, fingerprint=None, fmt="png", dpi=None, measured=None,
+                                explanation=None):
+    # Same as generate_maintenance_insights, but served from a RenderCache when the inputs are unchanged.
+    # `measured` is derived from the uploaded data, so `fingerprint` must change whenever it does.
+    key = cache.make_key(part, seed, fingerprint, fmt=fmt, dpi=dpi)
+    chart = cache.get_or_render(
+        key, lambda: render_figure(build_insights_figure(part, seed=seed, measured=measured), fmt=fmt, dpi=dpi))
+    return chart, explanation if explanation is not None else EXPLANATIONS.get(part, NO_EXPLANATION)
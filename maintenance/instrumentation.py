@@ -0,0 +1,41 @@
+import functools
+import threading
+from collections import Counter
+
+
+class CallCounter:
+    """Thread-safe named counters used to check what a Streamlit rerun actually executed."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def increment(self, name, n=1):
+        with self._lock:
+            self._counts[name] += n
+
+    def track(self, name=None):
+        # Decorator counting every call of the wrapped function
+        def decorate(fn):
+            key = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                self.increment(key)
+                return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorate
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+# Process-wide counters shared by every session
+calls = CallCounter()
@@ -0,0 +1,251 @@
+import importlib
+import multiprocessing
+import os
+import pickle
+import signal
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import closing, contextmanager
+
+DEFAULT_JOB_DIR = os.environ.get("MAINTENANCE_JOB_DIR", "jobs")
+DEFAULT_MAX_WORKERS = int(os.environ.get("MAINTENANCE_JOB_WORKERS", "2"))
+DEFAULT_CANCEL_GRACE = 10.0  # seconds a cancelled job gets to stop on its own before it is terminated
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    label TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    payload BLOB NOT NULL,
+    result BLOB,
+    error TEXT,
+    pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+"""
+
+_STATUS_COLUMNS = "id, target, label, status, progress, message, error, created_at, started_at, finished_at"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _resolve(target):
+    # Targets are "package.module:function" so spawned workers can import them
+    module, _, name = target.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+def _run_job(db_path, job_id):
+    # Entry point of every worker process. terminate() raises JobCancelled here, so the job's
+    # finally blocks still run (shutting its pool down, unlinking shared memory); a second
+    # SIGTERM is ignored so that cleanup is not interrupted halfway.
+    def cancelled(signum, frame):
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        raise JobCancelled(job_id)
+
+    signal.signal(signal.SIGTERM, cancelled)
+    with closing(_connect(db_path)) as conn:
+        _execute_job(conn, job_id)
+
+
+def _execute_job(conn, job_id):
+    row = conn.execute("SELECT target, payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    args, kwargs = pickle.loads(row["payload"])
+    last_write = [0.0]
+
+    def progress(done, total=None, message=None):
+        # Throttle progress writes and give running jobs a cooperative cancellation point
+        now = time.monotonic()
+        if now - last_write[0] < 0.25 and (total is None or done < total):
+            return
+        last_write[0] = now
+        fraction = done / total if total else float(done)
+        conn.execute("UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?",
+                     (min(max(fraction, 0.0), 1.0), message, job_id))
+        status = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()["status"]
+        if status == CANCELLED:
+            raise JobCancelled(job_id)
+
+    try:
+        result = _resolve(row["target"])(*args, progress=progress, **kwargs)
+    except JobCancelled:
+        return
+    except Exception:
+        conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                     (FAILED, traceback.format_exc(), time.time(), job_id, RUNNING))
+        return
+    conn.execute("UPDATE jobs SET status = ?, progress = 1, result = ?, finished_at = ? WHERE id = ? AND status = ?",
+                 (DONE, pickle.dumps(result), time.time(), job_id, RUNNING))
+
+
+class JobQueue:
+    """Persistent job table in SQLite with a dispatcher that runs each job in its own process.
+
+    Job targets are called as target(*args, progress=callback, **kwargs), where
+    callback(done, total=None, message=None) records progress and raises on cancellation.
+    A cancelled job that has not stopped after `cancel_grace` seconds is terminated (raising
+    JobCancelled inside it), and killed outright after twice that.
+    """
+
+    def __init__(self, directory=DEFAULT_JOB_DIR, max_workers=DEFAULT_MAX_WORKERS, poll_interval=0.5,
+                 cancel_grace=DEFAULT_CANCEL_GRACE):
+        self.directory = directory
+        self.db_path = os.path.join(directory, "jobs.db")
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.cancel_grace = cancel_grace
+        self._processes = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def path_for(self, name):
+        # Scratch location for job inputs (e.g. uploaded files) next to the job table
+        uploads = os.path.join(self.directory, "uploads")
+        os.makedirs(uploads, exist_ok=True)
+        return os.path.join(uploads, f"{uuid.uuid4().hex}_{os.path.basename(name)}")
+
+    @contextmanager
+    def _connect(self):
+        with closing(_connect(self.db_path)) as conn:
+            yield conn
+
+    def submit(self, target, *args, label=None, **kwargs):
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute("INSERT INTO jobs (id, target, label, status, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                         (job_id, target, label, QUEUED, pickle.dumps((args, kwargs)), time.time()))
+        return job_id
+
+    def status(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def jobs(self, limit=50, statuses=None):
+        query = f"SELECT {_STATUS_COLUMNS} FROM jobs"
+        params = []
+        if statuses:
+            query += f" WHERE status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query, (*params, limit))]
+
+    def cancel(self, job_id):
+        # Queued jobs never start; running ones stop at their next progress call or are terminated.
+        # finished_at records when the cancel was asked for, which starts the grace period.
+        with self._connect() as conn:
+            updated = conn.execute(
+                f"UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status IN ('{QUEUED}', '{RUNNING}')",
+                (CANCELLED, time.time(), job_id)).rowcount
+        return bool(updated)
+
+    def result(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT status, result, error FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        if row["status"] == FAILED:
+            raise RuntimeError(f"Job {job_id} failed:\n{row['error']}")
+        if row["status"] != DONE:
+            raise RuntimeError(f"Job {job_id} is {row['status']}")
+        return pickle.loads(row["result"])
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._recover()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, terminate=False):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if terminate:
+            for process in self._processes.values():
+                process.terminate()
+        for process in self._processes.values():
+            process.join()
+        self._processes.clear()
+
+    def _recover(self):
+        # Jobs left "running" by a previous server whose worker is gone go back on the queue
+        with self._connect() as conn:
+            for row in conn.execute("SELECT id, pid FROM jobs WHERE status = ?", (RUNNING,)).fetchall():
+                if row["id"] not in self._processes and not _pid_alive(row["pid"]):
+                    conn.execute("UPDATE jobs SET status = ?, pid = NULL, started_at = NULL WHERE id = ? AND status = ?",
+                                 (QUEUED, row["id"], RUNNING))
+
+    def _dispatch_loop(self):
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(self.poll_interval)
+
+    def run_pending(self):
+        """One dispatcher step: reap finished workers, enforce cancellations, start queued jobs."""
+        with self._connect() as conn:
+            for job_id, process in list(self._processes.items()):
+                row = conn.execute("SELECT status, finished_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                if row["status"] == CANCELLED and process.is_alive():
+                    waited = time.time() - row["finished_at"]
+                    if waited >= 2 * self.cancel_grace:
+                        process.kill()
+                    elif waited >= self.cancel_grace:
+                        process.terminate()
+                if not process.is_alive():
+                    process.join()
+                    del self._processes[job_id]
+                    # A worker that died without recording an outcome (e.g. killed or out of memory)
+                    conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                                 (FAILED, f"Worker exited with code {process.exitcode}", time.time(), job_id, RUNNING))
+
+            while len(self._processes) < self.max_workers:
+                # Claim atomically so several app processes can share one job table
+                row = conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = ? WHERE id = "
+                    "(SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1) AND status = ? RETURNING id",
+                    (RUNNING, time.time(), QUEUED, QUEUED)).fetchone()
+                if row is None:
+                    break
+                process = self._context.Process(target=_run_job, args=(self.db_path, row["id"]),
+                                                name=f"job-{row['id'][:8]}")
+                process.start()
+                self._processes[row["id"]] = process
+                conn.execute("UPDATE jobs SET pid = ? WHERE id = ?", (process.pid, row["id"]))
@@ -0,0 +1,395 @@
+import zlib
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from maintenance.simulation import simulate_degradation
+
+MODEL_NAMES = ["Linear Regression", "Random Forest", "Neural Network", "Support Vector Machine"]
+FEATURE_NAMES = ["mean", "std", "min", "max", "last", "slope", "elapsed"]
+DEFAULT_WINDOW = 16
+PREDICT_BATCH = 65536
+FEATURE_CHUNK = 65536  # windows summarised per pass in window_features
+MAX_TRAINING_ROWS = 200_000  # windows make_rul_dataset keeps from one series by default
+DATASET_VERSION = 2  # bumped when make_rul_dataset's features or labels change, so stored models are refitted
+
+
+def window_features(values, window=DEFAULT_WINDOW, elapsed=None):
+    """Summarise trailing windows along the last axis into FEATURE_NAMES columns.
+
+    values of shape (..., n) yields features of shape (..., n - window + 1, len(FEATURE_NAMES)).
+    Windows are summarised FEATURE_CHUNK at a time, so the (windows, window) temporaries stay
+    bounded however long the series is; only the feature table itself grows with n.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_out = values.shape[-1] - window + 1
+    if n_out < 1:
+        raise ValueError(f"Need at least {window} samples per series to build window features, got {values.shape[-1]}")
+    out_shape = values.shape[:-1] + (n_out,)
+    if elapsed is None:
+        elapsed = np.broadcast_to(np.arange(window - 1, values.shape[-1], dtype=np.float64), out_shape)
+    else:
+        elapsed = np.broadcast_to(np.asarray(elapsed, dtype=np.float64)[..., window - 1:], out_shape)
+    centered = np.arange(window) - (window - 1) / 2
+
+    features = np.empty(out_shape + (len(FEATURE_NAMES),))
+    step = max(1, FEATURE_CHUNK // max(1, int(np.prod(values.shape[:-1]))))
+    for start in range(0, n_out, step):
+        stop = min(start + step, n_out)
+        windows = sliding_window_view(values[..., start:stop + window - 1], window, axis=-1)
+        chunk = features[..., start:stop, :]
+        chunk[..., 0] = windows.mean(axis=-1)
+        chunk[..., 1] = windows.std(axis=-1)
+        chunk[..., 2] = windows.min(axis=-1)
+        chunk[..., 3] = windows.max(axis=-1)
+        chunk[..., 4] = windows[..., -1]
+        chunk[..., 5] = windows @ centered / (centered @ centered)
+        chunk[..., 6] = elapsed[..., start:stop]
+    return features
+
+
+def make_rul_dataset(timestamp, value, window=DEFAULT_WINDOW, failure_time=None, max_rows=MAX_TRAINING_ROWS):
+    """A run-to-failure series as (X, y): every window end is labelled with the time left until failure.
+
+    Without a `failure_time` the series is self-labelled, assumed to fail at its last sample.
+    Within one run the label is failure_time - t exactly, so the elapsed column would hand
+    any model the answer; it is left out (zero) and the RUL has to come from the readings.
+
+    Series with more than `max_rows` windows (None: no limit) are subsampled to window ends
+    spread evenly over the whole life, always keeping the latest one, and only those windows
+    are gathered, so memory follows max_rows rather than the length of the stored history.
+    """
+    timestamp = np.asarray(timestamp, dtype=np.float64)
+    if len(timestamp) < window:
+        raise ValueError(f"Need at least {window} samples to build RUL features, got {len(timestamp)}")
+    failure_time = timestamp[-1] if failure_time is None else failure_time
+    n_windows = len(timestamp) - window + 1
+    if max_rows is None or n_windows <= max_rows:
+        X = window_features(value, window, elapsed=np.zeros(len(timestamp)))
+        return X, failure_time - timestamp[window - 1:]
+    ends = window - 1 + np.linspace(0, n_windows - 1, max_rows).round().astype(np.int64)
+    windows = np.asarray(value, dtype=np.float64)[ends[:, None] + np.arange(1 - window, 1)]
+    X = window_features(windows, window, elapsed=np.zeros(windows.shape))[:, -1]
+    return X, failure_time - timestamp[ends]
+
+
+def simulated_rul_dataset(n_units=64, n_steps=200, window=DEFAULT_WINDOW, seed=None):
+    # Synthetic fleet from simulate_degradation, keeping only samples before each unit's failure
+    time = np.linspace(0, 350, n_steps)
+    ruls, _, health = simulate_degradation(n_units, time, seed=seed)
+    X = window_features(health, window, elapsed=time)
+    y = ruls[:, None] - time[window - 1:][None, :]
+    alive = y >= 0
+    return X[alive], y[alive].astype(np.float64)
+
+
+def rul_training_data(store, part, sensor, window=DEFAULT_WINDOW):
+    # Prefer uploaded history for the part/sensor; otherwise fall back to a reproducible simulated fleet
+    if store is not None and sensor in store.channels(part):
+        timestamp, value = store.read(part, sensor)
+        if len(timestamp) >= window:
+            X, y = make_rul_dataset(timestamp, value, window)
+            return X, y, "uploaded"
+    X, y = simulated_rul_dataset(window=window, seed=zlib.crc32(f"{part}/{sensor}".encode()))
+    return X, y, "simulated"
+
+
+def fit_with_holdout(model_name, X, y, holdout=0.2, **params):
+    # Fit on the leading rows and score on the trailing ones; returns (model, holdout RMSE)
+    split = int(len(X) * (1 - holdout))
+    model = make_model(model_name, **params).fit(X[:split], y[:split])
+    residual = model.predict(X[split:]) - y[split:]
+    return model, float(np.sqrt(np.mean(residual ** 2)))
+
+
+class _Standardizer:
+    def fit(self, X):
+        self.mean_ = X.mean(axis=0)
+        self.scale_ = X.std(axis=0)
+        self.scale_[self.scale_ == 0] = 1.0
+        return self
+
+    def transform(self, X):
+        return (X - self.mean_) / self.scale_
+
+
+class _BatchedPredictMixin:
+    def predict(self, X, batch_size=PREDICT_BATCH):
+        X = np.asarray(X, dtype=np.float64)
+        out = np.empty(len(X))
+        for start in range(0, len(X), batch_size):
+            out[start:start + batch_size] = self._predict_batch(X[start:start + batch_size])
+        return out
+
+
+class LinearRULModel(_BatchedPredictMixin):
+    """Ridge regression solved from chunk-accumulated normal equations."""
+
+    def __init__(self, alpha=1e-6, chunk_rows=262144):
+        self.alpha = alpha
+        self.chunk_rows = chunk_rows
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.scaler_ = _Standardizer().fit(X)
+        n_features = X.shape[1] + 1
+        gram = np.zeros((n_features, n_features))
+        moment = np.zeros(n_features)
+        # X^T X and X^T y are summed chunk by chunk so the design matrix is never copied whole
+        for start in range(0, len(X), self.chunk_rows):
+            block = self.scaler_.transform(X[start:start + self.chunk_rows])
+            block = np.hstack([block, np.ones((len(block), 1))])
+            gram += block.T @ block
+            moment += block.T @ y[start:start + self.chunk_rows]
+        ridge = self.alpha * len(X) * np.eye(n_features)
+        ridge[-1, -1] = 0.0  # the intercept is not penalised
+        solution = np.linalg.solve(gram + ridge, moment)
+        self.coef_, self.intercept_ = solution[:-1], solution[-1]
+        return self
+
+    def _predict_batch(self, X):
+        return self.scaler_.transform(X) @ self.coef_ + self.intercept_
+
+
+class RandomForestRULModel(_BatchedPredictMixin):
+    """Bagged histogram regression trees grown level by level with bincount split search."""
+
+    def __init__(self, n_estimators=20, max_depth=8, min_samples_leaf=20, n_bins=64,
+                 max_features=0.6, max_samples=100_000, seed=None):
+        self.n_estimators = n_estimators
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.n_bins = n_bins
+        self.max_features = max_features
+        self.max_samples = max_samples
+        self.seed = seed
+
+    def _bin(self, X):
+        binned = np.empty(X.shape, dtype=np.uint8)
+        for j, edges in enumerate(self.bin_edges_):
+            binned[:, j] = np.searchsorted(edges, X[:, j], side="right")
+        return binned
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        rng = np.random.default_rng(self.seed)
+
+        # Quantile bin edges computed once on a sample; trees then only see small integer codes
+        sample = X[rng.choice(len(X), size=min(len(X), 100_000), replace=False)]
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        self.bin_edges_ = [np.unique(np.quantile(sample[:, j], quantiles)) for j in range(X.shape[1])]
+        binned = self._bin(X)
+
+        n_rows = min(len(X), self.max_samples)
+        self.trees_ = [self._grow_tree(binned[idx], y[idx], rng)
+                       for idx in (rng.integers(0, len(X), size=n_rows) for _ in range(self.n_estimators))]
+        return self
+
+    def _grow_tree(self, binned, y, rng):
+        n, n_features = binned.shape
+        n_bins = self.n_bins
+        feature, threshold, left, right, value = [-1], [0], [-1], [-1], [y.mean()]
+        node = np.zeros(n, dtype=np.intp)
+        frontier = np.array([0])
+        feature_offsets = np.arange(n_features)
+
+        for _ in range(self.max_depth):
+            local = np.full(len(feature), -1)
+            local[frontier] = np.arange(len(frontier))
+            slot = local[node]
+            active = slot >= 0
+            if not active.any():
+                break
+            slot, codes, targets = slot[active], binned[active], y[active]
+
+            # Histogram of counts and target sums for every (node, feature, bin) in two bincounts
+            flat = ((slot[:, None] * n_features + feature_offsets) * n_bins + codes).ravel()
+            size = len(frontier) * n_features * n_bins
+            counts = np.bincount(flat, minlength=size).reshape(len(frontier), n_features, n_bins)
+            sums = np.bincount(flat, weights=np.repeat(targets, n_features), minlength=size)
+            sums = sums.reshape(counts.shape)
+
+            count_left = np.cumsum(counts, axis=2)
+            sum_left = np.cumsum(sums, axis=2)
+            count_right = count_left[:, :, -1:] - count_left
+            sum_right = sum_left[:, :, -1:] - sum_left
+            with np.errstate(divide="ignore", invalid="ignore"):
+                gain = sum_left ** 2 / count_left + sum_right ** 2 / count_right - sum_left[:, :, -1:] ** 2 / count_left[:, :, -1:]
+            valid = (count_left >= self.min_samples_leaf) & (count_right >= self.min_samples_leaf)
+            considered = rng.random((len(frontier), n_features)) < self.max_features
+            considered[np.arange(len(frontier)), rng.integers(0, n_features, len(frontier))] = True
+            gain = np.where(valid & considered[:, :, None], gain, -np.inf)
+
+            best = gain.reshape(len(frontier), -1).argmax(axis=1)
+            best_gain = gain.reshape(len(frontier), -1)[np.arange(len(frontier)), best]
+            best_feature, best_bin = np.divmod(best, n_bins)
+
+            children = []
+            split_feature = np.full(len(frontier), -1)
+            split_bin = np.zeros(len(frontier), dtype=np.intp)
+            for k, parent in enumerate(frontier):
+                if not best_gain[k] > 1e-12:
+                    continue
+                f, b = best_feature[k], best_bin[k]
+                feature[parent], threshold[parent] = int(f), int(b)
+                for child_count, child_sum in ((count_left[k, f, b], sum_left[k, f, b]),
+                                               (count_right[k, f, b], sum_right[k, f, b])):
+                    feature.append(-1)
+                    threshold.append(0)
+                    left.append(-1)
+                    right.append(-1)
+                    value.append(child_sum / child_count)
+                    children.append(len(feature) - 1)
+                left[parent], right[parent] = len(feature) - 2, len(feature) - 1
+                split_feature[k], split_bin[k] = f, b
+            if not children:
+                break
+
+            # Route the active samples of split nodes to their children
+            left_arr, right_arr = np.array(left), np.array(right)
+            moving = split_feature[slot] >= 0
+            idx = np.flatnonzero(active)[moving]
+            parents = node[idx]
+            goes_left = codes[moving, split_feature[slot[moving]]] <= split_bin[slot[moving]]
+            node[idx] = np.where(goes_left, left_arr[parents], right_arr[parents])
+            frontier = np.array(children)
+
+        return (np.array(feature), np.array(threshold), np.array(left), np.array(right), np.array(value))
+
+    def _predict_batch(self, X):
+        binned = self._bin(X)
+        rows = np.arange(len(binned))
+        total = np.zeros(len(binned))
+        for feature, threshold, left, right, value in self.trees_:
+            node = np.zeros(len(binned), dtype=np.intp)
+            for _ in range(self.max_depth):
+                f = feature[node]
+                internal = f >= 0
+                if not internal.any():
+                    break
+                goes_left = binned[rows, np.maximum(f, 0)] <= threshold[node]
+                node = np.where(internal, np.where(goes_left, left[node], right[node]), node)
+            total += value[node]
+        return total / len(self.trees_)
+
+
+class _AdamRegressor(_BatchedPredictMixin):
+    # Shared mini-batch Adam loop over standardized features and targets
+
+    def __init__(self, epochs, batch_size, learning_rate, seed):
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.seed = seed
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        rng = np.random.default_rng(self.seed)
+        self.scaler_ = _Standardizer().fit(X)
+        self.y_mean_, self.y_scale_ = y.mean(), y.std() or 1.0
+        params = self._init_params(X.shape[1], rng)
+        moments = [(np.zeros_like(p), np.zeros_like(p)) for p in params]
+        beta1, beta2, step = 0.9, 0.999, 0
+
+        for _ in range(self.epochs):
+            order = rng.permutation(len(X))
+            for start in range(0, len(X), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                xb = self.scaler_.transform(X[batch])
+                yb = (y[batch] - self.y_mean_) / self.y_scale_
+                grads = self._gradients(params, xb, yb)
+                step += 1
+                for p, g, (m, v) in zip(params, grads, moments):
+                    m *= beta1
+                    m += (1 - beta1) * g
+                    v *= beta2
+                    v += (1 - beta2) * g * g
+                    p -= self.learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + 1e-8)
+        self.params_ = params
+        return self
+
+    def _predict_batch(self, X):
+        return self._forward(self.params_, self.scaler_.transform(X)) * self.y_scale_ + self.y_mean_
+
+
+class NeuralNetworkRULModel(_AdamRegressor):
+    """Two-hidden-layer ReLU MLP trained on squared error."""
+
+    def __init__(self, hidden=(64, 32), epochs=5, batch_size=1024, learning_rate=1e-3, seed=None):
+        super().__init__(epochs, batch_size, learning_rate, seed)
+        self.hidden = hidden
+
+    def _init_params(self, n_features, rng):
+        sizes = [n_features, *self.hidden, 1]
+        params = []
+        for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+            params.append(rng.normal(0, np.sqrt(2 / fan_in), size=(fan_in, fan_out)))
+            params.append(np.zeros(fan_out))
+        return params
+
+    def _forward(self, params, X, keep=False):
+        activations = [X]
+        out = X
+        for i in range(0, len(params), 2):
+            out = out @ params[i] + params[i + 1]
+            if i < len(params) - 2:
+                out = np.maximum(out, 0)
+            activations.append(out)
+        return activations if keep else out[:, 0]
+
+    def _gradients(self, params, X, y):
+        activations = self._forward(params, X, keep=True)
+        delta = (activations[-1][:, 0] - y)[:, None] * (2 / len(y))
+        grads = [None] * len(params)
+        for i in range(len(params) - 2, -1, -2):
+            grads[i] = activations[i // 2].T @ delta
+            grads[i + 1] = delta.sum(axis=0)
+            if i:
+                delta = (delta @ params[i].T) * (activations[i // 2] > 0)
+        return grads
+
+
+class SupportVectorRULModel(_AdamRegressor):
+    """Epsilon-insensitive SVR on random Fourier features approximating an RBF kernel."""
+
+    def __init__(self, n_components=128, gamma=0.5, epsilon=0.05, C=10.0, epochs=3, batch_size=2048,
+                 learning_rate=1e-2, seed=None):
+        super().__init__(epochs, batch_size, learning_rate, seed)
+        self.n_components = n_components
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.C = C
+
+    def _init_params(self, n_features, rng):
+        self.projection_ = rng.normal(0, np.sqrt(2 * self.gamma), size=(n_features, self.n_components))
+        self.offset_ = rng.uniform(0, 2 * np.pi, size=self.n_components)
+        return [np.zeros(self.n_components), np.zeros(1)]
+
+    def _features(self, X):
+        return np.sqrt(2 / self.n_components) * np.cos(X @ self.projection_ + self.offset_)
+
+    def _forward(self, params, X):
+        return self._features(X) @ params[0] + params[1][0]
+
+    def _gradients(self, params, X, y):
+        phi = self._features(X)
+        residual = phi @ params[0] + params[1][0] - y
+        # Subgradient of C * mean(max(0, |r| - eps)) + 0.5 * ||w||^2 / n
+        slope = np.sign(residual) * (np.abs(residual) > self.epsilon) * (self.C / len(y))
+        return [phi.T @ slope + params[0] / len(y), np.array([slope.sum()])]
+
+
+MODEL_CLASSES = dict(zip(MODEL_NAMES, [LinearRULModel, RandomForestRULModel, NeuralNetworkRULModel,
+                                       SupportVectorRULModel]))
+
+
+def make_model(name, **params):
+    try:
+        model_class = MODEL_CLASSES[name]
+    except KeyError:
+        raise ValueError(f"Unknown model {name!r}; expected one of {MODEL_NAMES}") from None
+    # Outside the try: a KeyError raised by a constructor is a bug, not an unknown model name
+    return model_class(**params)
@@ -0,0 +1,128 @@
+import heapq
+import threading
+
+
+class RULRanking:
+    """Indexed min-heap of part instances ordered by predicted RUL.
+
+    Inserting, updating or removing an instance is O(log n); top_k(k) walks only the
+    k smallest heap entries, so it costs O(k log k) regardless of fleet size.
+    """
+
+    def __init__(self):
+        self._heap = []  # [rul, key] pairs
+        self._position = {}  # key -> index in _heap
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, key):
+        return key in self._position
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._position[heap[i][1]] = i
+        self._position[heap[j][1]] = j
+
+    def _sift_up(self, i):
+        heap = self._heap
+        while i:
+            parent = (i - 1) // 2
+            if heap[parent][0] <= heap[i][0]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        heap = self._heap
+        n = len(heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and heap[child][0] < heap[smallest][0]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+    def _update(self, key, rul):
+        i = self._position.get(key)
+        if i is None:
+            self._heap.append([rul, key])
+            self._position[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+        old = self._heap[i][0]
+        self._heap[i][0] = rul
+        if rul < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def update(self, machine, part, rul):
+        # Insert a new part instance or move an existing one to its latest predicted RUL
+        with self._lock:
+            self._update((machine, part), float(rul))
+
+    def stream_listener(self, machine):
+        """StreamHub listener keeping `machine`'s parts ranked by their live RUL estimate.
+
+        A part reset by the hub (rul None, e.g. a replaced unit) leaves the ranking until its
+        new unit has an estimate, so the failed unit's near-zero RUL is not kept.
+        """
+        def listener(part, rul):
+            if rul is None:
+                self.remove(machine, part)
+            else:
+                self.update(machine, part, rul)
+        return listener
+
+    def update_many(self, records):
+        # records: iterable of (machine, part, rul); one lock acquisition for the whole batch
+        with self._lock:
+            for machine, part, rul in records:
+                self._update((machine, part), float(rul))
+
+    def remove(self, machine, part):
+        with self._lock:
+            i = self._position.pop((machine, part), None)
+            if i is None:
+                return False
+            last = self._heap.pop()
+            if i < len(self._heap):
+                self._heap[i] = last
+                self._position[last[1]] = i
+                self._sift_up(i)
+                self._sift_down(self._position[last[1]])
+            return True
+
+    def get(self, machine, part):
+        with self._lock:
+            i = self._position.get((machine, part))
+            return None if i is None else self._heap[i][0]
+
+    def most_critical(self):
+        with self._lock:
+            if not self._heap:
+                return None
+            rul, (machine, part) = self._heap[0]
+            return machine, part, rul
+
+    def top_k(self, k=10):
+        """Return the k part instances with the shortest RUL as (machine, part, rul), most critical first."""
+        with self._lock:
+            heap = self._heap
+            result = []
+            frontier = [(heap[0][0], 0)] if heap else []
+            # Best-first walk of the heap: only children of already-emitted nodes can be next
+            while frontier and len(result) < k:
+                rul, i = heapq.heappop(frontier)
+                machine, part = heap[i][1]
+                result.append((machine, part, rul))
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child][0], child))
+            return result
@@ -0,0 +1,264 @@
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from maintenance import models
+from maintenance.store import _safe_name
+
+DEFAULT_REGISTRY_DIR = os.environ.get("MAINTENANCE_MODEL_DIR", "models")
+DEFAULT_CACHE_ENTRIES = 64
+MANIFEST_NAME = "model.json"
+WEIGHTS_NAME = "weights.bin"
+ALIGNMENT = 64  # byte alignment of every array in the weights file
+
+
+def _flatten(value, arrays):
+    # Fitted state -> JSON-able tree; arrays are replaced by their index in `arrays`
+    if isinstance(value, np.ndarray):
+        arrays.append(np.ascontiguousarray(value))
+        return {"array": len(arrays) - 1}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return {"list" if isinstance(value, list) else "tuple": [_flatten(item, arrays) for item in value]}
+    if isinstance(value, dict):
+        return {"dict": {key: _flatten(item, arrays) for key, item in value.items()}}
+    if hasattr(value, "__dict__"):
+        return {"object": type(value).__name__, "state": _flatten(vars(value), arrays)}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"cannot store model attribute of type {type(value).__name__}")
+
+
+def _restore(node, arrays):
+    if not isinstance(node, dict):
+        return node
+    if "array" in node:
+        return arrays[node["array"]]
+    if "list" in node:
+        return [_restore(item, arrays) for item in node["list"]]
+    if "tuple" in node:
+        return tuple(_restore(item, arrays) for item in node["tuple"])
+    if "dict" in node:
+        return {key: _restore(item, arrays) for key, item in node["dict"].items()}
+    # Only classes defined in maintenance.models are ever rebuilt, never arbitrary imports
+    instance = object.__new__(getattr(models, node["object"]))
+    vars(instance).update(_restore(node["state"], arrays))
+    return instance
+
+
+def write_model(directory, model, metadata=None):
+    """Write a fitted model to `directory` as model.json plus one weights file.
+
+    Every array attribute lands 64-byte aligned in weights.bin, so read_model() can map the
+    file once and hand out zero-copy views instead of reading or unpickling anything.
+    """
+    arrays = []
+    tree = _flatten(model, arrays)
+    layout, offset = [], 0
+    for array in arrays:
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        layout.append({"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)})
+        offset += array.nbytes
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, WEIGHTS_NAME), "wb") as f:
+        for array, entry in zip(arrays, layout):
+            f.seek(entry["offset"])
+            f.write(array.tobytes())
+        f.truncate(offset)
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as f:
+        json.dump({"model": tree, "arrays": layout, "metadata": metadata or {}}, f, indent=1)
+
+
+def read_model(directory):
+    """Inverse of write_model: returns (model, metadata) with weights as read-only memory-mapped views."""
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    path = os.path.join(directory, WEIGHTS_NAME)
+    # np.memmap refuses empty files, which is what a model without array attributes writes
+    weights = np.memmap(path, mode="r") if os.path.getsize(path) else np.empty(0, dtype=np.uint8)
+    arrays = []
+    for entry in manifest["arrays"]:
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        view = weights[entry["offset"]:entry["offset"] + count * dtype.itemsize]
+        arrays.append(np.ndarray(entry["shape"], dtype, buffer=view))
+    return _restore(manifest["model"], arrays), manifest["metadata"]
+
+
+class ModelCache:
+    """Thread-safe LRU of loaded models, bounded by entry count, with hit-rate and load-time counters."""
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.loads = 0
+        self.load_seconds = 0.0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, load_seconds=None):
+        with self._lock:
+            if load_seconds is not None:
+                self.loads += 1
+                self.load_seconds += load_seconds
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, prefix=()):
+        # Drop every entry whose key starts with `prefix` (everything by default)
+        with self._lock:
+            stale = [key for key in self._entries if key[:len(prefix)] == prefix]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "loads": self.loads,
+                "mean_load_ms": 1000 * self.load_seconds / self.loads if self.loads else 0.0,
+            }
+
+
+class ModelRegistry:
+    """Versioned model artifacts on disk, keyed by part x sensor x model type.
+
+    Layout: <root>/<part>/<sensor>/<model>/v<N>/{model.json, weights.bin}. A version is written
+    to a scratch directory and renamed into place, so readers never see half an artifact and
+    concurrent writers simply take the next free number. Loaded models are kept warm in a
+    ModelCache shared by everything holding this registry (one per server process).
+    """
+
+    def __init__(self, root=DEFAULT_REGISTRY_DIR, cache_entries=DEFAULT_CACHE_ENTRIES):
+        self.root = root
+        self.cache = ModelCache(cache_entries)
+        os.makedirs(root, exist_ok=True)
+
+    def _model_dir(self, part, sensor, model_name):
+        return os.path.join(self.root, _safe_name(part), _safe_name(sensor), _safe_name(model_name))
+
+    def versions(self, part, sensor, model_name):
+        try:
+            names = os.listdir(self._model_dir(part, sensor, model_name))
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[1:]) for name in names if name.startswith("v") and name[1:].isdigit())
+
+    def save(self, part, sensor, model_name, model, metadata=None):
+        """Store a fitted model as the next version; returns the version number."""
+        directory = self._model_dir(part, sensor, model_name)
+        os.makedirs(directory, exist_ok=True)
+        metadata = {**(metadata or {}), "model_name": model_name, "created_at": time.time()}
+        scratch = os.path.join(directory, f".tmp-{os.getpid()}-{threading.get_ident()}")
+        try:
+            write_model(scratch, model, metadata)
+            while True:
+                version = max(self.versions(part, sensor, model_name), default=0) + 1
+                try:
+                    # rename() of a directory fails when the target exists: another writer won this number
+                    os.rename(scratch, os.path.join(directory, f"v{version}"))
+                    return version
+                except OSError:
+                    if not os.path.isdir(os.path.join(directory, f"v{version}")):
+                        raise
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    def metadata(self, part, sensor, model_name, version):
+        with open(os.path.join(self._model_dir(part, sensor, model_name), f"v{version}", MANIFEST_NAME)) as f:
+            return json.load(f)["metadata"]
+
+    def load(self, part, sensor, model_name, version=None):
+        """(model, metadata) for a version (latest by default), from the warm cache when possible.
+
+        Raises KeyError when no such version exists.
+        """
+        if version is None:
+            version = max(self.versions(part, sensor, model_name), default=None)
+            if version is None:
+                raise KeyError(f"no stored {model_name} model for {part} / {sensor}")
+        key = (part, sensor, model_name, version)
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self._read(part, sensor, model_name, version)
+            self.cache.put(key, cached[0:2], cached[2])
+        return cached[0:2]
+
+    def _read(self, part, sensor, model_name, version):
+        # (model, metadata, seconds spent mapping it) straight from disk
+        directory = os.path.join(self._model_dir(part, sensor, model_name), f"v{version}")
+        if not os.path.isdir(directory):
+            raise KeyError(f"no version {version} of the {model_name} model for {part} / {sensor}")
+        start = time.perf_counter()
+        model, metadata = read_model(directory)
+        return model, metadata, time.perf_counter() - start
+
+    def find(self, part, sensor, model_name, **match):
+        # Newest version whose metadata has every `match` item, or None
+        for version in reversed(self.versions(part, sensor, model_name)):
+            metadata = self.metadata(part, sensor, model_name, version)
+            if all(metadata.get(name) == value for name, value in match.items()):
+                return version
+        return None
+
+    def get_or_fit(self, part, sensor, model_name, fit, **match):
+        """Warm model matching `match` (e.g. the training data it was fitted on), else fit and store one.
+
+        `fit()` returns (model, metadata); `match` is merged into the stored metadata. Lookups
+        for a key already fitted in this process are a single LRU hit, without touching the disk.
+        Returns (model, metadata) where metadata includes the artifact "version".
+        """
+        key = (part, sensor, model_name, tuple(sorted(match.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        version = self.find(part, sensor, model_name, **match)
+        if version is None:
+            model, metadata = fit()
+            metadata = {**metadata, **match}
+            version = self.save(part, sensor, model_name, model, metadata)
+            # Serve the in-memory model rather than re-mapping what was just written
+            loaded, seconds = (model, {**metadata, "version": version}), None
+        else:
+            model, metadata, seconds = self._read(part, sensor, model_name, version)
+            loaded = model, {**metadata, "version": version}
+        self.cache.put(key, loaded, seconds)
+        return loaded
+
+    def delete(self, part, sensor=None, model_name=None):
+        # Remove stored versions (all of a part's, a sensor's, or one model type's) and their warm entries
+        path = self.root
+        for name in (part, sensor, model_name):
+            if name is None:
+                break
+            path = os.path.join(path, _safe_name(name))
+        shutil.rmtree(path, ignore_errors=True)
+        return self.cache.invalidate(tuple(name for name in (part, sensor, model_name) if name is not None))
@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+
+
+def _size_of(value):
+    # Encoded bytes report len(); raw RGBA buffers are arrays with nbytes
+    return value.nbytes if hasattr(value, "nbytes") else len(value)
+
+
+class RenderCache:
+    """Process-wide LRU of rendered charts bounded by total encoded size."""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(part, seed, fingerprint=None, **options):
+        # Figure options are sorted so keyword order never produces a different key
+        return (part, seed, fingerprint, tuple(sorted(options.items())))
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = _size_of(value)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= _size_of(old)
+            self._entries[key] = value
+            self.current_bytes += size
+
+            # Evict least recently used charts until the byte budget is met
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= _size_of(evicted)
+                self.evictions += 1
+
+    def get_or_render(self, key, render):
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, part=None):
+        # Drop every cached chart for a part (or everything), e.g. after new sensor data is uploaded
+        with self._lock:
+            stale = [key for key in self._entries if part is None or key[0] == part]
+            for key in stale:
+                self.current_bytes -= _size_of(self._entries.pop(key))
+            return len(stale)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
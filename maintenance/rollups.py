@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Rollup tiers as (name, bucket width in seconds), finest first; each width divides the next
+TIERS = (("1s", 1.0), ("1min", 60.0), ("1h", 3600.0), ("1day", 86400.0))
+ROLLUP_COLUMNS = 5  # bucket start, count, sum, min, max
+
+
+@dataclass
+class RollupResult:
+    time: np.ndarray  # bucket start times
+    count: np.ndarray
+    mean: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    tier: str  # tier the query was answered from ("raw" when no tier was coarse enough)
+    resolution: float  # bucket width of the returned rows, in seconds
+    scanned_rows: int  # stored rows read to answer the query
+
+    def __len__(self):
+        return len(self.time)
+
+
+def aggregate(time, count, total, low, high, width):
+    """Group time-sorted records into `width`-second buckets.
+
+    Records are raw samples (count 1, total = low = high = value) or finer rollup rows, so
+    every tier is built from the one below it. Returns ((buckets, ROLLUP_COLUMNS) array,
+    index of the first record of each bucket).
+    """
+    time = np.asarray(time, dtype=np.float64)
+    if not len(time):
+        return np.empty((0, ROLLUP_COLUMNS)), np.empty(0, dtype=np.int64)
+    key = np.floor(time / width)
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    count = np.broadcast_to(np.asarray(count, dtype=np.float64), time.shape)
+    rows = np.column_stack([
+        key[starts] * width,
+        np.add.reduceat(count, starts),
+        np.add.reduceat(np.asarray(total, dtype=np.float64), starts),
+        np.minimum.reduceat(np.asarray(low, dtype=np.float64), starts),
+        np.maximum.reduceat(np.asarray(high, dtype=np.float64), starts),
+    ])
+    return rows, starts
+
+
+def plan_tier(resolution, available=None):
+    """Coarsest tier whose bucket width is at most `resolution` seconds (None: use raw samples)."""
+    chosen = None
+    for name, width in TIERS:
+        if width <= resolution and (available is None or name in available):
+            chosen = (name, width)
+    return chosen
+
+
+def to_result(rows, tier, resolution, scanned_rows):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = rows[:, 2] / rows[:, 1]
+    return RollupResult(rows[:, 0], rows[:, 1], mean, rows[:, 3], rows[:, 4], tier, resolution, scanned_rows)
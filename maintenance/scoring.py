@@ -0,0 +1,278 @@
+import fnmatch
+import functools
+import multiprocessing
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
+
+from maintenance.features import VIBRATION_SENSORS, sensor_health_indicator
+from maintenance.fitting import fit_degradation_curves
+from maintenance.ingest import ingest_sensor_file
+from maintenance.models import (
+    DEFAULT_WINDOW, FEATURE_NAMES, fit_with_holdout, rul_training_data, simulated_rul_dataset, window_features,
+)
+
+DEFAULT_MODEL = "Linear Regression"
+DEFAULT_PATTERNS = ("*.csv", "*.txt")
+STAGES = ("parse", "features", "model", "health")
+
+# Output columns in order, with their dtypes; one row per scored file x channel. predicted_rul and
+# holdout_rmse come from the simulated-fleet model (fleet_rul_model), in the fleet's time units.
+COLUMNS = {
+    "machine": str, "part": str, "channel": str, "rows": np.int64, "t_start": np.float64, "t_end": np.float64,
+    "predicted_rul": np.float64, "holdout_rmse": np.float64, "health": np.float64,
+    "health_rul": np.float64, "health_rul_lo": np.float64, "health_rul_hi": np.float64,
+}
+
+
+class StageTimer:
+    """Accumulates wall-clock seconds per named stage."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+
+def fit_latest_rul(X, y, model_name=DEFAULT_MODEL):
+    # Fit on a run-to-failure dataset and predict the RUL at its latest window; returns (model, rul, holdout RMSE)
+    model, holdout_rmse = fit_with_holdout(model_name, X, y)
+    return model, float(model.predict(X[-1:])[0]), holdout_rmse
+
+
+def stored_rul(store, part, sensor, model_name=DEFAULT_MODEL):
+    """RUL model for a stored part/sensor (simulated fleet when nothing is stored), as the RUL tab shows it.
+
+    Returns (model, latest RUL, hold-out RMSE, "uploaded" | "simulated").
+    """
+    X, y, source = rul_training_data(store, part, sensor)
+    model, latest_rul, holdout_rmse = fit_latest_rul(X, y, model_name)
+    return model, latest_rul, holdout_rmse, source
+
+
+@functools.lru_cache(maxsize=None)
+def fleet_rul_model(model_name=DEFAULT_MODEL):
+    """RUL model for scoring files, fitted once per process on the simulated run-to-failure fleet.
+
+    Scored files carry no failure times, so a model fitted on a file's own windows would only
+    learn its length. The elapsed column is left out (zero): a file's clock says nothing about
+    the part's age, so wear is read from the health indicator alone. Returns (model, hold-out RMSE).
+    """
+    X, y = simulated_rul_dataset(seed=0)
+    X[:, FEATURE_NAMES.index("elapsed")] = 0.0
+    return fit_with_holdout(model_name, X, y)
+
+
+def indicator_rul(health, model_name=DEFAULT_MODEL):
+    # fleet_rul_model's RUL at the latest window of a health indicator; NaN when it has too few frames
+    model, holdout_rmse = fleet_rul_model(model_name)
+    if len(health) < DEFAULT_WINDOW:
+        return np.nan, holdout_rmse
+    if health[-1] <= 0:
+        # At the failure level there is no life left; the fleet has no post-failure windows to learn that from
+        return 0.0, holdout_rmse
+    X = window_features(health[-DEFAULT_WINDOW:], DEFAULT_WINDOW, elapsed=np.zeros(DEFAULT_WINDOW))
+    return max(float(model.predict(X)[0]), 0.0), holdout_rmse
+
+
+def stored_health_indicator(store, part):
+    # (time, health) from the part's first stored vibration/acceleration channel, or None
+    for sensor in VIBRATION_SENSORS:
+        if sensor in store.channels(part):
+            timestamp, value = store.read(part, sensor)
+            try:
+                return sensor_health_indicator(timestamp, value)
+            except ValueError:
+                return None
+    return None
+
+
+def health_rul(timestamp, value):
+    """Latest health and the remaining life from a degradation-curve fit of a vibration series.
+
+    Returns (health, rul, rul_lo, rul_hi), with remaining life counted from the last sample;
+    NaNs when the series is too short to frame or fit, and NaN remaining life when the fit
+    leaves the RUL undetermined (typically a part observed long before it wears out).
+    """
+    try:
+        time_axis, health = sensor_health_indicator(timestamp, value)
+    except ValueError:
+        return (np.nan,) * 4
+    return _curve_rul(timestamp, time_axis, health)
+
+
+def _curve_rul(timestamp, time_axis, health):
+    # health_rul from an already computed health indicator
+    if len(health) < 3:
+        return (np.nan,) * 4
+    elapsed = time_axis - timestamp[0]
+    fit = fit_degradation_curves(elapsed, health)
+    if not fit.determined[0]:
+        return float(health[-1]), np.nan, np.nan, np.nan
+    now = timestamp[-1] - timestamp[0]
+    lo, hi = fit.rul_ci[0]
+    return float(health[-1]), *(max(float(t) - now, 0.0) for t in (fit.rul[0], lo, hi))
+
+
+def score_series(machine, part, channel, timestamp, value, model_name=DEFAULT_MODEL, timer=None):
+    """Score one channel of one part: a dict with a value for every COLUMNS entry.
+
+    Only vibration channels are scored: both RULs are read from their health indicator, one
+    by the simulated-fleet model and one by a degradation-curve fit of the indicator itself.
+    """
+    timer = timer or StageTimer()
+    row = {"machine": machine, "part": part, "channel": channel, "rows": len(timestamp),
+           "t_start": float(timestamp[0]) if len(timestamp) else np.nan,
+           "t_end": float(timestamp[-1]) if len(timestamp) else np.nan}
+    row.update({name: np.nan for name in COLUMNS if name not in row})
+    if channel not in VIBRATION_SENSORS or len(timestamp) < DEFAULT_WINDOW:
+        return row
+    with timer.stage("features"):
+        try:
+            time_axis, health = sensor_health_indicator(timestamp, value)
+        except ValueError:
+            return row
+    with timer.stage("model"):
+        row["predicted_rul"], row["holdout_rmse"] = indicator_rul(health, model_name)
+    with timer.stage("health"):
+        row["health"], row["health_rul"], row["health_rul_lo"], row["health_rul_hi"] = _curve_rul(
+            timestamp, time_axis, health)
+    return row
+
+
+def identify(path, root):
+    # <root>/<machine>/<part>.csv -> (machine, part); files directly under root have no machine
+    relative = os.path.relpath(path, root)
+    machine = os.path.dirname(relative).replace(os.sep, "/")
+    return machine, os.path.splitext(os.path.basename(relative))[0]
+
+
+def score_file(path, root, model_name=DEFAULT_MODEL):
+    """Parse one sensor file and score each of its channels; returns (rows, stage seconds, samples)."""
+    timer = StageTimer()
+    machine, part = identify(path, root)
+    with timer.stage("parse"), open(path, "rb") as f:
+        columns, stats = ingest_sensor_file(f)
+    rows = []
+    for code, channel in enumerate(stats.channels):
+        mask = columns.channel == code
+        timestamp, value = columns.timestamp[mask], columns.value[mask]
+        if np.any(timestamp[1:] < timestamp[:-1]):
+            order = np.argsort(timestamp, kind="stable")
+            timestamp, value = timestamp[order], value[order]
+        rows.append(score_series(machine, part, channel, timestamp, value, model_name, timer))
+    return rows, dict(timer.seconds), stats.rows
+
+
+def find_sensor_files(root, patterns=DEFAULT_PATTERNS):
+    paths = []
+    for directory, _, names in os.walk(root):
+        paths += [os.path.join(directory, name) for name in names
+                  if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+    return sorted(paths)
+
+
+@dataclass
+class ScoreReport:
+    columns: dict  # column name -> array, in COLUMNS order
+    stage_seconds: dict  # summed over every file (task time, not wall time)
+    files: int
+    samples: int
+    wall_seconds: float
+    workers: int
+
+    @property
+    def rows_per_s(self):
+        # Input samples scored per second of wall time
+        return self.samples / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def _collect(rows):
+    return {name: np.array([row[name] for row in rows], dtype=dtype) for name, dtype in COLUMNS.items()}
+
+
+def score_directory(root, model_name=DEFAULT_MODEL, max_workers=None, patterns=DEFAULT_PATTERNS, progress=None):
+    """Score every sensor file under `root` across a process pool, one file per task.
+
+    `progress(done, total)` is called as files complete. Returns a ScoreReport.
+    """
+    paths = find_sensor_files(root, patterns)
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(paths) or 1))
+    start = time.perf_counter()
+    results = []
+    if max_workers == 1:
+        for path in paths:
+            results.append(score_file(path, root, model_name))
+            if progress is not None:
+                progress(len(results), len(paths))
+    else:
+        # spawn keeps workers free of whatever the parent process has imported
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers, mp_context=context) as pool:
+            futures = [pool.submit(score_file, path, root, model_name) for path in paths]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if progress is not None:
+                    progress(len(results), len(paths))
+    wall_seconds = time.perf_counter() - start
+
+    rows = sorted((row for file_rows, _, _ in results for row in file_rows),
+                  key=lambda row: (row["machine"], row["part"], row["channel"]))
+    stage_seconds = {name: sum(seconds.get(name, 0.0) for _, seconds, _ in results) for name in STAGES}
+    samples = sum(count for _, _, count in results)
+    return ScoreReport(_collect(rows), stage_seconds, len(paths), samples, wall_seconds, max_workers)
+
+
+def write_columns(path, columns):
+    """Write columns to `path`: Parquet when the name ends in .parquet (needs pyarrow), else NumPy .npz."""
+    if path.endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        pq.write_table(pa.table(columns), path)
+    else:
+        np.savez(path, **columns)
+
+
+def main(argv=None):
+    # Headless entry point: python -m maintenance.scoring DIRECTORY [--output scores.npz]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a directory of sensor files without the Streamlit app")
+    parser.add_argument("directory", help="sensor files laid out as <machine>/<part>.csv (or <part>.csv)")
+    parser.add_argument("--output", default="scores.npz", help="columnar output (.npz, or .parquet with pyarrow)")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--pattern", action="append", help="file name pattern (default: *.csv and *.txt)")
+    args = parser.parse_args(argv)
+
+    def report(done, total):
+        print(f"\rscored {done}/{total} files", end="", file=sys.stderr)
+
+    result = score_directory(args.directory, args.model, args.workers, tuple(args.pattern or DEFAULT_PATTERNS),
+                             progress=report)
+    print(file=sys.stderr)
+    write_columns(args.output, result.columns)
+    print(f"{result.files} files, {result.samples:,} samples, {len(result.columns['part'])} channels scored "
+          f"in {result.wall_seconds:.2f} s on {result.workers} worker(s) ({result.rows_per_s:,.0f} rows/s) "
+          f"-> {args.output}")
+    total = sum(result.stage_seconds.values())
+    for name in STAGES:
+        seconds = result.stage_seconds[name]
+        print(f"  {name:<9} {seconds:8.2f} s  {seconds / total if total else 0:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
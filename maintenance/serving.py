@@ -0,0 +1,413 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from maintenance.catalog import PART_TYPES, SENSOR_TYPES
+from maintenance.models import DEFAULT_WINDOW, rul_training_data, window_features
+from maintenance.registry import ModelCache
+from maintenance.scoring import DEFAULT_MODEL, fit_latest_rul
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_WINDOW = 0.002  # seconds a batch stays open for more requests after the first arrives
+DEFAULT_MAX_BATCH = 256
+MAX_BODY = 1 << 20
+DEFAULT_MAX_MODELS = 16  # fitted (part, sensor) models RULService keeps warm
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+class RULService:
+    """RUL models per catalog (part, sensor), fitted on first use, with vectorized batch prediction.
+
+    Models train on the part's stored history when a SensorStore is given and on the
+    simulated fleet otherwise, exactly as in the RUL tab. At most `max_models` stay warm
+    (least recently used first out). Intervals are normal prediction intervals from the
+    hold-out RMSE.
+    """
+
+    def __init__(self, store=None, model_name=DEFAULT_MODEL, confidence=0.95, max_models=DEFAULT_MAX_MODELS):
+        self.store = store
+        self.model_name = model_name
+        self.confidence = confidence
+        self._z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self._models = ModelCache(max_models)
+        self._fitting = {}  # (part, sensor) -> executor future of the fit in flight
+
+    def model(self, part, sensor):
+        """(model, hold-out RMSE, training source) for a part and sensor, fitting it here on a cache miss."""
+        if part not in PART_TYPES or sensor not in SENSOR_TYPES:
+            raise ValueError(f"unknown part or sensor: {part!r}, {sensor!r}")
+        fitted = self._models.get((part, sensor))
+        if fitted is None:
+            start = time.perf_counter()
+            X, y, source = rul_training_data(self.store, part, sensor)
+            model, _, holdout_rmse = fit_latest_rul(X, y, self.model_name)
+            fitted = model, holdout_rmse, source
+            self._models.put((part, sensor), fitted, time.perf_counter() - start)
+        return fitted
+
+    async def load(self, part, sensor):
+        """model() without blocking the event loop: misses are fitted in the default executor,
+        once per (part, sensor) however many requests are waiting for it."""
+        key = (part, sensor)
+        fitted = self._models.get(key)
+        if fitted is not None:
+            return fitted
+        future = self._fitting.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(None, self.model, part, sensor)
+            self._fitting[key] = future
+            future.add_done_callback(lambda _: self._fitting.pop(key, None))
+        # Shielded, so one cancelled request doesn't cancel the fit the others are waiting for
+        return await asyncio.shield(future)
+
+    def predict(self, part, sensor, windows, elapsed, fitted=None):
+        """RUL for a (batch, DEFAULT_WINDOW) array of trailing readings; returns (rul, lo, hi) arrays.
+
+        `fitted` is a result of load() or model(); by default the model is looked up (or fitted) here.
+        """
+        model, holdout_rmse, source = fitted or self.model(part, sensor)
+        if source == "uploaded":
+            # Fitted on one self-labelled run, where make_rul_dataset leaves the elapsed column out
+            elapsed = np.zeros(len(windows))
+        elapsed = np.broadcast_to(np.asarray(elapsed, dtype=np.float64)[:, None], windows.shape)
+        X = window_features(windows, DEFAULT_WINDOW, elapsed=elapsed)[:, -1]
+        rul = np.maximum(model.predict(X), 0.0)
+        margin = self._z * holdout_rmse
+        return rul, np.maximum(rul - margin, 0.0), rul + margin
+
+
+class MicroBatcher:
+    """Coalesces concurrent predictions into one vectorized call per (part, sensor).
+
+    The first request of a batch opens a `window`-second timer; the batch is predicted when
+    the timer fires or `max_batch` requests are waiting, whichever comes first. Runs on the
+    event loop thread, so predictions never overlap; a model that still has to be fitted is
+    loaded off the loop before its request joins a batch.
+    """
+
+    def __init__(self, service, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.service = service
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, part, sensor, values, elapsed):
+        fitted = await self.service.load(part, sensor)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((part, sensor, values, elapsed, fitted, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+        self.items += len(pending)
+        self.largest = max(self.largest, len(pending))
+
+        groups = {}
+        for item in pending:
+            groups.setdefault(item[:2], []).append(item)
+        for (part, sensor), items in groups.items():
+            try:
+                windows = np.array([item[2] for item in items], dtype=np.float64)
+                elapsed = np.array([item[3] for item in items], dtype=np.float64)
+                rul, lo, hi = self.service.predict(part, sensor, windows, elapsed, items[0][4])
+            except Exception as e:
+                for item in items:
+                    if not item[5].done():
+                        item[5].set_exception(e)
+                continue
+            for item, values in zip(items, zip(rul.tolist(), lo.tolist(), hi.tolist())):
+                if not item[5].done():
+                    item[5].set_result(values)
+
+    def stats(self):
+        return {"requests": self.items, "batches": self.batches, "largest_batch": self.largest,
+                "mean_batch": self.items / self.batches if self.batches else 0.0}
+
+
+def _parse_window(payload):
+    # JSON body -> (part, sensor, trailing window, elapsed time of its last reading)
+    try:
+        part, sensor, values = str(payload["part"]), str(payload["sensor"]), payload["values"]
+        values = [float(v) for v in values[-DEFAULT_WINDOW:]]
+        elapsed = float(payload.get("elapsed", len(payload["values"]) - 1))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"expected {{'part', 'sensor', 'values'[, 'elapsed']}}: {e}") from None
+    # Only catalog parts and sensors have models; anything else would just grow the model cache
+    if part not in PART_TYPES:
+        raise ValueError(f"unknown part {part!r}; expected one of {', '.join(PART_TYPES)}")
+    if sensor not in SENSOR_TYPES:
+        raise ValueError(f"unknown sensor {sensor!r}; expected one of {', '.join(SENSOR_TYPES)}")
+    if len(values) < DEFAULT_WINDOW:
+        raise ValueError(f"need at least {DEFAULT_WINDOW} values, got {len(values)}")
+    # json.loads accepts NaN and Infinity, which would only come back out as a non-finite RUL
+    if not np.isfinite(values).all() or not np.isfinite(elapsed):
+        raise ValueError("values and elapsed must be finite numbers")
+    return part, sensor, values, elapsed
+
+
+async def _read_request(reader):
+    # Minimal HTTP/1.1 request reader; returns None when the client closed the connection.
+    # Raises RequestTooLarge for an oversized body and ValueError for anything malformed.
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise ValueError(f"malformed request line: {line[:80]!r}") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise ValueError(f"invalid Content-Length: {headers['content-length']!r}") from None
+    if length < 0:
+        raise ValueError(f"invalid Content-Length: {length}")
+    if length > MAX_BODY:
+        raise RequestTooLarge(f"request body too large ({length} > {MAX_BODY} bytes)")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def _response(status, payload, keep_alive=True):
+    body = json.dumps(payload, allow_nan=False).encode()
+    head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+class ScoringServer:
+    """asyncio HTTP/1.1 front end (keep-alive, JSON) for a MicroBatcher.
+
+    POST /predict  {"part", "sensor", "values": [...], "elapsed"?} -> {"rul", "rul_lo", "rul_hi", "confidence"}
+    GET /stats     batching counters;  GET /health  liveness
+    """
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    async def route(self, method, path, body):
+        if path == "/predict":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                part, sensor, values, elapsed = _parse_window(json.loads(body or b"null"))
+            except (ValueError, TypeError) as e:
+                return 400, {"error": str(e)}
+            rul, lo, hi = await self.batcher.submit(part, sensor, values, elapsed)
+            return 200, {"part": part, "sensor": sensor, "rul": rul, "rul_lo": lo, "rul_hi": hi,
+                         "confidence": self.batcher.service.confidence}
+        if path == "/stats":
+            return 200, self.batcher.stats()
+        if path == "/health":
+            return 200, {"status": "ok"}
+        return 404, {"error": f"no route for {path}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                # The connection is closed after either error: the rest of the stream can't be framed
+                try:
+                    request = await _read_request(reader)
+                except RequestTooLarge as e:
+                    writer.write(_response(413, {"error": str(e)}, keep_alive=False))
+                    break
+                except ValueError as e:
+                    writer.write(_response(400, {"error": str(e)}, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                try:
+                    status, payload = await self.route(method, path, body)
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    response = _response(status, payload, keep_alive)
+                except ValueError:
+                    # Strict JSON has no NaN or Infinity; never send a body clients can't parse
+                    response = _response(500, {"error": "prediction is not a finite number"}, keep_alive)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+
+@dataclass
+class LoadReport:
+    latencies: np.ndarray  # seconds per request
+    seconds: float
+    errors: int
+    server_stats: dict
+
+    @property
+    def throughput(self):
+        return len(self.latencies) / self.seconds if self.seconds else 0.0
+
+    def percentile(self, q):
+        return float(np.percentile(self.latencies, q)) if len(self.latencies) else float("nan")
+
+
+def make_load_requests(n=4096, parts=("Pump", "Bearing"), sensors=("Vibration",), seed=0):
+    # Encoded POST /predict bodies cut from simulated run-to-failure curves
+    from maintenance.simulation import simulate_degradation
+
+    rng = np.random.default_rng(seed)
+    time_axis = np.linspace(0, 350, 200)
+    _, _, health = simulate_degradation(64, time_axis, seed=rng)
+    bodies = []
+    for _ in range(n):
+        unit, end = rng.integers(len(health)), rng.integers(DEFAULT_WINDOW, len(time_axis))
+        bodies.append(json.dumps({"part": str(rng.choice(parts)), "sensor": str(rng.choice(sensors)),
+                                  "values": health[unit, end - DEFAULT_WINDOW:end].round(4).tolist(),
+                                  "elapsed": float(time_axis[end - 1])}).encode())
+    return bodies
+
+
+async def _call(reader, writer, host, method, path, body=b""):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    return status, await reader.readexactly(length)
+
+
+async def get_stats(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return json.loads((await _call(reader, writer, host, "GET", "/stats"))[1])
+    finally:
+        writer.close()
+
+
+async def run_load(host=DEFAULT_HOST, port=DEFAULT_PORT, concurrency=64, duration=5.0, bodies=None):
+    """Closed-loop load: `concurrency` keep-alive clients each send POST /predict back to back."""
+    bodies = bodies or make_load_requests()
+    before = await get_stats(host, port)
+    latencies, errors = [], [0]
+    deadline = time.perf_counter() + duration
+
+    async def client(offset):
+        reader, writer = await asyncio.open_connection(host, port)
+        i = offset
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                status, _ = await _call(reader, writer, host, "POST", "/predict", bodies[i % len(bodies)])
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors[0] += 1
+                i += concurrency
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    seconds = time.perf_counter() - start
+    after = await get_stats(host, port)
+    stats = {key: after[key] - before[key] for key in ("requests", "batches")}
+    stats["mean_batch"] = stats["requests"] / stats["batches"] if stats["batches"] else 0.0
+    return LoadReport(np.array(latencies), seconds, errors[0], stats)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH,
+                model_name=DEFAULT_MODEL, store=None, preload=()):
+    service = RULService(store, model_name)
+    for part, sensor in preload:
+        service.model(part, sensor)
+    server = await ScoringServer(MicroBatcher(service, batch_window, max_batch)).start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"listening on http://{address[0]}:{address[1]} (batch window {batch_window * 1000:g} ms, "
+          f"max batch {max_batch})", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    # python -m maintenance.serving serve [--port 8765]   |   python -m maintenance.serving load [--port 8765]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local RUL scoring service with micro-batching")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the HTTP scoring server")
+    load_parser = commands.add_parser("load", help="drive a running server with the built-in load generator")
+    for sub in (serve_parser, load_parser):
+        sub.add_argument("--host", default=DEFAULT_HOST)
+        sub.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW * 1000)
+    serve_parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    serve_parser.add_argument("--model", default=DEFAULT_MODEL)
+    serve_parser.add_argument("--store", help="SensorStore directory with uploaded history (default: simulated fleet)")
+    serve_parser.add_argument("--preload", action="append", default=[], metavar="PART/SENSOR",
+                              help="fit a model before accepting requests")
+    load_parser.add_argument("--concurrency", type=int, default=64)
+    load_parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        store = None
+        if args.store:
+            from maintenance.store import SensorStore
+
+            store = SensorStore(args.store)
+        preload = [tuple(item.split("/", 1)) for item in args.preload]
+        try:
+            asyncio.run(serve(args.host, args.port, args.batch_window_ms / 1000, args.max_batch, args.model,
+                              store, preload))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    report = asyncio.run(run_load(args.host, args.port, args.concurrency, args.duration))
+    print(f"{len(report.latencies):,} requests in {report.seconds:.1f} s: {report.throughput:,.0f} req/s, "
+          f"p50 {report.percentile(50) * 1000:.2f} ms, p99 {report.percentile(99) * 1000:.2f} ms, "
+          f"mean batch {report.server_stats['mean_batch']:.1f}, errors {report.errors}")
+
+
+if __name__ == "__main__":
+    main()
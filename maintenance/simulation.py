@@ -0,0 +1,34 @@
+import numpy as np
+
+
+def simulate_degradation(n_curves, time, rul_range=(250, 350), decay_range=(2, 5),
+                         noise_std=0.02, initial_health=1.0, seed=None, dtype=np.float64):
+    """Generate n_curves run-to-failure trajectories over `time` in one vectorized pass.
+
+    Returns (ruls, decay_rates, health) where health has shape (n_curves, len(time)).
+    `seed` may be an int, None or an np.random.Generator so workers can reproduce runs.
+    """
+    rng = np.random.default_rng(seed)
+    time = np.asarray(time, dtype=dtype)
+
+    # One draw per curve for RUL and decay rate, broadcast across the time axis
+    ruls = rng.integers(rul_range[0], rul_range[1], size=n_curves, endpoint=True)
+    decay_rates = rng.uniform(decay_range[0], decay_range[1], size=n_curves)
+
+    # health = initial * (1 - (t / rul) ** k) before the RUL, 0 after it
+    health = np.divide(time[None, :], ruls[:, None], dtype=dtype)
+    failed = health > 1
+    np.power(health, decay_rates[:, None].astype(dtype), out=health)
+    np.subtract(1, health, out=health)
+    health *= initial_health
+    health[failed] = 0
+
+    # Single noise draw for the whole batch, then clip to [0, 1] in place
+    if noise_std:
+        noise = rng.standard_normal(health.shape, dtype=dtype)
+        noise *= noise_std
+        health += noise
+        del noise
+    np.clip(health, 0, 1, out=health)
+
+    return ruls, decay_rates, health
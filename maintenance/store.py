@@ -0,0 +1,316 @@
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from maintenance.decimation import (BUCKET_COLUMNS, DEFAULT_POINTS, base_buckets, bucket_points, choose_level,
+                                    decimate, merge_buckets, minmax_buckets, pyramid_bucket_size)
+from maintenance.encoding import read_series, write_series
+from maintenance.rollups import ROLLUP_COLUMNS, TIERS, aggregate, plan_tier, to_result
+
+DEFAULT_STORE_DIR = os.environ.get("SENSOR_STORE_DIR", "sensor_store")
+MANIFEST_NAME = "manifest.json"
+COLUMNS = ("timestamp", "value")
+COLUMN_DTYPE = np.dtype("<f8")
+
+
+def _safe_name(name):
+    # Part and channel names become path components
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(name)).strip("._") or "_"
+
+
+class SensorStore:
+    """Columnar, memory-mapped sensor history: one fixed-dtype file per part x channel x column.
+
+    The manifest records how many rows of each column file are committed. Appends write the
+    column data first and only then atomically replace the manifest, so a crash mid-append
+    leaves extra trailing bytes that readers ignore and the next append truncates.
+
+    Each series also keeps a min/max decimation pyramid (see maintenance.decimation), extended
+    on append, so read_decimated() serves any zoom level from a bounded number of buckets,
+    and time-based rollup tiers (see maintenance.rollups) that query() plans against.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._maps = {}
+        os.makedirs(root, exist_ok=True)
+        self._manifest = self._load_manifest()
+
+    def _manifest_path(self):
+        return os.path.join(self.root, MANIFEST_NAME)
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": 1, "series": {}}
+
+    def _write_manifest(self):
+        # Write-then-rename so readers only ever see a complete manifest
+        path = self._manifest_path()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f, indent=1, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _column_path(self, part, channel, column):
+        return os.path.join(self.root, _safe_name(part), f"{_safe_name(channel)}.{column}.f8")
+
+    def _pyramid_path(self, part, channel, level):
+        return os.path.join(self.root, _safe_name(part), f"{_safe_name(channel)}.L{level}.f8")
+
+    def _rollup_path(self, part, channel, tier):
+        return os.path.join(self.root, _safe_name(part), f"{_safe_name(channel)}.R{tier}.f8")
+
+    def _append_file(self, path, committed, data):
+        with open(path, "ab") as f:
+            # Drop bytes left behind by an append that never reached the manifest (or a rollup bucket
+            # being rewritten). Windows refuses to shrink a mapped file, so the cached map is released first
+            if f.tell() != committed:
+                self._maps.pop(path, None)
+                f.truncate(committed)
+                f.seek(committed)
+            data.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _entry(self, part, channel):
+        return self._manifest["series"].get(part, {}).get(channel)
+
+    def parts(self):
+        return sorted(self._manifest["series"])
+
+    def channels(self, part):
+        return sorted(self._manifest["series"].get(part, {}))
+
+    def info(self, part, channel):
+        entry = self._entry(part, channel)
+        return dict(entry) if entry else None
+
+    def append(self, part, channel, timestamp, value):
+        """Append time-ordered samples to a part/channel series; returns the new row count."""
+        timestamp = np.ascontiguousarray(timestamp, dtype=COLUMN_DTYPE)
+        value = np.ascontiguousarray(value, dtype=COLUMN_DTYPE)
+        if timestamp.shape != value.shape or timestamp.ndim != 1:
+            raise ValueError("timestamp and value must be 1-D arrays of equal length")
+        if not len(timestamp):
+            entry = self._entry(part, channel)
+            return entry["rows"] if entry else 0
+
+        # Range scans rely on sorted timestamps, so each batch is ordered before it is written
+        if np.any(timestamp[1:] < timestamp[:-1]):
+            order = np.argsort(timestamp, kind="stable")
+            timestamp, value = timestamp[order], value[order]
+
+        with self._lock:
+            entry = self._entry(part, channel) or {"rows": 0, "t_min": None, "t_max": None}
+            if entry["rows"] and timestamp[0] < entry["t_max"]:
+                raise ValueError(
+                    f"{part}/{channel}: samples starting at {timestamp[0]} overlap stored history ending at {entry['t_max']}"
+                )
+
+            os.makedirs(os.path.join(self.root, _safe_name(part)), exist_ok=True)
+            committed = entry["rows"] * COLUMN_DTYPE.itemsize
+            for column, data in zip(COLUMNS, (timestamp, value)):
+                self._append_file(self._column_path(part, channel, column), committed, data)
+
+            rows = entry["rows"] + len(timestamp)
+            entry = {
+                "rows": rows,
+                "t_min": entry["t_min"] if entry["rows"] else float(timestamp[0]),
+                "t_max": float(timestamp[-1]),
+                "dtype": COLUMN_DTYPE.str,
+                "pyramid": self._extend_pyramid(part, channel, entry.get("pyramid", []), rows),
+                "rollups": self._extend_rollups(part, channel, entry.get("rollups", {}), rows),
+            }
+            self._manifest["series"].setdefault(part, {})[channel] = entry
+            self._write_manifest()
+            return entry["rows"]
+
+    def append_chunk(self, part, chunk, channel_names):
+        # Split an ingest.SensorChunk by channel code and append each channel's samples
+        for code, name in enumerate(channel_names):
+            mask = chunk.channel == code
+            if mask.any():
+                self.append(part, name, chunk.timestamp[mask], chunk.value[mask])
+
+    def _map(self, path, shape):
+        # Memmaps are reused until the committed row count changes
+        cached = self._maps.get(path)
+        if cached is None or cached.shape != shape:
+            cached = np.memmap(path, dtype=COLUMN_DTYPE, mode="r", shape=shape)
+            self._maps[path] = cached
+        return cached
+
+    def _column(self, part, channel, column, rows):
+        return self._map(self._column_path(part, channel, column), (rows,))
+
+    def _pyramid_level(self, part, channel, level, buckets):
+        return self._map(self._pyramid_path(part, channel, level), (buckets, BUCKET_COLUMNS))
+
+    def _extend_pyramid(self, part, channel, counts, rows):
+        # Summarise rows not yet covered by level 0, then cascade complete groups up the levels
+        counts = list(counts)
+        timestamp = self._column(part, channel, "timestamp", rows)
+        value = self._column(part, channel, "value", rows)
+        start = counts[0] * pyramid_bucket_size(0) if counts else 0
+        new = base_buckets(timestamp[start:], value[start:])
+        level = 0
+        while len(new):
+            if level == len(counts):
+                counts.append(0)
+            committed = counts[level] * BUCKET_COLUMNS * COLUMN_DTYPE.itemsize
+            self._append_file(self._pyramid_path(part, channel, level), committed, np.ascontiguousarray(new))
+            counts[level] += len(new)
+            merged = counts[level + 1] * (pyramid_bucket_size(level + 1) // pyramid_bucket_size(level)) \
+                if level + 1 < len(counts) else 0
+            new = merge_buckets(self._pyramid_level(part, channel, level, counts[level])[merged:])
+            level += 1
+        return counts
+
+    def _rollup_table(self, part, channel, tier, rows):
+        return self._map(self._rollup_path(part, channel, tier), (rows, ROLLUP_COLUMNS))
+
+    def _extend_rollups(self, part, channel, state, rows):
+        # Each tier re-aggregates its source from the start of its last (still open) bucket onward;
+        # the 1 s tier reads raw samples and every coarser tier reads the tier below it
+        state = {name: dict(tier) for name, tier in state.items()}
+        timestamp = self._column(part, channel, "timestamp", rows)
+        value = self._column(part, channel, "value", rows)
+        source = (timestamp, np.ones(1), value, value, value)
+        for name, width in TIERS:
+            tier = state.setdefault(name, {"rows": 0, "open": 0})
+            offset = tier["open"]
+            records = [column[offset:] if len(column) > 1 else column for column in source]
+            new, starts = aggregate(*records, width)
+            if not len(new):
+                break
+            kept = max(tier["rows"] - 1, 0)  # the previously open bucket is rewritten
+            self._append_file(self._rollup_path(part, channel, name),
+                              kept * ROLLUP_COLUMNS * COLUMN_DTYPE.itemsize, np.ascontiguousarray(new))
+            tier["rows"] = kept + len(new)
+            tier["open"] = offset + int(starts[-1])
+            table = self._rollup_table(part, channel, name, tier["rows"])
+            source = tuple(table[:, i] for i in range(ROLLUP_COLUMNS))
+        return state
+
+    def _row_range(self, timestamp, start, end):
+        lo = 0 if start is None else int(np.searchsorted(timestamp, start, side="left"))
+        hi = len(timestamp) if end is None else int(np.searchsorted(timestamp, end, side="left"))
+        return lo, hi
+
+    def read(self, part, channel, start=None, end=None):
+        """Return (timestamp, value) memmap views for start <= t < end without copying."""
+        entry = self._entry(part, channel)
+        if not entry or not entry["rows"]:
+            return np.empty(0, COLUMN_DTYPE), np.empty(0, COLUMN_DTYPE)
+
+        timestamp = self._column(part, channel, "timestamp", entry["rows"])
+        value = self._column(part, channel, "value", entry["rows"])
+        lo, hi = self._row_range(timestamp, start, end)
+        return timestamp[lo:hi], value[lo:hi]
+
+    def read_decimated(self, part, channel, start=None, end=None, n_out=DEFAULT_POINTS, method="minmax"):
+        """Return about n_out (timestamp, value) points for start <= t < end, preserving peaks.
+
+        The coarsest pyramid level with at least n_out / 2 buckets in range is used, so the work
+        is bounded by n_out and one bucket of raw samples at each edge, whatever the zoom.
+        """
+        entry = self._entry(part, channel)
+        if not entry or not entry["rows"]:
+            return np.empty(0, COLUMN_DTYPE), np.empty(0, COLUMN_DTYPE)
+
+        timestamp = self._column(part, channel, "timestamp", entry["rows"])
+        value = self._column(part, channel, "value", entry["rows"])
+        lo, hi = self._row_range(timestamp, start, end)
+        counts = entry.get("pyramid", [])
+        level = choose_level(hi - lo, n_out, len(counts))
+        size = pyramid_bucket_size(level) if level >= 0 else 0
+        first, last = (-(-lo // size), min(hi // size, counts[level])) if size else (0, 0)
+        if first >= last:
+            return decimate(timestamp[lo:hi], value[lo:hi], n_out, method)
+
+        # Partial buckets at either edge are summarised from raw samples at the same resolution
+        def edge(a, b):
+            if b <= a:
+                return np.empty((0, BUCKET_COLUMNS))
+            return minmax_buckets(timestamp[a:b], value[a:b], -(-(b - a) // size))
+
+        pieces = [edge(lo, first * size), self._pyramid_level(part, channel, level, counts[level])[first:last],
+                  edge(last * size, hi)]
+        points_t, points_v = bucket_points(np.concatenate(pieces))
+        return decimate(points_t, points_v, n_out, method)
+
+    def query(self, part, channel, start=None, end=None, resolution=None, max_points=None):
+        """Aggregate start <= t < end into buckets of `resolution` seconds (or ~max_points buckets).
+
+        The planner answers from the coarsest rollup tier whose bucket width fits the requested
+        resolution, re-aggregating its rows when the resolution is coarser still, and only falls
+        back to raw samples below 1 s. Tier buckets are whole: one that straddles `start` is
+        included entirely. Returns a maintenance.rollups.RollupResult.
+        """
+        entry = self._entry(part, channel)
+        if not entry or not entry["rows"]:
+            return to_result(np.empty((0, ROLLUP_COLUMNS)), "raw", resolution or 0.0, 0)
+        start = entry["t_min"] if start is None else start
+        end = np.nextafter(entry["t_max"], np.inf) if end is None else end
+        if resolution is None:
+            resolution = (end - start) / max_points if max_points else 0.0
+
+        plan = plan_tier(resolution, entry.get("rollups"))
+        if plan is None:
+            timestamp, value = self.read(part, channel, start, end)
+            if resolution > 0:
+                rows, _ = aggregate(timestamp, np.ones(1), value, value, value, resolution)
+            else:
+                rows = np.column_stack([timestamp, np.ones(len(value)), value, value, value])
+            return to_result(rows, "raw", resolution, len(timestamp))
+
+        name, width = plan
+        table = self._rollup_table(part, channel, name, entry["rollups"][name]["rows"])
+        bucket_start = table[:, 0]
+        lo = int(np.searchsorted(bucket_start, np.floor(start / width) * width, side="left"))
+        hi = int(np.searchsorted(bucket_start, end, side="left"))
+        rows = np.asarray(table[lo:hi])
+        if resolution > width:
+            rows, _ = aggregate(*(rows[:, i] for i in range(ROLLUP_COLUMNS)), resolution)
+        return to_result(rows, name, max(resolution, width), hi - lo)
+
+    def export_archive(self, part, channel, path, start=None, end=None, precision=None):
+        """Write start <= t < end of a series to a compressed archive file (see maintenance.encoding).
+
+        Lossless unless `precision` is given; returns the number of bytes written.
+        """
+        timestamp, value = self.read(part, channel, start, end)
+        return write_series(path, timestamp, value, precision)
+
+    def import_archive(self, part, channel, path):
+        # Append an archived series back into the store; returns the new row count
+        timestamp, value = read_series(path)
+        return self.append(part, channel, timestamp, value)
+
+    def delete(self, part, channel=None):
+        # Remove one channel (or every channel) of a part
+        with self._lock:
+            series = self._manifest["series"].get(part, {})
+            for name in [channel] if channel is not None else list(series):
+                entry = series.pop(name, None)
+                if entry is None:
+                    continue
+                paths = [self._column_path(part, name, column) for column in COLUMNS]
+                paths += [self._pyramid_path(part, name, level) for level in range(len(entry.get("pyramid", [])))]
+                paths += [self._rollup_path(part, name, tier) for tier in entry.get("rollups", {})]
+                for path in paths:
+                    self._maps.pop(path, None)
+                    if os.path.exists(path):
+                        os.remove(path)
+            if not series:
+                self._manifest["series"].pop(part, None)
+            self._write_manifest()
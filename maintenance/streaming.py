@@ -0,0 +1,322 @@
+import math
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from maintenance.simulation import simulate_degradation
+
+DEFAULT_WINDOW = 256
+DEFAULT_ALPHA = 0.05
+DEFAULT_HISTORY = 600  # (time, EWMA) points kept per series for the live trend chart
+FAILURE_THRESHOLD = 0.0  # health level treated as failure when extrapolating RUL
+
+
+class RollingStats:
+    """O(1)-per-sample rolling statistics over the last `window` readings of one sensor.
+
+    Mean and variance use Welford's update with an exact removal step for the sample that
+    leaves the ring buffer; min/max use monotonic deques; the EWMA and lifetime count are
+    kept alongside. A least-squares slope over the window drives the RUL extrapolation.
+    Every `window` samples the running sums are recomputed from the buffer to stop drift.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, alpha=DEFAULT_ALPHA):
+        if window < 2:
+            raise ValueError("window must hold at least 2 samples")
+        self.window = window
+        self.alpha = alpha
+        self.count = 0  # lifetime samples
+        self.ewma = None
+        self.last_time = None
+        self._values = [0.0] * window
+        self._times = [0.0] * window
+        self._size = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._sum_sq = 0.0
+        # Windowed sums of t, t^2 and t*v (t relative to the first sample, to limit cancellation)
+        self._t0 = None
+        self._sum_t = 0.0
+        self._sum_tt = 0.0
+        self._sum_tv = 0.0
+        self._min = deque()  # (sequence, value), increasing values
+        self._max = deque()  # (sequence, value), decreasing values
+
+    def push(self, timestamp, value):
+        value = float(value)
+        if self._t0 is None:
+            self._t0 = float(timestamp)
+        t = float(timestamp) - self._t0
+        slot = self.count % self.window
+        seq = self.count
+        self.count += 1
+        self.last_time = float(timestamp)
+        self.ewma = value if self.ewma is None else self.ewma + self.alpha * (value - self.ewma)
+
+        if self._size < self.window:
+            # Welford insertion
+            self._size += 1
+            delta = value - self._mean
+            self._mean += delta / self._size
+            self._m2 += delta * (value - self._mean)
+        else:
+            # Replace the oldest sample: combined Welford removal + insertion at constant n
+            old, old_t = self._values[slot], self._times[slot]
+            old_mean = self._mean
+            self._mean += (value - old) / self._size
+            self._m2 += (value - old) * (value - self._mean + old - old_mean)
+            self._sum_sq -= old * old
+            self._sum_t -= old_t
+            self._sum_tt -= old_t * old_t
+            self._sum_tv -= old_t * old
+        self._values[slot], self._times[slot] = value, t
+        self._sum_sq += value * value
+        self._sum_t += t
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+
+        # Monotonic deques: drop dominated entries at the back, expired ones at the front
+        expired = seq - self.window
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        while self._min[0][0] <= expired:
+            self._min.popleft()
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+        while self._max[0][0] <= expired:
+            self._max.popleft()
+        if self.count % self.window == 0:
+            self._resync()
+
+    def _resync(self):
+        # Recompute the windowed sums from the full ring buffer, once per `window` samples (so still
+        # O(1) amortized): rounding from the running updates cannot pile up over a long-lived feed.
+        # Times are rebased to the oldest sample, keeping the t and t * v sums small.
+        shift = self._times[self.count % self.window]
+        self._t0 += shift
+        times = self._times = [t - shift for t in self._times]
+        values = self._values
+        self._mean = sum(values) / self._size
+        self._m2 = sum((v - self._mean) ** 2 for v in values)
+        self._sum_sq = sum(v * v for v in values)
+        self._sum_t = sum(times)
+        self._sum_tt = sum(t * t for t in times)
+        self._sum_tv = sum(t * v for t, v in zip(times, values))
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def mean(self):
+        return self._mean if self._size else math.nan
+
+    @property
+    def variance(self):
+        # Sample variance over the window; the clamp absorbs rounding after many replacements
+        return max(self._m2, 0.0) / (self._size - 1) if self._size > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self._size > 1 else math.nan
+
+    @property
+    def rms(self):
+        return math.sqrt(max(self._sum_sq, 0.0) / self._size) if self._size else math.nan
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else math.nan
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else math.nan
+
+    @property
+    def slope(self):
+        # Least-squares slope of value against time over the window
+        n = self._size
+        if n < 2:
+            return math.nan
+        denominator = n * self._sum_tt - self._sum_t ** 2
+        if denominator <= 0:
+            return math.nan
+        return n * (self._sum_tv - self._sum_t * self._mean) / denominator
+
+    def rul(self, threshold=FAILURE_THRESHOLD):
+        """Time until the EWMA reaches `threshold` at the current windowed slope (None if not degrading)."""
+        slope = self.slope
+        if self._size < self.window or not slope < 0:
+            return None
+        return max((self.ewma - threshold) / -slope, 0.0)
+
+    def snapshot(self):
+        return {"count": self.count, "time": self.last_time, "mean": self.mean, "std": self.std,
+                "min": self.min, "max": self.max, "rms": self.rms, "ewma": self.ewma, "rul": self.rul()}
+
+
+class StreamHub:
+    """Rolling statistics for every part x sensor series, updated as live readings arrive.
+
+    Listeners registered with subscribe(fn) are called as fn(part, rul) whenever a part's
+    estimated RUL (the minimum over its sensors) changes, e.g. to update a RULRanking, and
+    as fn(part, None) when reset() forgets the part's estimate.
+    """
+
+    def __init__(self, parts, sensors, window=DEFAULT_WINDOW, alpha=DEFAULT_ALPHA, history=DEFAULT_HISTORY):
+        self.parts = list(parts)
+        self.sensors = list(sensors)
+        self._stats = {(part, sensor): RollingStats(window, alpha) for part in self.parts for sensor in self.sensors}
+        self._history = {key: deque(maxlen=history) for key in self._stats}
+        self._rul = {}  # (part, sensor) -> latest RUL estimate
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+        return listener
+
+    def reset(self, part=None):
+        # Forget a replaced part's readings (or every part's) so old wear does not skew the new unit;
+        # listeners hear fn(part, None), so nothing keeps ranking the old unit by its last estimate
+        parts = self.parts if part is None else [part]
+        with self._lock:
+            for key, stats in self._stats.items():
+                if key[0] in parts:
+                    self._stats[key] = RollingStats(stats.window, stats.alpha)
+                    self._history[key].clear()
+                    self._rul.pop(key, None)
+        for part in parts:
+            for listener in self._listeners:
+                listener(part, None)
+
+    def _push(self, part, sensor, timestamp, value):
+        stats = self._stats[(part, sensor)]
+        stats.push(timestamp, value)
+        self._history[(part, sensor)].append((stats.last_time, stats.ewma))
+        rul = stats.rul()
+        if rul is None:
+            return None
+        self._rul[(part, sensor)] = rul
+        return part
+
+    def push(self, part, sensor, timestamp, value):
+        with self._lock:
+            changed = self._push(part, sensor, timestamp, value)
+        if changed is not None:
+            self._notify({changed})
+
+    def push_many(self, records):
+        # records: iterable of (part, sensor, timestamp, value); listeners fire once per changed part
+        changed = set()
+        with self._lock:
+            for part, sensor, timestamp, value in records:
+                part = self._push(part, sensor, timestamp, value)
+                if part is not None:
+                    changed.add(part)
+        self._notify(changed)
+
+    def _notify(self, parts):
+        for part in parts:
+            rul = self.part_rul(part)
+            if rul is not None:
+                for listener in self._listeners:
+                    listener(part, rul)
+
+    def part_rul(self, part):
+        # The part fails when its most degraded sensor does
+        with self._lock:
+            estimates = [self._rul[(part, sensor)] for sensor in self.sensors if (part, sensor) in self._rul]
+        return min(estimates) if estimates else None
+
+    def stats(self, part, sensor):
+        with self._lock:
+            return self._stats[(part, sensor)].snapshot()
+
+    def has_data(self, part, sensor=None):
+        sensors = self.sensors if sensor is None else [sensor]
+        return any(self._stats[(part, name)].count for name in sensors)
+
+    def trend(self, part, sensor):
+        """Recent (time, EWMA) points of one series as two arrays, oldest first."""
+        with self._lock:
+            points = list(self._history[(part, sensor)])
+        if not points:
+            return np.empty(0), np.empty(0)
+        times, values = np.array(points).T
+        return times, values
+
+
+class SimulatedFeed:
+    """Local stand-in for a live feed: replays simulated run-to-failure curves into a StreamHub.
+
+    Every tick pushes one reading per part x sensor and advances simulated time by `time_step`.
+    When any of a part's series reaches failure, that part alone is replaced: its series are
+    resimulated from a fresh unit and its hub statistics reset, while other parts carry on.
+    """
+
+    def __init__(self, hub, interval=0.1, time_step=1.0, horizon=400, noise_std=0.02, seed=None):
+        self.hub = hub
+        self.interval = interval
+        self.time_step = time_step
+        self.horizon = horizon
+        self.noise_std = noise_std
+        self._rng = np.random.default_rng(seed)
+        self._keys = [(part, sensor) for part in hub.parts for sensor in hub.sensors]
+        self._rows = {part: np.array([i for i, key in enumerate(self._keys) if key[0] == part]) for part in hub.parts}
+        self._time_axis = np.arange(0, self.horizon, self.time_step)
+        self._curves = np.empty((len(self._keys), len(self._time_axis)))
+        self._ruls = np.empty(len(self._keys))
+        self._steps = np.zeros(len(self._keys), dtype=np.int64)
+        self._clock = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._new_curves(np.arange(len(self._keys)))
+
+    def _new_curves(self, rows):
+        # Fresh simulated units for the given series, starting from their first reading
+        ruls, _, self._curves[rows] = simulate_degradation(len(rows), self._time_axis, noise_std=self.noise_std,
+                                                           seed=self._rng)
+        self._ruls[rows] = ruls
+        self._steps[rows] = 0
+
+    def tick(self):
+        # One reading per series; returns the number of readings pushed
+        last = len(self._time_axis) - 1
+        failed = (self._steps > last) | (self._time_axis[np.minimum(self._steps, last)] > self._ruls)
+        for part, rows in self._rows.items():
+            if failed[rows].any():
+                self.hub.reset(part)
+                self._new_curves(rows)
+        values = self._curves[np.arange(len(self._keys)), self._steps]
+        self.hub.push_many((part, sensor, self._clock, value) for (part, sensor), value in zip(self._keys, values))
+        self._steps += 1
+        self._clock += self.time_step
+        return len(values)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="simulated-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.tick()
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0.0))
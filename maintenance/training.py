@@ -0,0 +1,374 @@
+import inspect
+import itertools
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from maintenance.ingest import ingest_sensor_file
+from maintenance.models import MODEL_CLASSES, MODEL_NAMES, make_model, make_rul_dataset
+
+TARGET_COLUMNS = ("rul", "target", "remaining_useful_life")
+
+# Candidate hyperparameters per model family; every combination is cross-validated
+DEFAULT_SEARCH_SPACE = {
+    "Linear Regression": {"alpha": [1e-6, 1e-3, 1e-1]},
+    "Random Forest": {"n_estimators": [10, 20], "max_depth": [6, 10]},
+    "Neural Network": {"hidden": [(32,), (64, 32)], "learning_rate": [1e-3, 3e-3]},
+    "Support Vector Machine": {"gamma": [0.1, 0.5], "C": [1.0, 10.0]},
+}
+
+# Random-search distributions per model family: ("log", lo, hi) | ("int", lo, hi) | ("choice", options)
+DEFAULT_DISTRIBUTIONS = {
+    "Linear Regression": {"alpha": ("log", 1e-8, 1.0)},
+    "Random Forest": {"n_estimators": ("int", 5, 40), "max_depth": ("int", 4, 12),
+                      "min_samples_leaf": ("int", 5, 50), "max_features": ("choice", [0.4, 0.6, 0.8, 1.0])},
+    "Neural Network": {"hidden": ("choice", [(32,), (64,), (64, 32), (128, 64)]),
+                       "learning_rate": ("log", 1e-4, 1e-2), "epochs": ("int", 2, 8)},
+    "Support Vector Machine": {"n_components": ("choice", [64, 128, 256]), "gamma": ("log", 0.05, 2.0),
+                               "C": ("log", 0.1, 100.0), "epsilon": ("log", 0.01, 0.5)},
+}
+MIN_BUDGET_ROWS = 256  # smallest training subsample a successive-halving rung may use
+
+
+def load_training_data(stream, target=None):
+    """Read an uploaded training file into (X, y, feature_names).
+
+    Tabular CSVs need a target column (`target`, or one of TARGET_COLUMNS); sensor exports
+    with timestamp/value columns are turned into run-to-failure windows instead.
+    """
+    head = stream.read(64 * 1024)
+    stream.seek(0)
+    if isinstance(head, str):
+        head = head.encode()
+    if head[:4] == b"PK\x03\x04":
+        raise ValueError("Excel workbooks are not supported for offline training; export the sheet as CSV")
+
+    header = [name.strip().strip('"') for name in head.decode(errors="replace").splitlines()[0].split(",")]
+    lowered = [name.lower() for name in header]
+    wanted = [target.lower()] if target else list(TARGET_COLUMNS)
+    target_index = next((lowered.index(name) for name in wanted if name in lowered), None)
+
+    if target_index is None:
+        if target:
+            raise ValueError(f"Training file has no {target!r} column: {header}")
+        columns, _ = ingest_sensor_file(stream)
+        X, y = make_rul_dataset(columns.timestamp, columns.value)
+        return X, y, None
+
+    table = np.loadtxt(stream, delimiter=",", skiprows=1, ndmin=2)
+    features = [i for i in range(table.shape[1]) if i != target_index]
+    return table[:, features], table[:, target_index], [header[i] for i in features]
+
+
+def expand_search_space(search_space=None):
+    # Cartesian product of every model's parameter lists -> [(model_name, params), ...]
+    search_space = DEFAULT_SEARCH_SPACE if search_space is None else search_space
+    candidates = []
+    for name, grid in search_space.items():
+        if name not in MODEL_NAMES:
+            raise ValueError(f"Unknown model {name!r}; expected one of {MODEL_NAMES}")
+        keys = sorted(grid)
+        for values in itertools.product(*(grid[key] for key in keys)):
+            candidates.append((name, dict(zip(keys, values))))
+    return candidates
+
+
+def contiguous_folds(n_rows, n_folds):
+    # Contiguous blocks keep neighbouring (overlapping) windows out of each other's validation set
+    bounds = np.linspace(0, n_rows, n_folds + 1).astype(int)
+    return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+@dataclass
+class TrainingReport:
+    leaderboard: list
+    tasks: list
+    wall_seconds: float
+    workers: int
+    task_seconds: float = field(init=False)
+
+    def __post_init__(self):
+        self.task_seconds = sum(task["fit_seconds"] + task["predict_seconds"] for task in self.tasks)
+
+    @property
+    def parallel_efficiency(self):
+        # 1.0 means the pool kept every worker busy for the whole run
+        return self.task_seconds / (self.wall_seconds * self.workers) if self.wall_seconds else 0.0
+
+
+# Worker-side views onto the shared feature matrix, set once per process by _attach
+_shared = {}
+
+
+def _attach(specs):
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        _shared[key] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+
+def _evaluate(candidate_id, model_name, params, fold, lo, hi, seed, stride=1, arrays=None):
+    # Fit on every `stride`-th row outside [lo, hi) and score on [lo, hi)
+    X, y = arrays if arrays is not None else (_shared["X"][1], _shared["y"][1])
+    train = np.r_[0:lo, hi:len(X)][::stride]
+    if seed is not None and "seed" in inspect.signature(MODEL_CLASSES[model_name]).parameters:
+        params = {**params, "seed": seed}
+
+    start = time.perf_counter()
+    model = make_model(model_name, **params).fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    residual = model.predict(X[lo:hi]) - y[lo:hi]
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        "candidate": candidate_id,
+        "model": model_name,
+        "params": params,
+        "fold": fold,
+        "train_rows": len(train),
+        "rmse": float(np.sqrt(np.mean(residual ** 2))),
+        "mae": float(np.mean(np.abs(residual))),
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "pid": os.getpid(),
+    }
+
+
+def _share(array):
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _leaderboard(tasks, candidates):
+    rows = []
+    for candidate_id, (name, params) in enumerate(candidates):
+        scores = [task for task in tasks if task["candidate"] == candidate_id]
+        if not scores:
+            continue
+        rmse = np.array([task["rmse"] for task in scores])
+        rows.append({
+            "model": name,
+            "params": params,
+            "rmse": float(rmse.mean()),
+            "rmse_std": float(rmse.std()),
+            "mae": float(np.mean([task["mae"] for task in scores])),
+            "fit_seconds": float(np.mean([task["fit_seconds"] for task in scores])),
+            "folds": len(scores),
+        })
+    return sorted(rows, key=lambda row: row["rmse"])
+
+
+class _InlinePool:
+    # Runs each call as it is submitted; lets the single-worker path share the pool code
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+@contextmanager
+def _evaluation_pool(X, y, max_workers):
+    """Yield submit(*_evaluate args) -> Future, backed by a process pool that shares X and y.
+
+    X and y are placed in shared memory once; tasks only carry the candidate and row bounds.
+    With one worker everything runs inline: no pool start-up cost and nothing to share.
+    """
+    if max_workers == 1:
+        pool = _InlinePool()
+        yield lambda *job: pool.submit(_evaluate, *job, arrays=(X, y))
+        return
+    blocks = []
+    try:
+        specs = {}
+        for key, array in (("X", X), ("y", y)):
+            block, specs[key] = _share(array)
+            blocks.append(block)
+
+        # spawn keeps workers independent of the (threaded) Streamlit server process
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers, mp_context=context, initializer=_attach, initargs=(specs,))
+        try:
+            yield lambda *job: pool.submit(_evaluate, *job)
+        finally:
+            # Queued trials are dropped when the caller stops early (e.g. the job was cancelled)
+            pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def run_training(X, y, search_space=None, n_folds=3, max_workers=None, seed=0, progress=None):
+    """Cross-validate every candidate model on (X, y) across a process pool.
+
+    `progress(done, total)` is called as tasks complete. Returns a TrainingReport.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    candidates = expand_search_space(search_space)
+    folds = contiguous_folds(len(X), n_folds)
+    jobs = [(candidate_id, name, params, fold, lo, hi, seed)
+            for candidate_id, (name, params) in enumerate(candidates)
+            for fold, (lo, hi) in enumerate(folds)]
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+
+    start = time.perf_counter()
+    tasks = []
+    with _evaluation_pool(X, y, max_workers) as submit:
+        for future in as_completed([submit(*job) for job in jobs]):
+            tasks.append(future.result())
+            if progress is not None:
+                progress(len(tasks), len(jobs))
+
+    wall_seconds = time.perf_counter() - start
+    return TrainingReport(_leaderboard(tasks, candidates), tasks, wall_seconds, max_workers)
+
+
+def sample_candidates(n, distributions=None, rng=None):
+    """Draw n random (model_name, params) candidates, cycling through the model families."""
+    distributions = DEFAULT_DISTRIBUTIONS if distributions is None else distributions
+    rng = rng if rng is not None else np.random.default_rng()
+    names = list(distributions)
+    for name in names:
+        if name not in MODEL_NAMES:
+            raise ValueError(f"Unknown model {name!r}; expected one of {MODEL_NAMES}")
+    offset = int(rng.integers(len(names)))
+    candidates = []
+    for i in range(n):
+        name = names[(offset + i) % len(names)]
+        params = {}
+        for key, (kind, *spec) in sorted(distributions[name].items()):
+            if kind == "log":
+                params[key] = float(np.exp(rng.uniform(np.log(spec[0]), np.log(spec[1]))))
+            elif kind == "int":
+                params[key] = int(rng.integers(spec[0], spec[1] + 1))
+            elif kind == "choice":
+                params[key] = spec[0][int(rng.integers(len(spec[0])))]
+            else:
+                raise ValueError(f"Unknown distribution {kind!r} for {name} {key}")
+        candidates.append((name, params))
+    return candidates
+
+
+def hyperband_brackets(n_train, eta=3, max_brackets=4, min_rows=MIN_BUDGET_ROWS):
+    """Hyperband plan as [(configurations, rungs), ...], most exploratory bracket first.
+
+    A bracket starts `configurations` random candidates on every eta ** (rungs - 1)-th training
+    row and keeps the best 1/eta at each rung, until the survivors train on every row. Brackets
+    with fewer rungs start fewer candidates on more data, hedging against early rungs that
+    rank candidates badly. The deepest bracket is limited so its first rung has min_rows rows.
+    """
+    deepest = min(max_brackets - 1, int(math.log(max(n_train / min_rows, 1), eta)))
+    return [(math.ceil((deepest + 1) / (s + 1) * eta ** s), s + 1) for s in range(deepest, -1, -1)]
+
+
+@dataclass
+class SearchReport(TrainingReport):
+    candidates: int = 0  # configurations sampled across every bracket
+
+    @property
+    def trials_per_minute(self):
+        return 60 * len(self.tasks) / self.wall_seconds if self.wall_seconds else 0.0
+
+    def best_so_far(self):
+        # (seconds since start, best full-budget RMSE) each time a fully trained candidate improves on it
+        curve, best = [], math.inf
+        for task in sorted(self.tasks, key=lambda task: task["finished"]):
+            if task["stride"] == 1 and task["rmse"] < best:
+                best = task["rmse"]
+                curve.append((task["finished"], best))
+        return curve
+
+
+def run_search(X, y, distributions=None, eta=3, max_brackets=4, holdout=0.2, max_workers=None, seed=0,
+               progress=None, method="hyperband"):
+    """Hyperband search (random candidates + successive halving) over the model families.
+
+    Every trial fits on a strided subsample of the leading rows and is scored on the trailing
+    `holdout` rows. Each bracket promotes its best 1/eta to the next rung as soon as the
+    rung completes, and rungs of different brackets run side by side, so the pool stays busy
+    while weak candidates are dropped after a cheap fit. method="random" fully trains the
+    same candidates instead (plain random search, the exhaustive baseline). `progress(done,
+    total)` is called as trials complete. Returns a SearchReport whose leaderboard holds the
+    fully trained trials.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    lo = int(len(X) * (1 - holdout))
+    brackets = hyperband_brackets(lo, eta, max_brackets)
+    if method == "random":
+        brackets = [(sum(n for n, _ in brackets), 1)]
+    elif method != "hyperband":
+        raise ValueError(f"Unknown search method {method!r}; expected 'hyperband' or 'random'")
+    candidates = sample_candidates(sum(n for n, _ in brackets), distributions, np.random.default_rng(seed))
+    # Survivors per rung shrink by eta, so the trial count is known before anything runs
+    total = sum(n // eta ** rung or 1 for n, rungs in brackets for rung in range(rungs))
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, total))
+
+    start = time.perf_counter()
+    tasks, pending, rung_results = [], {}, {}
+    with _evaluation_pool(X, y, max_workers) as submit:
+        def launch(bracket, rung, candidate_ids):
+            stride = eta ** (brackets[bracket][1] - 1 - rung)
+            rung_results[bracket, rung] = []
+            for candidate_id in candidate_ids:
+                name, params = candidates[candidate_id]
+                future = submit(candidate_id, name, params, 0, lo, len(X), seed, stride)
+                pending[future] = bracket, rung, len(candidate_ids)
+
+        first = 0
+        for bracket, (n, _) in enumerate(brackets):
+            launch(bracket, 0, range(first, first + n))
+            first += n
+
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                bracket, rung, size = pending.pop(future)
+                task = future.result()
+                task.update(bracket=bracket, rung=rung, stride=eta ** (brackets[bracket][1] - 1 - rung),
+                            finished=time.perf_counter() - start)
+                tasks.append(task)
+                results = rung_results[bracket, rung]
+                results.append(task)
+                if len(results) == size and rung + 1 < brackets[bracket][1]:
+                    survivors = sorted(results, key=lambda task: task["rmse"])[:max(1, size // eta)]
+                    launch(bracket, rung + 1, [task["candidate"] for task in survivors])
+                if progress is not None:
+                    progress(len(tasks), total)
+
+    wall_seconds = time.perf_counter() - start
+    leaderboard = sorted(
+        ({"model": task["model"], "params": task["params"], "rmse": task["rmse"], "mae": task["mae"],
+          "fit_seconds": task["fit_seconds"], "bracket": task["bracket"]}
+         for task in tasks if task["stride"] == 1),
+        key=lambda row: row["rmse"])
+    return SearchReport(leaderboard, tasks, wall_seconds, max_workers, candidates=len(candidates))
+
+
+def train_from_file(path, search_space=None, n_folds=3, max_workers=None, seed=0, progress=None):
+    # Job-queue entry point: read a saved training file and cross-validate every candidate
+    with open(path, "rb") as f:
+        X, y, _ = load_training_data(f)
+    return run_training(X, y, search_space, n_folds, max_workers, seed, progress)
+
+
+def search_from_file(path, distributions=None, eta=3, max_brackets=4, max_workers=None, seed=0, progress=None,
+                     method="hyperband"):
+    # Job-queue entry point: read a saved training file and run a random or Hyperband search on it
+    with open(path, "rb") as f:
+        X, y, _ = load_training_data(f)
+    return run_search(X, y, distributions, eta, max_brackets, max_workers=max_workers, seed=seed,
+                      progress=progress, method=method)
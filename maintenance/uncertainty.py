@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from maintenance.fitting import MIN_DECAY, fit_degradation_curves
+from maintenance.simulation import simulate_degradation
+
+DEFAULT_SAMPLES = 2000
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+
+@dataclass
+class RULDistribution:
+    """Monte Carlo RUL samples and health percentile bands for one or more groups (e.g. parts)."""
+
+    time: np.ndarray  # (T,)
+    rul: np.ndarray  # (groups, samples)
+    decay: np.ndarray  # (groups, samples)
+    percentiles: tuple
+    bands: np.ndarray  # (groups, len(percentiles), T) health percentiles over time
+    rul_percentiles: np.ndarray  # (groups, len(percentiles))
+
+    def histogram(self, group=0, bins=30):
+        # (counts, edges) of one group's finite sampled RULs; undetermined groups sample only NaN
+        rul = self.rul[group]
+        return np.histogram(rul[np.isfinite(rul)], bins=bins)
+
+
+def sorted_percentiles(values, percentiles):
+    """np.percentile(values, percentiles, axis=-1) with linear interpolation, moved to the last axis.
+
+    A full sort of each row is much faster than numpy's partition-based selection here: the
+    sampled health curves are full of ties (1.0 before wear starts, 0.0 after failure).
+    """
+    ordered = np.sort(values, axis=-1)
+    position = np.asarray(percentiles, dtype=np.float64) / 100 * (values.shape[-1] - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, values.shape[-1] - 1)
+    fraction = position - lower
+    return ordered[..., lower] * (1 - fraction) + ordered[..., upper] * fraction
+
+
+def parameter_distribution(fit, units_per_group):
+    """Per-group mean and covariance of (log rul, decay) from per-unit curve fits.
+
+    The covariance is the unit-to-unit spread plus the average estimation covariance, so
+    groups with few or noisy units get correspondingly wider bands. Only determined fits
+    count; a group without any gets a NaN mean.
+    """
+    # Undetermined fits (NaN rul, possibly infinite covariance) are left out of every average
+    determined = fit.determined.reshape(-1, units_per_group)
+    count = determined.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        theta = np.stack([np.log(fit.rul), fit.decay], axis=-1).reshape(-1, units_per_group, 2)
+    theta = np.where(determined[..., None], theta, 0)
+    mean = theta.sum(axis=1) / np.maximum(count, 1)[:, None]
+    centred = np.where(determined[..., None], theta - mean[:, None, :], 0)
+    spread = np.einsum("gui,guj->gij", centred, centred) / np.maximum(count - 1, 1)[:, None, None]
+    estimation = np.where(determined[..., None, None], fit.covariance.reshape(-1, units_per_group, 2, 2), 0)
+    estimation = estimation.sum(axis=1) / np.maximum(count, 1)[:, None, None]
+    # A group with no determined unit has no RUL to sample; its draws come out NaN
+    mean[count == 0] = np.nan
+    estimation[count == 0] = np.eye(2)
+    return mean, spread + estimation
+
+
+def monte_carlo_rul(time, health, n_samples=DEFAULT_SAMPLES, percentiles=DEFAULT_PERCENTILES, seed=None):
+    """Propagate fitted parameter uncertainty through health = 1 - (t / rul) ** decay.
+
+    `health` holds observed curves shaped (groups, units, T) or (units, T) over `time`. Every
+    unit is fitted in one batch, each group's (log rul, decay) distribution is sampled
+    `n_samples` times in one draw, and the sampled curves are reduced to percentile bands.
+    """
+    rng = np.random.default_rng(seed)
+    time = np.asarray(time, dtype=np.float64)
+    health = np.asarray(health, dtype=np.float64)
+    if health.ndim == 2:
+        health = health[None]
+    groups, units, _ = health.shape
+
+    fit = fit_degradation_curves(time, health.reshape(groups * units, -1))
+    mean, covariance = parameter_distribution(fit, units)
+
+    # Correlated normal draws for every group at once through a batched Cholesky factor
+    factor = np.linalg.cholesky(covariance + 1e-12 * np.eye(2))
+    theta = mean[:, None, :] + rng.standard_normal((groups, n_samples, 2)) @ factor.transpose(0, 2, 1)
+    rul = np.exp(theta[..., 0])
+    decay = np.maximum(theta[..., 1], MIN_DECAY)
+
+    # (groups, T, samples) sampled health curves, samples last so each row sorts contiguously
+    ratio = np.minimum(time[None, :, None] / rul[:, None, :], 1.0)
+    curves = 1 - ratio ** decay[:, None, :]
+    bands = np.moveaxis(sorted_percentiles(curves, percentiles), -1, 1)
+    rul_percentiles = sorted_percentiles(rul, percentiles)
+    return RULDistribution(time, rul, decay, tuple(percentiles), bands, rul_percentiles)
+
+
+def simulated_fleet_distribution(parts, seed=None, units=5, n_samples=DEFAULT_SAMPLES, time=None):
+    # Monte Carlo RUL bands for every part from simulated training curves, computed in one batch
+    rng = np.random.default_rng(seed)
+    time = np.linspace(0, 350, 100) if time is None else np.asarray(time, dtype=np.float64)
+    _, _, health = simulate_degradation(len(parts) * units, time, seed=rng)
+    return monte_carlo_rul(time, health.reshape(len(parts), units, -1), n_samples=n_samples, seed=rng)
@@ -0,0 +1,92 @@
+import itertools
+import types
+
+import pytest
+
+import maintenance.catalog
+from maintenance.catalog import NO_EXPLANATION, PART_TYPES, SENSOR_TYPES, Catalog
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return Catalog(str(tmp_path / "catalog.db")).seed(machines=["Machine 1", "Machine 2"])
+
+
+def test_seed_is_idempotent(catalog, tmp_path):
+    catalog.seed(machines=["Machine 1"])
+    reopened = Catalog(str(tmp_path / "catalog.db"))
+    assert reopened.part_types() == PART_TYPES and reopened.sensor_types() == SENSOR_TYPES
+    assert reopened.machines() == ["Machine 1", "Machine 2"]
+    # One installed instance of every part type per machine
+    assert len(reopened.parts()) == 2 * len(PART_TYPES)
+    assert reopened.explanation("Pump") != NO_EXPLANATION and reopened.explanation("Flux capacitor") == NO_EXPLANATION
+
+
+def test_record_upload_and_filters(catalog):
+    first = catalog.record_upload("Machine 1", "Pump", {"Vibration": 100, "Temperature": 10}, file_name="a.csv",
+                                  size=2048, uploaded_at=1000.0)
+    second = catalog.record_upload("Machine 2", "Pump", {"Vibration": 50}, uploaded_at=2000.0)
+    third = catalog.record_upload("Machine 1", "Bearing", {"Vibration": 7}, uploaded_at=3000.0)
+
+    def ids(**filters):
+        return [row["id"] for row in catalog.uploads(**filters)]
+
+    assert ids() == [third, second, first]  # newest first
+    row = catalog.uploads(machine="Machine 1", part_type="Pump")[0]
+    assert (row["id"], row["rows"], row["bytes"], row["file_name"]) == (first, 110, 2048, "a.csv")
+    assert ids(part_type="Pump") == [second, first]
+    assert ids(sensor_type="Temperature") == [first]
+    assert ids(sensor_type="Vibration", part_type="Pump") == [second, first]
+    assert ids(sensor_type="Vibration", machine="Machine 1") == [third, first]
+    # `since` is inclusive, for both the upload and the per-sensor index
+    assert ids(since=2000.0) == [third, second]
+    assert ids(sensor_type="Vibration", since=2000.0, part_type="Pump") == [second]
+    assert ids(since=3000.5) == []
+    assert ids(limit=1) == [third]
+    with pytest.raises(KeyError):
+        catalog.record_upload("Machine 3", "Pump", {"Vibration": 1})
+
+
+def test_replace_part_starts_a_fresh_instance(catalog):
+    old = catalog.parts("Machine 1", "Pump")[0]
+    catalog.record_model_version("Machine 1", "Pump", "Vibration", "Linear Regression")
+    new_id = catalog.replace_part("Machine 1", "Pump")
+    current = catalog.parts("Machine 1", "Pump")
+    assert [part["id"] for part in current] == [new_id] and new_id != old["id"]
+    history = catalog.parts("Machine 1", "Pump", include_removed=True)
+    assert [part["id"] for part in history] == [old["id"], new_id]
+    assert history[0]["removed_at"] is not None and history[1]["removed_at"] is None
+    # The new instance has no models yet, and versions number from 1 again
+    assert catalog.model_versions("Machine 1", "Pump") == []
+    assert catalog.record_model_version("Machine 1", "Pump", "Vibration", "Linear Regression") == 1
+    # Other machines and parts are untouched
+    assert len(catalog.parts()) == 2 * len(PART_TYPES)
+
+
+def test_model_versions(catalog, monkeypatch):
+    # Each fit is recorded one second after the previous one
+    clock = itertools.count(1000.0)
+    monkeypatch.setattr(maintenance.catalog, "time", types.SimpleNamespace(time=lambda: next(clock)))
+    record = catalog.record_model_version
+    assert record("Machine 1", "Pump", "Vibration", "Linear Regression", params={"alpha": 1},
+                  metrics={"rmse": 2.5}, training_rows=100, source="uploaded") == 1
+    assert record("Machine 1", "Pump", "Vibration", "Linear Regression", metrics=None) == 2
+    assert record("Machine 1", "Pump", "Vibration", "Random Forest") == 1
+    assert record("Machine 1", "Pump", "Current", "Linear Regression") == 1
+    assert record("Machine 2", "Pump", "Vibration", "Linear Regression") == 1
+
+    versions = catalog.model_versions("Machine 1", "Pump", "Vibration", "Linear Regression")
+    assert [row["version"] for row in versions] == [2, 1]
+    assert versions[1]["params"] == {"alpha": 1} and versions[1]["metrics"] == {"rmse": 2.5}
+    assert (versions[1]["training_rows"], versions[1]["source"]) == (100, "uploaded")
+    assert versions[0]["metrics"] == {}
+    assert len(catalog.model_versions("Machine 1", "Pump")) == 4
+    assert {row["sensor_type"] for row in catalog.model_versions("Machine 1", "Pump", model_name="Linear Regression")} \
+        == {"Vibration", "Current"}
+    assert len(catalog.model_versions("Machine 1", "Pump", limit=2)) == 2
+    # `since` is inclusive on the fit time: the Machine 1 Pump fits were made at 1000, 1001, 1002 and 1003
+    assert [(row["model_name"], row["sensor_type"]) for row in catalog.model_versions("Machine 1", "Pump", since=1002)] \
+        == [("Linear Regression", "Current"), ("Random Forest", "Vibration")]
+    assert [row["version"] for row in catalog.model_versions("Machine 1", "Pump", "Vibration", since=1001)] == [1, 2]
+    assert catalog.model_versions("Machine 1", "Pump", since=1003.5) == []
+    assert catalog.model_versions("Machine 1", "Bearing") == []
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from maintenance.decimation import (bucket_points, choose_level, decimate, lttb, minmax_decimate,
+                                    pyramid_bucket_size)
+from maintenance.store import SensorStore
+
+# Ragged batches: none a multiple of the 64-sample base bucket, so every append leaves a partial tail
+BATCHES = [1, 63, 64, 1000, 4097, 20_000, 3, 30_000, 15_555]
+
+
+def brute_bucket(timestamp, value, a, b):
+    # Min and max of rows [a, b), each at its first occurrence, found with plain Python
+    rows = range(a, b)
+    lo = min(rows, key=lambda i: (value[i], i))
+    hi = min(rows, key=lambda i: (-value[i], i))
+    return [timestamp[lo], value[lo], timestamp[hi], value[hi]]
+
+
+@pytest.fixture(scope="module")
+def store_series(tmp_path_factory):
+    rng = np.random.default_rng(2)
+    time = 1_700_000_000.0 + np.cumsum(rng.exponential(1.0, sum(BATCHES)))
+    value = np.round(np.cumsum(rng.normal(size=len(time))))  # rounded, so extremes tie
+    store = SensorStore(str(tmp_path_factory.mktemp("store")))
+    boundaries = np.cumsum(BATCHES)
+    for lo, hi in zip(np.r_[0, boundaries[:-1]], boundaries):
+        store.append("Pump", "Vibration", time[lo:hi], value[lo:hi])
+    return store, time, value, boundaries[:-1]
+
+
+def test_pyramid_levels_match_brute_force(store_series):
+    store, time, value, _ = store_series
+    counts = store.info("Pump", "Vibration")["pyramid"]
+    assert len(counts) >= 4
+    for level, count in enumerate(counts):
+        size = pyramid_bucket_size(level)
+        # Only complete buckets are summarised; the ragged tail waits for the next append
+        assert count == len(time) // size
+        table = np.asarray(store._pyramid_level("Pump", "Vibration", level, count))
+        expected = [brute_bucket(time, value, b * size, (b + 1) * size) for b in range(count)]
+        assert np.array_equal(table, np.array(expected)), level
+
+
+def reference_decimated(time, value, lo, hi, n_out, counts):
+    # read_decimated rebuilt from brute-force reductions of the raw rows in [lo, hi)
+    level = choose_level(hi - lo, n_out, len(counts))
+    if level < 0:
+        return decimate(time[lo:hi], value[lo:hi], n_out)
+    size = pyramid_bucket_size(level)
+    first, last = -(-lo // size), min(hi // size, counts[level])
+
+    def edge(a, b):
+        if b <= a:
+            return []
+        starts = np.unique(np.linspace(a, b, -(-(b - a) // size), endpoint=False).astype(np.int64))
+        return [brute_bucket(time, value, s, e) for s, e in zip(starts, np.r_[starts[1:], b])]
+
+    rows = edge(lo, first * size) + [brute_bucket(time, value, b * size, (b + 1) * size)
+                                     for b in range(first, last)] + edge(last * size, hi)
+    return decimate(*bucket_points(np.array(rows)), n_out)
+
+
+@pytest.mark.parametrize("n_out", [10, 40, 500, 2000])
+def test_read_decimated_matches_brute_force(store_series, n_out):
+    store, time, value, boundaries = store_series
+    counts = store.info("Pump", "Vibration")["pyramid"]
+    # The whole series, ranges starting or ending just across an append boundary, unaligned ranges
+    # with partial buckets at both edges, and the ragged tail that no pyramid bucket covers yet
+    ranges = [(0, len(time)), (boundaries[3] - 5, boundaries[5] + 7), (boundaries[5] + 1, boundaries[7] - 1),
+              (1234, 56_789), (len(time) - 300, len(time)), (100, 160)]
+    for lo, hi in ranges:
+        end = time[hi] if hi < len(time) else None
+        t, v = store.read_decimated("Pump", "Vibration", time[lo], end, n_out=n_out)
+        expected_t, expected_v = reference_decimated(time, value, lo, hi, n_out, counts)
+        assert np.array_equal(t, expected_t) and np.array_equal(v, expected_v), (lo, hi)
+        # Peaks survive decimation
+        assert v.min() == value[lo:hi].min() and v.max() == value[lo:hi].max()
+
+
+def test_minmax_decimate_keeps_every_bucket_extreme():
+    value = np.array([0, 5, 1, -3, 2, 2, 9, 0], dtype=float)
+    t, v = minmax_decimate(np.arange(8.0), value, n_out=4)
+    # Two buckets of four: (min -3 at t=3 after max 5 at t=1), (min 0 at t=7 after max 9 at t=6)
+    assert t.tolist() == [1, 3, 6, 7] and v.tolist() == [5, -3, 9, 0]
+
+
+def test_lttb_keeps_end_points_and_spikes():
+    value = np.zeros(1000)
+    value[500] = 10.0
+    t, v = lttb(np.arange(1000.0), value, n_out=50)
+    assert len(t) <= 50 and t[0] == 0 and t[-1] == 999 and 10.0 in v
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from maintenance.encoding import (
+    BLOCK_SIZE, MAX_DECIMALS, decode_series, encode_series, integer_scale, pack_bits, read_series, unpack_bits,
+    write_series,
+)
+
+
+def reference_pack(words, block_size):
+    # Per-block width and shift with Python ints, one value at a time
+    widths, shifts = [], []
+    for start in range(0, len(words), block_size):
+        merged = 0
+        for word in words[start:start + block_size]:
+            merged |= int(word)
+        shift = (merged & -merged).bit_length() - 1 if merged else 0
+        widths.append((merged >> shift).bit_length())
+        shifts.append(shift)
+    return widths, shifts
+
+
+def bits(x):
+    # Bit patterns, so NaNs and signed zeros compare exactly
+    return np.asarray(x, dtype=np.float64).view(np.uint64)
+
+
+@pytest.mark.parametrize("n", [0, 1, 63, 64, 1000, 3 * BLOCK_SIZE + 5])
+@pytest.mark.parametrize("block_size", [64, BLOCK_SIZE])
+def test_pack_bits_round_trip_against_reference(n, block_size):
+    rng = np.random.default_rng(n)
+    # Every block gets its own width (0..64 bits) and number of trailing zeros
+    widths = rng.integers(0, 65, size=-(-n // block_size))
+    words = rng.integers(0, 2 ** 63, size=n, dtype=np.uint64) * np.uint64(2) + rng.integers(0, 2, size=n, dtype=np.uint64)
+    limit = np.repeat(widths, block_size)[:n]
+    words &= np.array([(1 << int(w)) - 1 for w in limit], dtype=np.uint64)
+    words <<= rng.integers(0, 8, size=n).astype(np.uint64) * (limit < 57)
+
+    packed_widths, packed_shifts, payload = pack_bits(words, block_size)
+    assert (packed_widths.tolist(), packed_shifts.tolist()) == reference_pack(words, block_size)
+    assert np.array_equal(unpack_bits(packed_widths, packed_shifts, payload, n, block_size), words)
+
+
+def test_pack_bits_rejects_odd_block_size():
+    with pytest.raises(ValueError):
+        pack_bits(np.zeros(10, dtype=np.uint64), 100)
+
+
+@pytest.mark.parametrize("decimals", range(MAX_DECIMALS + 1))
+def test_integer_scale_against_reference(decimals):
+    rng = np.random.default_rng(decimals)
+    values = np.round(rng.uniform(-1000, 1000, 500), decimals)
+    scale = integer_scale(values)
+    # Brute force: the first power of ten that survives the round trip exactly
+    expected = next((10.0 ** d for d in range(MAX_DECIMALS + 1)
+                     if all(round(v * 10 ** d) / 10 ** d == v for v in values.tolist())), None)
+    assert scale == expected
+    assert scale is not None and scale <= 10.0 ** decimals
+
+
+def test_integer_scale_of_full_precision_floats_is_none():
+    assert integer_scale(np.random.default_rng(0).standard_normal(100)) is None
+    assert integer_scale(np.array([1.0, np.nan])) is None
+    assert integer_scale(np.array([])) is None
+
+
+def series_cases():
+    rng = np.random.default_rng(0)
+    n = 2 * BLOCK_SIZE + 17
+    regular = np.arange(n) * 0.01
+    jittered = np.cumsum(rng.uniform(0.009, 0.011, n))
+    yield "empty", np.empty(0), np.empty(0)
+    yield "single", np.array([5.0]), np.array([-2.5])
+    yield "decimal readings", regular, np.round(rng.normal(0, 3, n), 3)
+    yield "full precision", jittered, rng.standard_normal(n)
+    yield "constant", regular, np.full(n, 7.25)
+    yield "negative timestamps", regular - 1e4, np.round(np.sin(regular), 2)
+    special = rng.standard_normal(n)
+    special[[0, 5, 9, 100]] = [np.nan, np.inf, -np.inf, -0.0]
+    yield "non-finite values", regular, special
+    yield "huge", regular, rng.uniform(-1e300, 1e300, n)
+
+
+@pytest.mark.parametrize("name, timestamp, value", list(series_cases()), ids=[case[0] for case in series_cases()])
+def test_series_round_trip_is_lossless(name, timestamp, value):
+    # Integer-coded columns keep values, not bit patterns: -0.0 comes back as 0.0
+    decoded_timestamp, decoded_value = decode_series(encode_series(timestamp, value))
+    assert np.array_equal(decoded_timestamp, timestamp)
+    assert np.array_equal(decoded_value, value, equal_nan=True)
+
+
+def test_xor_codec_is_bit_exact():
+    value = np.random.default_rng(0).standard_normal(3000)
+    value[[0, 5, 9, 100]] = [np.nan, np.inf, -np.inf, -0.0]
+    value[200] = np.array([0x7FF8DEADBEEF0001], dtype=np.uint64).view(np.float64)[0]  # NaN with a payload
+    _, decoded = decode_series(encode_series(np.arange(3000.0), value))
+    assert np.array_equal(bits(decoded), bits(value))
+
+
+def test_decimal_readings_compress():
+    timestamp = np.round(np.arange(100_000) * 0.01, 2)
+    value = np.round(np.sin(timestamp) * 10, 3)
+    assert len(encode_series(timestamp, value)) < (timestamp.nbytes + value.nbytes) / 5
+
+
+@pytest.mark.parametrize("precision", [0.5, 0.01, 1e-4])
+def test_precision_bounds_the_error(precision):
+    rng = np.random.default_rng(0)
+    timestamp = np.arange(5000) * 0.1
+    value = np.cumsum(rng.standard_normal(5000))
+    _, decoded = decode_series(encode_series(timestamp, value, precision=precision))
+    assert np.abs(decoded - value).max() <= precision / 2 * (1 + 1e-9)
+
+
+def test_file_round_trip(tmp_path):
+    timestamp, value = np.arange(300) * 0.5, np.round(np.cos(np.arange(300)), 4)
+    size = write_series(tmp_path / "series.bin", timestamp, value)
+    assert size == (tmp_path / "series.bin").stat().st_size
+    decoded_timestamp, decoded_value = read_series(tmp_path / "series.bin")
+    assert np.array_equal(decoded_timestamp, timestamp) and np.array_equal(decoded_value, value)
+
+
+def test_decode_rejects_foreign_bytes():
+    with pytest.raises(ValueError):
+        decode_series(b"\x00" * 64)
+    with pytest.raises(ValueError):
+        encode_series(np.arange(3.0), np.arange(4.0))
@@ -0,0 +1,77 @@
+import math
+
+import numpy as np
+import pytest
+
+from maintenance.evaluation import evaluate, evaluate_holdout, holdout_start, nasa_score, run_starts
+from maintenance.models import fit_with_holdout, make_rul_dataset, simulated_rul_dataset
+
+
+def test_run_starts():
+    assert run_starts([3, 2, 1, 5, 4, 0, 2, 1]).tolist() == [0, 3, 6]
+    assert run_starts([5.0]).tolist() == [0]
+    # Equal true RULs in a row only split runs when their end-of-life times differ
+    assert run_starts([3, 2, 2, 1], end_of_life=[10, 10, 10, 10]).tolist() == [0]
+    assert run_starts([3, 2, 1, 0.5], end_of_life=[10, 10, 5, 5]).tolist() == [0, 2]
+
+
+def test_nasa_score_is_asymmetric():
+    # exp(-e / 13) - 1 for early predictions, exp(e / 10) - 1 for late ones
+    assert nasa_score([-13, 10, 0, -26]) == pytest.approx([math.e - 1, math.e - 1, 0, math.e ** 2 - 1])
+    assert nasa_score([5])[0] > nasa_score([-5])[0]
+
+
+def test_evaluate_one_run_by_hand():
+    # Life 4 (the largest true RUL), so the alpha = 0.2 cone is +-0.8 around the truth
+    y_true = np.array([4, 3, 2, 1, 0], dtype=float)
+    y_pred = np.array([4, 5, 2.3, 1.6, 0])  # errors 0, 2, 0.3, 0.6, 0
+    e = evaluate(y_true, y_pred, horizon=1.5)
+    assert (e.samples, e.runs) == (5, 1)
+    assert e.rmse == pytest.approx(math.sqrt((4 + 0.09 + 0.36) / 5))
+    assert e.mae == pytest.approx(2.9 / 5)
+    assert e.nasa_score == pytest.approx((math.exp(0.2) + math.exp(0.03) + math.exp(0.06) - 3) / 5)
+    # Only the sample at true RUL 3 is outside the cone: predictions stay inside from true RUL 2 on
+    assert e.prognostic_horizon == 2 and e.horizon_fraction == 0.5
+    # Halfway (lambda 0.5) is true RUL 2, where |0.3| <= 0.2 * 2
+    assert e.alpha_lambda == 1.0
+    # "Fails within 1.5": true at RUL 1 and 0, predicted only at 0
+    assert (e.accuracy, e.precision, e.recall) == (0.8, 1.0, 0.5)
+    assert e.f1 == pytest.approx(2 / 3)
+
+
+def test_evaluate_averages_runs():
+    # Run 1 is perfect; run 2 (life 10) ends outside its +-2 cone and misses at its halfway point
+    y_true = np.array([2, 1, 0, 10, 5, 0], dtype=float)
+    y_pred = np.array([2, 1, 0, 10, 8, 3])
+    e = evaluate(y_true, y_pred)
+    assert e.runs == 2
+    assert e.prognostic_horizon == pytest.approx((2 + 0) / 2)
+    assert e.horizon_fraction == pytest.approx((1 + 0) / 2)
+    assert e.alpha_lambda == 0.5
+
+
+def test_evaluate_rejects_mismatched_inputs():
+    with pytest.raises(ValueError):
+        evaluate([1, 2], [1])
+    with pytest.raises(ValueError):
+        evaluate([], [])
+
+
+def test_holdout_covers_only_whole_unseen_runs():
+    X, y = simulated_rul_dataset(n_units=10, seed=0)
+    split = int(len(y) * 0.8)
+    start = holdout_start(y)
+    starts = run_starts(y)
+    assert start == starts[starts >= split][0]
+    model, _ = fit_with_holdout("Linear Regression", X, y)
+    e = evaluate_holdout(model, X, y)
+    assert e.samples == len(y) - start and e.runs == len(starts) - np.searchsorted(starts, start)
+
+
+def test_single_self_labelled_series_cannot_be_validated():
+    # On one series labelled by its own end, the old split reported alpha-lambda and F1 of 1.0 on pure noise
+    timestamp = np.arange(4000) * 0.25
+    X, y = make_rul_dataset(timestamp, np.random.default_rng(0).normal(size=len(timestamp)))
+    model, _ = fit_with_holdout("Linear Regression", X, y)
+    with pytest.raises(ValueError):
+        evaluate_holdout(model, X, y)
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from maintenance.features import frame_signal, time_domain_features
+
+
+def test_time_domain_features_by_hand():
+    # A +-1 square wave: RMS 1, peak 1, crest 1, and the two-point distribution's kurtosis of exactly 1
+    rms, peak, crest, kurtosis = time_domain_features(np.tile([1.0, -1.0], 512)[None])
+    assert (rms[0], peak[0], crest[0], kurtosis[0]) == (1.0, 1.0, 1.0, 1.0)
+    # A constant frame has no spread to measure
+    assert time_domain_features(np.full((1, 64), 3.0))[3][0] == 0.0
+
+
+@pytest.mark.parametrize("offset", [100.0, 1e4, 1e6])
+def test_kurtosis_ignores_a_large_dc_offset(offset):
+    noise = np.random.default_rng(0).normal(size=64 * 1024)
+    frames = frame_signal(noise)
+    expected = time_domain_features(frames)[3]
+    assert np.allclose(expected, 3.0, atol=0.6)
+    assert time_domain_features(frames + offset)[3] == pytest.approx(expected, rel=1e-6)
+    assert time_domain_features(np.tile([1.0, -1.0], 512)[None] + offset)[3][0] == pytest.approx(1.0, rel=1e-9)
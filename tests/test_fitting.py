@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from maintenance.fitting import MAX_RUL_FACTOR, fit_degradation_curves
+from maintenance.simulation import simulate_degradation
+
+GRID = np.linspace(0, 350, 100)
+
+
+def fleet(curves=2_000, seed=0):
+    return simulate_degradation(curves, GRID, seed=seed)
+
+
+def test_full_life_curves_are_recovered():
+    ruls, _, health = fleet()
+    fit = fit_degradation_curves(GRID, health)
+    assert fit.determined.mean() > 0.99
+    ok = fit.determined
+    assert np.median(np.abs(fit.rul[ok] / ruls[ok] - 1)) < 0.01
+    covered = (fit.rul_ci[ok, 0] <= ruls[ok]) & (ruls[ok] <= fit.rul_ci[ok, 1])
+    assert covered.mean() > 0.85
+
+
+@pytest.mark.parametrize("cut", [80, 138, 200])
+def test_partial_life_curves_are_bounded_or_undetermined(cut):
+    # Curves observed only up to `cut`, often long before failure: no runaway estimates
+    ruls, _, health = fleet()
+    observed = GRID <= cut
+    fit = fit_degradation_curves(GRID[observed], health[:, observed])
+    ok = fit.determined
+    assert np.isnan(fit.rul[~ok]).all() and np.isnan(fit.rul_ci[~ok]).all()
+    assert (fit.rul[ok] < MAX_RUL_FACTOR * GRID[observed][-1]).all()
+    assert np.median(np.abs(fit.rul[ok] / ruls[ok] - 1)) < 0.3
+    covered = (fit.rul_ci[ok, 0] <= ruls[ok]) & (ruls[ok] <= fit.rul_ci[ok, 1])
+    assert covered.mean() > 0.8
+
+
+def test_too_few_points_are_undetermined():
+    fit = fit_degradation_curves(GRID[:2], np.array([[1.0, 0.99]]))
+    assert not fit.determined[0]
+    assert np.isnan(fit.rul[0])
@@ -0,0 +1,92 @@
+import io
+
+import numpy as np
+import pytest
+
+from maintenance.ingest import DEFAULT_CHANNEL, ingest_sensor_file, iter_sensor_chunks
+
+CHUNK_SIZES = [1, 7, 64, 1 << 20]  # from one byte per read, splitting every line, to the whole file at once
+
+
+def parse(text, chunk_size=1 << 20, **options):
+    data = text.encode() if isinstance(text, str) else text
+    return ingest_sensor_file(io.BytesIO(data), chunk_size=chunk_size, **options)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_header_with_channels(chunk_size):
+    text = '"Time",Sensor,Reading\n0,Vibration,1.5\n1,Temperature,20\n2,Vibration,-0.25\n3,Pressure,1e3\n'
+    columns, stats = parse(text, chunk_size)
+    assert columns.timestamp.tolist() == [0, 1, 2, 3]
+    assert columns.value.tolist() == [1.5, 20, -0.25, 1000]
+    # Codes are assigned per chunk, so only the code -> name mapping is fixed, not the order of names
+    assert [stats.channels[code] for code in columns.channel] == ["Vibration", "Temperature", "Vibration", "Pressure"]
+    assert stats.rows == 4 and stats.bytes_read == len(text)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_headerless_layouts(chunk_size):
+    columns, stats = parse("10,0.5\n11,0.25\n12,0.125\n", chunk_size)
+    assert columns.timestamp.tolist() == [10, 11, 12] and columns.value.tolist() == [0.5, 0.25, 0.125]
+    assert stats.channels == [DEFAULT_CHANNEL] and columns.channel.tolist() == [0, 0, 0]
+    # A single column is all values, timestamped by row number across chunks
+    columns, _ = parse("3\n1\n4\n1\n5\n", chunk_size)
+    assert columns.timestamp.tolist() == [0, 1, 2, 3, 4] and columns.value.tolist() == [3, 1, 4, 1, 5]
+    columns, stats = parse("0,1,a\n1,2,b\n2,3,a\n", chunk_size)
+    assert [stats.channels[code] for code in columns.channel] == ["a", "b", "a"]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_datetime_timestamps_become_epoch_seconds(chunk_size):
+    text = "timestamp,value\n2024-01-01T00:00:00,1\n2024-01-01T00:00:01.5,2\n2024-01-02T00:00:00,3\n"
+    columns, _ = parse(text, chunk_size)
+    assert columns.timestamp.tolist() == [1704067200.0, 1704067201.5, 1704153600.0]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_crlf_line_endings_and_blank_lines(chunk_size):
+    text = "time,value,channel\r\n0,1.0,x\r\n\r\n1,2.0,y\r\n2,3.0,x"  # no newline after the last row either
+    columns, stats = parse(text, chunk_size)
+    assert columns.value.tolist() == [1.0, 2.0, 3.0]
+    assert [stats.channels[code] for code in columns.channel] == ["x", "y", "x"]
+
+
+def test_chunks_split_mid_line_lose_nothing():
+    rng = np.random.default_rng(0)
+    value = rng.normal(size=5000).round(6)
+    text = "timestamp,value\n" + "".join(f"{i},{v}\n" for i, v in enumerate(value))
+    chunks = list(iter_sensor_chunks(io.BytesIO(text.encode()), chunk_size=997))
+    assert len(chunks) > 10
+    assert np.array_equal(np.concatenate([c.value for c in chunks]), value)
+    assert np.array_equal(np.concatenate([c.timestamp for c in chunks]), np.arange(5000))
+
+
+def test_text_streams_and_progress():
+    reports = []
+    columns, stats = ingest_sensor_file(io.StringIO("0,1\n1,2\n"), chunk_size=4,
+                                        progress=lambda done, total, rows: reports.append((done, rows)), total_bytes=8)
+    assert columns.value.tolist() == [1, 2]
+    assert reports[-1] == (8, 2)
+
+
+def test_empty_file():
+    columns, stats = parse("")
+    assert len(columns) == 0 and stats.rows == 0
+    columns, stats = parse("timestamp,value\n")
+    assert len(columns) == 0
+
+
+@pytest.mark.parametrize("text", [
+    "timestamp,value\n0,1\n1,oops\n",  # non-numeric value
+    "timestamp,value\n0,1\n1\n",  # missing column
+    "0,1\n1,\n",  # empty value
+    "0,1\n2024-01-01,2\n",  # timestamp type changes mid-file
+])
+def test_malformed_rows_raise(text):
+    with pytest.raises(ValueError):
+        parse(text)
+
+
+def test_header_without_a_value_column():
+    with pytest.raises(ValueError, match="no value column"):
+        parse("when,what\n0,1\n")
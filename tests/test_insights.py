@@ -0,0 +1,40 @@
+import numpy as np
+
+import maintenance.insights
+from maintenance.insights import build_insights_figure, render_figure
+from maintenance.uncertainty import monte_carlo_rul
+
+
+def texts(ax):
+    return [text.get_text() for text in ax.texts]
+
+
+def test_insights_figure():
+    fig = build_insights_figure("Pump", seed=0)
+    ax, hist_ax = fig.axes
+    assert ax.get_title() == "Training Data for Pump"
+    assert len(ax.get_lines()) >= 6 and hist_ax.patches
+    assert hist_ax.get_xlabel().startswith("Sampled RUL (p5/p50/p95: ")
+    assert render_figure(fig).startswith(b"\x89PNG")
+
+
+def test_insights_figure_with_measured_health():
+    fig = build_insights_figure("Pump", seed=0, measured=(np.arange(10.0), np.linspace(1, 0.5, 10)))
+    assert len(fig.axes) == 3
+    assert "Measured Health Indicator" in [text.get_text() for text in fig.axes[0].get_legend().get_texts()]
+
+
+def test_insights_figure_without_a_finite_rul_sample(monkeypatch):
+    # Every fit undetermined: the histogram is replaced by a note instead of failing on NaN
+    def undetermined(time, health, **options):
+        dist = monte_carlo_rul(time, health, **options)
+        dist.rul[:] = np.nan
+        dist.rul_percentiles[:] = np.nan
+        return dist
+
+    monkeypatch.setattr(maintenance.insights, "monte_carlo_rul", undetermined)
+    fig = build_insights_figure("Pump", seed=0)
+    hist_ax = fig.axes[1]
+    assert not hist_ax.patches and hist_ax.get_xlabel() == "Sampled RUL"
+    assert texts(hist_ax) == ["No curve could be fitted, so no RUL was sampled"]
+    render_figure(fig)
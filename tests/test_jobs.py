@@ -0,0 +1,42 @@
+import os
+import time
+
+from maintenance.jobs import CANCELLED, JobQueue
+
+
+def stubborn_job(marker, progress=None):
+    # Never reaches a progress call, so only terminate() can stop it; its cleanup must still run
+    with open(marker, "w") as f:
+        f.write("started")
+    try:
+        while True:
+            time.sleep(0.05)
+    finally:
+        with open(marker, "w") as f:
+            f.write("cleaned up")
+
+
+def wait_for(condition, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+def test_cancelled_job_gets_a_grace_period_then_runs_its_finally_blocks(tmp_path):
+    marker = tmp_path / "marker"
+    queue = JobQueue(str(tmp_path / "jobs"), max_workers=1, cancel_grace=1.0)
+    job_id = queue.submit("tests.test_jobs:stubborn_job", str(marker))
+    queue.run_pending()
+    process = queue._processes[job_id]
+    wait_for(marker.exists)
+
+    assert queue.cancel(job_id)
+    queue.run_pending()
+    assert process.is_alive()  # still inside the grace period
+
+    wait_for(lambda: (queue.run_pending(), not process.is_alive())[1])
+    assert marker.read_text() == "cleaned up"
+    assert queue.status(job_id)["status"] == CANCELLED
+    assert job_id not in queue._processes
+    assert not os.path.exists(f"/proc/{process.pid}")
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from maintenance.models import FEATURE_NAMES, MODEL_NAMES, fit_with_holdout, make_rul_dataset
+
+ELAPSED = FEATURE_NAMES.index("elapsed")
+
+
+@pytest.mark.parametrize("max_rows", [None, 500])
+def test_self_labelled_series_leave_elapsed_out(max_rows):
+    timestamp = np.arange(5000) * 0.1
+    X, y = make_rul_dataset(timestamp, np.random.default_rng(0).normal(size=len(timestamp)), max_rows=max_rows)
+    assert not X[:, ELAPSED].any()
+    assert y[-1] == 0 and np.all(np.diff(y) < 0)
+
+
+@pytest.mark.parametrize("model_name", MODEL_NAMES)
+def test_noise_does_not_look_predictable(model_name):
+    # With elapsed in the features, the label const - elapsed made pure noise fit perfectly
+    rng = np.random.default_rng(0)
+    timestamp = np.arange(4000) * 0.25
+    X, y = make_rul_dataset(timestamp, rng.normal(size=len(timestamp)))
+    model, holdout_rmse = fit_with_holdout(model_name, X, y)
+    assert holdout_rmse > 0.1 * np.ptp(y)
+    assert model.predict(X[-1:])[0] > 0.1 * np.ptp(y)
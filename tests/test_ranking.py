@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from maintenance.ranking import RULRanking
+
+
+def check_heap(ranking):
+    # Heap order holds everywhere and the position index points at every entry
+    heap = ranking._heap
+    for i in range(1, len(heap)):
+        assert heap[(i - 1) // 2][0] <= heap[i][0]
+    assert {key: i for i, (_, key) in enumerate(heap)} == ranking._position
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_operations_match_a_sorted_dict(seed):
+    rng = random.Random(seed)
+    ranking, reference = RULRanking(), {}
+    machines, parts = [f"Machine {i}" for i in range(5)], [f"Part {i}" for i in range(40)]
+    for step in range(3000):
+        machine, part = rng.choice(machines), rng.choice(parts)
+        action = rng.random()
+        if action < 0.6:
+            # Integer RULs so updates often tie with or repeat an existing value
+            rul = rng.randrange(100)
+            ranking.update(machine, part, rul)
+            reference[(machine, part)] = float(rul)
+        elif action < 0.75:
+            records = [(rng.choice(machines), rng.choice(parts), rng.uniform(0, 100)) for _ in range(rng.randrange(5))]
+            ranking.update_many(records)
+            reference.update({(m, p): float(rul) for m, p, rul in records})
+        else:
+            assert ranking.remove(machine, part) == (reference.pop((machine, part), None) is not None)
+
+        if step % 50 == 0:
+            check_heap(ranking)
+        assert len(ranking) == len(reference)
+        assert ranking.get(machine, part) == reference.get((machine, part))
+        k = rng.randrange(15)
+        top = ranking.top_k(k)
+        expected = sorted(reference.values())[:k]
+        assert [rul for _, _, rul in top] == expected
+        assert all(reference[(m, p)] == rul for m, p, rul in top)
+        assert len({(m, p) for m, p, _ in top}) == len(top)
+        critical = ranking.most_critical()
+        assert (critical[2] if critical else None) == (min(reference.values()) if reference else None)
+
+
+def test_top_k_beyond_fleet_size_and_empty():
+    ranking = RULRanking()
+    assert ranking.top_k(3) == [] and ranking.most_critical() is None
+    ranking.update_many([("M", "a", 3), ("M", "b", 1), ("M", "c", 2)])
+    assert ranking.top_k(10) == [("M", "b", 1.0), ("M", "c", 2.0), ("M", "a", 3.0)]
+    assert ("M", "a") in ranking and not ranking.remove("M", "missing")
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from maintenance.models import MODEL_NAMES, fit_with_holdout, simulated_rul_dataset
+from maintenance.registry import ALIGNMENT, ModelCache, ModelRegistry, read_model, write_model
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return simulated_rul_dataset(n_units=8, seed=0)
+
+
+def mapped_arrays(value, found):
+    # Every ndarray reachable from a restored model's attributes
+    if isinstance(value, np.ndarray):
+        found.append(value)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            mapped_arrays(item, found)
+    elif isinstance(value, dict):
+        for item in value.values():
+            mapped_arrays(item, found)
+    elif hasattr(value, "__dict__"):
+        mapped_arrays(vars(value), found)
+    return found
+
+
+@pytest.mark.parametrize("model_name", MODEL_NAMES)
+def test_round_trip_through_aligned_memmapped_weights(tmp_path, dataset, model_name):
+    X, y = dataset
+    model, _ = fit_with_holdout(model_name, X, y)
+    write_model(str(tmp_path), model, {"note": "round trip"})
+    loaded, metadata = read_model(str(tmp_path))
+    assert type(loaded) is type(model) and metadata == {"note": "round trip"}
+    assert np.array_equal(loaded.predict(X), model.predict(X))
+    arrays = mapped_arrays(loaded, [])
+    assert arrays
+    for array in arrays:
+        # Zero-copy, read-only views into the one mapped weights file, each 64-byte aligned
+        base = array
+        while not isinstance(base, np.memmap) and base.base is not None:
+            base = base.base
+        assert isinstance(base, np.memmap)
+        assert array.ctypes.data % ALIGNMENT == 0 and not array.flags.writeable
+
+
+def test_model_cache_evicts_least_recently_used():
+    a, b, c = ("Pump", "Vibration", "a"), ("Pump", "Current", "b"), ("Valve", "Vibration", "c")
+    cache = ModelCache(max_entries=2)
+    cache.put(a, 1, load_seconds=0.5)
+    cache.put(b, 2)
+    assert cache.get(a) == 1  # b is now the least recently used
+    cache.put(c, 3)
+    assert cache.get(b) is None and cache.get(a) == 1 and cache.get(c) == 3
+    stats = cache.stats()
+    assert (stats["entries"], stats["evictions"], stats["hits"], stats["misses"]) == (2, 1, 3, 1)
+    assert stats["hit_rate"] == 0.75 and stats["loads"] == 1 and stats["mean_load_ms"] == 500.0
+    assert cache.invalidate(("Pump",)) == 1 and cache.get(a) is None
+    assert cache.invalidate() == 1 and cache.stats()["entries"] == 0
+
+
+def test_registry_versions_lookup_and_lru(tmp_path, dataset):
+    X, y = dataset
+    model, _ = fit_with_holdout("Linear Regression", X, y)
+    registry = ModelRegistry(str(tmp_path), cache_entries=2)
+    fits = []
+
+    def fit():
+        fits.append(1)
+        return model, {"rmse": 1.5}
+
+    # Each distinct `match` fits and stores a new version; a repeated one is served without fitting
+    first, metadata = registry.get_or_fit("Pump", "Vibration", "Linear Regression", fit, history_rows=10)
+    assert metadata["version"] == 1 and metadata["rmse"] == 1.5 and metadata["history_rows"] == 10
+    assert registry.get_or_fit("Pump", "Vibration", "Linear Regression", fit, history_rows=10)[0] is first
+    registry.get_or_fit("Pump", "Vibration", "Linear Regression", fit, history_rows=20)
+    assert len(fits) == 2 and registry.versions("Pump", "Vibration", "Linear Regression") == [1, 2]
+    assert registry.find("Pump", "Vibration", "Linear Regression", history_rows=10) == 1
+
+    # A third key evicts the least recently used one; the next lookup maps it back from disk
+    registry.get_or_fit("Bearing", "Vibration", "Linear Regression", fit, history_rows=10)
+    assert registry.cache.stats()["evictions"] == 1
+    reloaded, metadata = registry.get_or_fit("Pump", "Vibration", "Linear Regression", fit, history_rows=10)
+    assert len(fits) == 3 and metadata["version"] == 1 and reloaded is not first
+    assert np.array_equal(reloaded.predict(X), model.predict(X))
+
+    # A new registry on the same directory (a restarted server) finds every stored version
+    restarted = ModelRegistry(str(tmp_path))
+    loaded, metadata = restarted.load("Pump", "Vibration", "Linear Regression")
+    assert metadata["history_rows"] == 20
+    # Deleting a part drops its files and the warm entry just loaded
+    assert restarted.delete("Pump") == 1 and restarted.versions("Pump", "Vibration", "Linear Regression") == []
+    with pytest.raises(KeyError):
+        restarted.load("Pump", "Vibration", "Linear Regression")
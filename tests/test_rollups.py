@@ -0,0 +1,110 @@
+import itertools
+import math
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from maintenance.rollups import ROLLUP_COLUMNS, TIERS, aggregate, plan_tier
+from maintenance.store import SensorStore
+
+WIDTHS = dict(TIERS)
+
+
+def reference_buckets(time, value, width):
+    # Per-sample Python grouping: bucket start -> [count, sum, min, max]
+    buckets = defaultdict(lambda: [0, 0.0, math.inf, -math.inf])
+    for t, v in zip(time, value):
+        bucket = buckets[math.floor(t / width) * width]
+        bucket[0] += 1
+        bucket[1] += v
+        bucket[2] = min(bucket[2], v)
+        bucket[3] = max(bucket[3], v)
+    return buckets
+
+
+def assert_rows_match(rows, expected):
+    assert rows[:, 0].tolist() == sorted(expected)
+    for row in rows:
+        count, total, low, high = expected[row[0]]
+        assert row[1] == count and row[3] == low and row[4] == high
+        assert row[2] == pytest.approx(total, rel=1e-9, abs=1e-9)
+
+
+def test_aggregate_against_reference():
+    rng = np.random.default_rng(0)
+    time = np.sort(rng.uniform(0, 500, 2000))
+    value = rng.normal(size=2000)
+    for width in (0.5, 1.0, 7.0, 60.0):
+        rows, starts = aggregate(time, np.ones(1), value, value, value, width)
+        assert rows.shape[1] == ROLLUP_COLUMNS
+        assert_rows_match(rows, reference_buckets(time, value, width))
+        assert np.array_equal(time[starts] // width * width, rows[:, 0])
+
+
+def test_plan_tier_against_brute_force():
+    names = [name for name, _ in TIERS]
+    subsets = [None] + [set(c) for r in range(len(names) + 1) for c in itertools.combinations(names, r)]
+    for available, resolution in itertools.product(subsets, [0, 0.5, 1, 59, 60, 61, 3600, 5e4, 86400, 1e7]):
+        fits = [(name, width) for name, width in TIERS
+                if width <= resolution and (available is None or name in available)]
+        assert plan_tier(resolution, available) == max(fits, key=lambda tier: tier[1], default=None)
+
+
+@pytest.fixture(scope="module")
+def store_series(tmp_path_factory):
+    # Three days of irregular samples appended in uneven batches, so open buckets get rewritten
+    rng = np.random.default_rng(1)
+    time = 1_700_000_000.5 + np.cumsum(rng.exponential(7.0, 40_000))
+    value = np.cumsum(rng.normal(size=len(time)))
+    store = SensorStore(str(tmp_path_factory.mktemp("store")))
+    cuts = np.sort(rng.choice(np.arange(1, len(time)), size=30, replace=False))
+    for lo, hi in zip(np.r_[0, cuts], np.r_[cuts, len(time)]):
+        store.append("Pump", "Vibration", time[lo:hi], value[lo:hi])
+    return store, time, value
+
+
+def test_rollup_tiers_match_a_rebuild_from_raw(store_series):
+    store, time, value = store_series
+    entry = store._entry("Pump", "Vibration")
+    for name, width in TIERS:
+        table = np.asarray(store._rollup_table("Pump", "Vibration", name, entry["rollups"][name]["rows"]))
+        assert_rows_match(table, reference_buckets(time, value, width))
+
+
+def reference_query(time, value, start, end, resolution):
+    # What query() promises: whole buckets of the planned tier, regrouped by bucket start
+    plan = plan_tier(resolution)
+    if plan is None:
+        inside = (time >= start) & (time < end)
+        return reference_buckets(time[inside], value[inside], resolution), "raw"
+    name, width = plan
+    bucket = np.floor(time / width) * width
+    inside = (bucket >= math.floor(start / width) * width) & (bucket < end)
+    # Coarser resolutions regroup whole tier buckets by their start time, not the samples' own times
+    return reference_buckets(bucket[inside], value[inside], max(resolution, width)), name
+
+
+def test_query_matches_brute_force(store_series):
+    store, time, value = store_series
+    rng = np.random.default_rng(2)
+    for resolution in [0.5, 1.0, 30.0, 60.0, 90.0, 600.0, 3600.0, 7200.0, 86400.0, 2e5]:
+        for _ in range(4):
+            start, end = np.sort(rng.uniform(time[0] - 100, time[-1] + 100, 2))
+            result = store.query("Pump", "Vibration", start, end, resolution=resolution)
+            expected, tier = reference_query(time, value, start, end, resolution)
+            assert result.tier == tier
+            rows = np.column_stack([result.time, result.count, result.mean * result.count, result.min, result.max])
+            assert_rows_match(rows.reshape(-1, ROLLUP_COLUMNS), expected)
+            if tier != "raw":
+                # The planner reads tier rows, never more than the range holds plus one edge bucket
+                assert result.scanned_rows <= (end - start) / WIDTHS[tier] + 2
+
+
+def test_query_by_max_points_and_whole_series(store_series):
+    store, time, value = store_series
+    result = store.query("Pump", "Vibration", max_points=50)
+    assert result.tier == "1h" and len(result) <= 51
+    assert result.count.sum() == len(time)
+    assert result.min.min() == value.min() and result.max.max() == value.max()
+    assert store.query("Pump", "Missing", resolution=60).tier == "raw"
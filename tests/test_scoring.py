@@ -0,0 +1,50 @@
+import numpy as np
+
+from maintenance.scoring import health_rul, score_series
+
+
+def vibration(duration, failure, rate=20.0, seed=0):
+    # Vibration whose amplitude grows as the part wears towards `failure`
+    rng = np.random.default_rng(seed)
+    timestamp = np.arange(0, duration, 1 / rate)
+    wear = np.clip(timestamp / failure, 0, 1) ** 3
+    value = (1 + 4 * wear) * np.sin(2 * np.pi * 3 * timestamp) + rng.normal(0, 0.1, len(timestamp))
+    return timestamp, value
+
+
+def test_undetermined_fit_gives_nan_remaining_life():
+    # A short, flat series says nothing about when the part will fail
+    timestamp, value = vibration(3000, failure=1e6)
+    health, rul, lo, hi = health_rul(timestamp, value)
+    assert np.isfinite(health)
+    assert np.isnan([rul, lo, hi]).all()
+
+
+def test_remaining_life_is_bounded():
+    timestamp, value = vibration(3000, failure=6000)
+    _, rul, lo, hi = health_rul(timestamp, value)
+    assert 0 < lo <= rul <= hi < 10 * timestamp[-1]
+
+
+def test_flat_healthy_series_is_not_scored_near_failure():
+    # A model fitted on the file's own self-labelled windows scored this at RUL ~0 with ~0 error
+    timestamp, value = vibration(3000, failure=1e6)
+    model_rmse = []
+    for model_name in ("Linear Regression", "Random Forest"):
+        row = score_series("Machine 1", "Pump", "Vibration", timestamp, value, model_name)
+        assert row["health"] > 0.95
+        assert row["predicted_rul"] > 3 * row["holdout_rmse"]
+        model_rmse.append(row["holdout_rmse"])
+    assert min(model_rmse) > 1.0  # fleet hold-out error, not a perfect fit of one series
+
+
+def test_worn_series_scores_below_healthy_and_failed_scores_zero():
+    healthy = score_series("M", "Pump", "Vibration", *vibration(3000, failure=1e6))
+    worn = score_series("M", "Pump", "Vibration", *vibration(3000, failure=6000))
+    failed = score_series("M", "Pump", "Vibration", *vibration(3000, failure=3000))
+    assert failed["predicted_rul"] == 0 < worn["predicted_rul"] < healthy["predicted_rul"]
+
+
+def test_only_vibration_channels_are_scored():
+    row = score_series("M", "Pump", "Temperature", *vibration(3000, failure=1e6))
+    assert np.isnan(row["predicted_rul"]) and np.isnan(row["health"])
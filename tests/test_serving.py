@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+
+from maintenance.models import DEFAULT_WINDOW
+import maintenance.serving
+from maintenance.serving import MAX_BODY, MicroBatcher, RULService, ScoringServer
+
+
+class ConstantService:
+    # Stands in for RULService: predicts `rul` for every window without fitting anything
+    confidence = 0.95
+
+    def __init__(self, rul=100.0):
+        self.rul = rul
+
+    async def load(self, part, sensor):
+        return None
+
+    def predict(self, part, sensor, windows, elapsed, fitted=None):
+        rul = np.full(len(windows), self.rul)
+        return rul, rul - 1, rul + 1
+
+
+def exchange(raw, rul=100.0):
+    # Send raw bytes to a live server; returns (status, JSON body) of its first response
+    async def run():
+        server = await ScoringServer(MicroBatcher(ConstantService(rul))).start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers["content-length"]))
+            writer.close()
+            return status, json.loads(body)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(run())
+
+
+def post(payload, content_length=None):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    length = len(body) if content_length is None else content_length
+    return b"POST /predict HTTP/1.1\r\nContent-Length: " + str(length).encode() + b"\r\n\r\n" + body
+
+
+def window(**extra):
+    return {"part": "Pump", "sensor": "Vibration", "values": [1.0] * DEFAULT_WINDOW, **extra}
+
+
+def test_predict():
+    status, body = exchange(post(window(elapsed=10.0)))
+    assert status == 200
+    assert (body["rul"], body["rul_lo"], body["rul_hi"]) == (100.0, 99.0, 101.0)
+
+
+def test_oversized_body_is_413():
+    status, body = exchange(post(b"", content_length=MAX_BODY + 1))
+    assert status == 413
+
+
+@pytest.mark.parametrize("raw", [
+    b"GARBAGE\r\n\r\n",
+    b"POST /predict HTTP/1.1\r\nContent-Length: lots\r\n\r\n",
+    b"POST /predict HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+])
+def test_malformed_requests_are_400(raw):
+    status, body = exchange(raw)
+    assert status == 400
+    assert body["error"]
+
+
+@pytest.mark.parametrize("payload", [
+    b'{"part": "Pump", "sensor": "Vibration", "values": [' + b"1.0, " * DEFAULT_WINDOW + b"NaN]}",
+    json.dumps(window(elapsed=float("inf"))).encode(),
+    json.dumps(window(values=[1.0] * (DEFAULT_WINDOW - 1) + [float("-inf")])).encode(),
+])
+def test_non_finite_inputs_are_400(payload):
+    status, body = exchange(post(payload))
+    assert status == 400
+    assert "finite" in body["error"]
+
+
+def test_non_finite_prediction_is_never_sent_as_json():
+    status, body = exchange(post(window()), rul=float("nan"))
+    assert status == 500
+
+
+@pytest.mark.parametrize("extra", [{"part": "Spaceship"}, {"sensor": "../../etc"}])
+def test_parts_and_sensors_outside_the_catalog_are_400(extra):
+    status, body = exchange(post(window(**extra)))
+    assert status == 400
+    assert "unknown" in body["error"]
+
+
+def test_models_are_fitted_off_the_event_loop_once_and_bounded(monkeypatch):
+    fits = []
+
+    def slow_fit(X, y, model_name):
+        fits.append(model_name)
+        time.sleep(0.2)
+        return object(), 0.0, 1.0
+
+    monkeypatch.setattr(maintenance.serving, "rul_training_data", lambda store, part, sensor: (None, None, "simulated"))
+    monkeypatch.setattr(maintenance.serving, "fit_latest_rul", slow_fit)
+    service = RULService(max_models=1)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        loaded = await asyncio.gather(*(service.load("Pump", "Vibration") for _ in range(8)))
+        task.cancel()
+        return ticks, loaded
+
+    ticks, loaded = asyncio.run(run())
+    # The loop kept running during the fit, and the eight concurrent requests shared one fit
+    assert ticks >= 5
+    assert len(fits) == 1 and all(fitted is loaded[0] for fitted in loaded)
+    service.model("Bearing", "Vibration")
+    assert service._models.stats()["entries"] == 1 and service._models.stats()["evictions"] == 1
+    with pytest.raises(ValueError):
+        service.model("Spaceship", "Vibration")
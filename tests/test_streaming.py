@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+import pytest
+
+from maintenance.ranking import RULRanking
+from maintenance.streaming import RollingStats, SimulatedFeed, StreamHub
+
+
+def reference_stats(times, values, window, alpha):
+    # Brute force over the trailing window with numpy, recomputed from scratch
+    t, v = np.array(times[-window:]), np.array(values[-window:])
+    ewma = values[0]
+    for value in values[1:]:
+        ewma += alpha * (value - ewma)
+    slope = np.polyfit(t - t[0], v, 1)[0] if len(v) > 1 and np.ptp(t) > 0 else math.nan
+    return {"mean": v.mean(), "std": v.std(ddof=1) if len(v) > 1 else math.nan, "rms": np.sqrt(np.mean(v ** 2)),
+            "min": v.min(), "max": v.max(), "ewma": ewma, "slope": slope}
+
+
+@pytest.mark.parametrize("window", [2, 7, 256])
+@pytest.mark.parametrize("offset", [0.0, 1e4])
+def test_rolling_stats_match_brute_force(window, offset):
+    rng = np.random.default_rng(window)
+    stats = RollingStats(window, alpha=0.1)
+    times, values = [], []
+    # A drifting, noisy series with repeated values (for the min/max deques) and irregular timestamps
+    clock = 1.7e9
+    for i in range(3000):
+        clock += rng.uniform(0.5, 1.5)
+        value = offset + round(float(np.sin(i / 50) + rng.normal(0, 0.3)), 1) - i * 1e-3
+        stats.push(clock, value)
+        times.append(clock)
+        values.append(value)
+        if i % 37 == 0 or i > 2990:
+            expected = reference_stats(times, values, window, 0.1)
+            assert len(stats) == min(i + 1, window) and stats.count == i + 1
+            for name, value_expected in expected.items():
+                assert getattr(stats, name) == pytest.approx(value_expected, rel=1e-6, abs=1e-6, nan_ok=True), name
+
+
+@pytest.mark.parametrize("window", [2, 256])
+def test_rolling_stats_do_not_drift_over_a_long_feed(window):
+    # Large offsets and epoch timestamps: running sums alone lose the slope after ~1e5 samples
+    rng = np.random.default_rng(0)
+    n = 200_000
+    times = 1.7e9 + np.cumsum(rng.uniform(0.5, 1.5, n))
+    values = 1e4 + rng.normal(0, 0.3, n)
+    stats = RollingStats(window)
+    for t, v in zip(times.tolist(), values.tolist()):
+        stats.push(t, v)
+    expected = reference_stats(times[-window:].tolist(), values[-window:].tolist(), window, 0)
+    for name in ("mean", "std", "rms", "slope"):
+        assert getattr(stats, name) == pytest.approx(expected[name], rel=1e-8), name
+
+
+def test_rul_extrapolates_the_windowed_slope():
+    stats = RollingStats(window=10, alpha=1.0)
+    for t in range(9):
+        stats.push(t, 1 - 0.01 * t)
+    assert stats.rul() is None  # window not yet full
+    stats.push(9, 1 - 0.09)
+    assert stats.rul() == pytest.approx(0.91 / 0.01)
+    for t in range(10, 20):
+        stats.push(t, 0.5)
+    assert stats.rul() is None  # flat: not degrading
+
+
+def test_window_must_hold_two_samples():
+    with pytest.raises(ValueError):
+        RollingStats(window=1)
+
+
+def test_simulated_feed_replaces_only_the_failed_part():
+    hub = StreamHub(["Pump", "Bearing", "Valve"], ["Vibration", "Temperature"])
+    feed = SimulatedFeed(hub, seed=0)
+    resets = []
+    reset = hub.reset
+    hub.reset = lambda part=None: (resets.append((feed._clock, part)), reset(part))
+
+    first_failure = min(feed._ruls)
+    for _ in range(int(first_failure) + 1):
+        feed.tick()
+    assert resets == []  # every part still within its first life
+    feed.tick()
+    failed = [part for part, rows in feed._rows.items() if (feed._steps[rows] == 1).all()]
+    assert len(failed) == 1
+    assert resets == [(first_failure + 1, failed[0])]
+    for part in hub.parts:
+        assert hub.stats(part, "Vibration")["count"] == (1 if part in failed else int(first_failure) + 2)
+
+
+def test_reset_drops_the_failed_unit_from_the_ranking():
+    hub = StreamHub(["Pump", "Bearing", "Valve"], ["Vibration", "Temperature"], window=8)
+    ranking = RULRanking()
+    hub.subscribe(ranking.stream_listener("Machine 1"))
+    feed = SimulatedFeed(hub, seed=0)
+    for _ in range(int(min(feed._ruls)) + 1):
+        feed.tick()
+    assert len(ranking) == 3
+    feed.tick()
+    failed = [part for part, rows in feed._rows.items() if (feed._steps[rows] == 1).all()]
+    # The replaced part has no estimate yet, so its old unit's near-zero RUL is gone from the ranking
+    assert ("Machine 1", failed[0]) not in ranking and len(ranking) == 2
+    for _ in range(8):
+        feed.tick()
+    assert ("Machine 1", failed[0]) in ranking
+    hub.reset()
+    assert len(ranking) == 0
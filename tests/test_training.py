@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pytest
+
+from maintenance.training import (contiguous_folds, expand_search_space, hyperband_brackets, run_search,
+                                  run_training)
+
+ALPHAS = [1e-6, 1e3, 1e5]  # only the first fits the linear target below
+
+
+@pytest.fixture(scope="module")
+def linear_data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 3))
+    return X, X @ [3.0, -2.0, 1.0] + 50 + rng.normal(0, 0.1, len(X))
+
+
+def test_hyperband_brackets_by_hand():
+    # 2400 training rows: log3(2400 / 256) = 2.04, so the deepest bracket has 3 rungs; bracket s starts
+    # ceil(3 / (s + 1) * 3 ** s) candidates
+    assert hyperband_brackets(2400) == [(9, 3), (5, 2), (3, 1)]
+    # Too little data for any halving; and max_brackets caps the depth however much data there is
+    assert hyperband_brackets(100) == [(1, 1)]
+    assert hyperband_brackets(10 ** 7) == [(27, 4), (12, 3), (6, 2), (4, 1)]
+    assert hyperband_brackets(10 ** 7, max_brackets=2) == [(3, 2), (2, 1)]
+
+
+def test_hyperband_rung_budgets(linear_data):
+    X, y = linear_data
+    report = run_search(X, y, {"Linear Regression": {"alpha": ("choice", ALPHAS)}}, max_workers=1)
+    train = 2400  # rows before the 20% hold-out
+    rungs = {}
+    for task in report.tasks:
+        rungs.setdefault((task["bracket"], task["rung"]), []).append(task)
+    # (bracket, rung) -> (trials, stride): each rung keeps the best third on three times the rows
+    expected = {(0, 0): (9, 9), (0, 1): (3, 3), (0, 2): (1, 1), (1, 0): (5, 3), (1, 1): (1, 1), (2, 0): (3, 1)}
+    assert {key: (len(tasks), tasks[0]["stride"]) for key, tasks in rungs.items()} == expected
+    assert report.candidates == 17 and len(report.tasks) == 22
+    for (bracket, rung), tasks in rungs.items():
+        assert all(task["train_rows"] == -(-train // task["stride"]) for task in tasks)
+        if (bracket, rung + 1) in rungs:
+            ranked = sorted(tasks, key=lambda task: task["rmse"])
+            promoted = {task["candidate"] for task in rungs[bracket, rung + 1]}
+            assert promoted == {task["candidate"] for task in ranked[:len(promoted)]}
+    # Only the fully trained trials (stride 1) make the leaderboard: 1 + 1 + 3
+    assert len(report.leaderboard) == 5
+
+
+def test_hyperband_and_grid_search_agree_on_the_best_configuration(linear_data):
+    X, y = linear_data
+    distributions = {"Linear Regression": {"alpha": ("choice", ALPHAS)}}
+    hyperband = run_search(X, y, distributions, max_workers=1, seed=0)
+    exhaustive = run_search(X, y, distributions, max_workers=1, seed=0, method="random")
+    grid = run_training(X, y, {"Linear Regression": {"alpha": ALPHAS}}, max_workers=1, seed=0)
+    best = {"model": "Linear Regression", "params": {"alpha": 1e-6}}
+    for report in (hyperband, exhaustive, grid):
+        assert {key: report.leaderboard[0][key] for key in best} == best
+    # The exhaustive baseline fully trains every sampled candidate; Hyperband does far fewer full fits
+    assert len(exhaustive.tasks) == exhaustive.candidates == hyperband.candidates
+    assert sum(task["stride"] == 1 for task in hyperband.tasks) < len(exhaustive.tasks)
+    assert hyperband.leaderboard[0]["rmse"] == pytest.approx(exhaustive.leaderboard[0]["rmse"])
+
+
+def test_grid_candidates_and_folds():
+    assert expand_search_space({"Random Forest": {"n_estimators": [10, 20], "max_depth": [6]}}) == [
+        ("Random Forest", {"max_depth": 6, "n_estimators": 10}), ("Random Forest", {"max_depth": 6, "n_estimators": 20})]
+    assert contiguous_folds(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    with pytest.raises(ValueError):
+        expand_search_space({"Abacus": {}})
+
+
+def shared_memory_blocks():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+def test_parallel_grid_matches_inline_and_frees_shared_memory(linear_data):
+    X, y = linear_data
+    space = {"Linear Regression": {"alpha": ALPHAS}, "Random Forest": {"n_estimators": [5], "max_depth": [4, 8]}}
+    before = shared_memory_blocks()
+    parallel = run_training(X, y, space, n_folds=3, max_workers=2, seed=0)
+    inline = run_training(X, y, space, n_folds=3, max_workers=1, seed=0)
+    assert shared_memory_blocks() == before
+    # Workers read X and y from shared memory, and every candidate x fold runs exactly once
+    assert parallel.workers == 2 and len({task["pid"] for task in parallel.tasks} - {os.getpid()}) >= 1
+    assert sorted((task["candidate"], task["fold"]) for task in parallel.tasks) == [
+        (candidate, fold) for candidate in range(5) for fold in range(3)]
+
+    def scores(report):
+        return [(row["model"], row["params"], row["rmse"], row["folds"]) for row in report.leaderboard]
+
+    assert scores(parallel) == scores(inline)
+    assert parallel.leaderboard[0]["params"] == {"alpha": 1e-6}
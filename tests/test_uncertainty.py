@@ -0,0 +1,40 @@
+import numpy as np
+
+from maintenance.simulation import simulate_degradation
+from maintenance.uncertainty import monte_carlo_rul, sorted_percentiles
+
+TIME = np.linspace(0, 350, 100)
+
+
+def test_sorted_percentiles_match_numpy():
+    values = np.random.default_rng(0).normal(size=(3, 101))
+    assert np.allclose(sorted_percentiles(values, (5, 50, 95)), np.percentile(values, (5, 50, 95), axis=-1).T)
+
+
+def test_monte_carlo_rul_brackets_the_fleet():
+    ruls, _, health = simulate_degradation(20, TIME, rul_range=(250, 350), seed=0)
+    dist = monte_carlo_rul(TIME, health, n_samples=4000, seed=1)
+    assert dist.rul.shape == (1, 4000) and dist.bands.shape == (1, 3, len(TIME))
+    low, median, high = dist.rul_percentiles[0]
+    assert low < np.median(ruls) < high
+    assert low <= ruls.min() + 25 and ruls.max() - 25 <= high
+    # Bands are ordered, start healthy and never exceed the [0, 1] health range
+    assert (dist.bands[0, 0] <= dist.bands[0, 1]).all() and (dist.bands[0, 1] <= dist.bands[0, 2]).all()
+    assert np.allclose(dist.bands[0, :, 0], 1.0) and (dist.bands >= 0).all()
+
+
+def test_monte_carlo_rul_is_seeded_and_per_group():
+    _, _, health = simulate_degradation(10, TIME, seed=0)
+    health = health.reshape(2, 5, -1)
+    a, b = monte_carlo_rul(TIME, health, seed=3), monte_carlo_rul(TIME, health, seed=3)
+    assert a.rul.shape[0] == 2 and np.array_equal(a.rul, b.rul)
+
+
+def test_undetermined_group_samples_nan():
+    # Flat curves never degrade, so there is no RUL to fit; the other group is unaffected
+    _, _, health = simulate_degradation(5, TIME, seed=0)
+    dist = monte_carlo_rul(TIME, np.stack([np.ones_like(health), health]), seed=0)
+    assert np.isnan(dist.rul[0]).all() and np.isfinite(dist.rul[1]).all()
+    counts, _ = dist.histogram(0)
+    assert counts.sum() == 0
+    assert dist.histogram(1)[0].sum() == dist.rul.shape[1]